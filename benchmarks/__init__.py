@@ -0,0 +1 @@
+# Benchmarks for the Tiny Media Analysis API
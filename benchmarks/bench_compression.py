@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Bandwidth and CPU cost of compressed responses.
+
+For typical responses (stats, facets, pages of articles) this reports the
+bytes sent uncompressed and with gzip at several levels (and brotli, if
+installed), and the CPU time each compression takes. It then times cache
+hits through the app, uncompressed and precompressed, against compressing
+the cached body on every hit, and measures the time and memory the export
+takes when compressed chunk by chunk, as it is streamed, compared with
+compressing it whole.
+
+Usage:
+    python -m benchmarks.bench_compression [--articles N] [--repeat R]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_metrics import make_scope, receive
+from benchmarks.synthetic import write_articles
+from src import api, main as app_main
+from src.api import _ndjson_chunks
+from src.cache import ResponseCache
+from src.compression import StreamCompressor, available_encodings, compress
+from src.data_service import DataService
+from src.serialization import dumps
+
+
+LEVELS = [("gzip", 1), ("gzip", 6), ("gzip", 9)]
+
+# Cached requests timed through the app
+HIT_URL = "/api/v1/articles?limit=100"
+
+
+def responses(service: DataService):
+    """Response bodies of the common cacheable queries."""
+    return {
+        "stats": dumps(service.get_stats()),
+        "stats breakdowns": dumps(service.get_stats(breakdowns=True)),
+        "facets tag": dumps(service.get_facets(tags=["health"])),
+        "page of 20": service.render_articles(service.query_articles(limit=20)),
+        "page of 100": service.render_articles(service.query_articles(limit=100)),
+        "page of 1000": service.render_articles(service.query_articles(limit=1000)),
+    }
+
+
+def best_time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bandwidth_and_cpu(service: DataService, repeat: int):
+    levels = list(LEVELS)
+    if "br" in available_encodings():
+        levels.append(("br", 5))
+    header = f"{'response':<17} {'raw KB':>8}"
+    for encoding, level in levels:
+        header += f" {encoding + str(level) + ' KB':>9} {'ratio':>6} {'ms':>7}"
+    print(header)
+    for name, body in responses(service).items():
+        line = f"{name:<17} {len(body) / 1024:>8.1f}"
+        for encoding, level in levels:
+            size = len(compress(body, encoding, level))
+            seconds = best_time(lambda: compress(body, encoding, level), repeat)
+            line += f" {size / 1024:>9.1f} {len(body) / size:>6.1f} {seconds * 1000:>7.3f}"
+        print(line)
+
+
+async def hit_latencies(requests: int):
+    """Median latency of a cache hit by Accept-Encoding, through the ASGI app."""
+    results = {}
+    for name, accept, cache_compressed in (
+        ("identity", "identity", True),
+        ("gzip, cached", "gzip", True),
+        ("gzip, every hit", "gzip", False),
+    ):
+        api.response_cache = ResponseCache()
+        scope = make_scope(HIT_URL)
+        scope["headers"] = [(b"accept-encoding", accept.encode())]
+
+        async def request():
+            if not cache_compressed:
+                for entry in api.response_cache._entries.values():
+                    entry.encoded.clear()
+            await app_main.app(scope, receive, send)
+
+        async def send(message):
+            pass
+
+        await request()
+        samples = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            await request()
+            samples.append(time.perf_counter() - start)
+        results[name] = statistics.median(samples)
+    return results
+
+
+def export_memory(service: DataService):
+    """Size, time and peak memory of the full export, uncompressed, streamed and compressed whole."""
+    def serialize_only(level):
+        return sum(len(chunk) for chunk in _ndjson_chunks(service.iter_article_dicts()))
+
+    def streamed(level):
+        compressor = StreamCompressor("gzip", level)
+        size = 0
+        for chunk in _ndjson_chunks(service.iter_article_dicts()):
+            size += len(compressor.compress(chunk))
+        return size + len(compressor.finish())
+
+    def whole(level):
+        return len(compress(b"".join(_ndjson_chunks(service.iter_article_dicts())), "gzip", level))
+
+    raw = sum(len(chunk) for chunk in _ndjson_chunks(service.iter_article_dicts()))
+    results = {}
+    for name, func, level in (
+        ("uncompressed", serialize_only, 0),
+        ("streamed gzip1", streamed, 1),
+        ("streamed gzip6", streamed, 6),
+        ("whole gzip6", whole, 6),
+    ):
+        tracemalloc.start()
+        start = time.perf_counter()
+        size = func(level)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = (size, seconds, peak)
+    return raw, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20, help="Runs of each compression, best is kept")
+    parser.add_argument("--requests", type=int, default=500, help="Requests timed per cache hit kind")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = write_articles(os.path.join(tmp, "articles.json"), args.articles, args.seed)
+        service = DataService(data_file)
+    api.data_service = app_main.data_service = service
+
+    bandwidth_and_cpu(service, args.repeat)
+    print()
+
+    hits = asyncio.run(hit_latencies(args.requests))
+    print(f"cache hit, {HIT_URL}")
+    for name, seconds in hits.items():
+        print(f"  {name:<16} {seconds * 1e6:>9.1f} us")
+    print()
+
+    raw, export = export_memory(service)
+    print(f"export of {args.articles} articles, {raw / 1e6:.1f} MB uncompressed")
+    for name, (size, seconds, peak) in export.items():
+        print(f"  {name:<15} {size / 1e6:>7.1f} MB in {seconds:>5.2f} s, peak memory {peak / 1e6:>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Throughput and accuracy of near-duplicate detection.
+
+Streams a synthetic corpus in which a share of the articles are edited
+copies of recent ones (a new headline, a few changed words, an appended
+line, or a verbatim wire copy, always from another source), signs and
+indexes every article, and reports the time per article for each order of
+magnitude of corpus size, the chain entries checked per lookup, the memory
+of the index, and precision and recall against the planted copies. For
+comparison it times checking each article against every earlier one on a
+small corpus, the quadratic approach the index replaces, and the cost of
+tokenizing for the search index alone, without the signature.
+
+Usage:
+    python -m benchmarks.bench_dedup [--articles N] [--copies FRACTION]
+"""
+
+import argparse
+import random
+import struct
+import time
+from collections import Counter, deque
+
+from benchmarks.synthetic import FILLER_WORDS, SOURCES, _keywords, generate_articles, make_text
+from src.corpus import analyze
+from src.dedup import BANDS, MAX_CHAIN, MIN_SIMILARITY, DuplicateIndex, bucket, signature, similarity
+from src.search import tokenize
+
+# Recent articles that copies are made from
+RECENT = 10000
+
+
+def sign(record: dict) -> bytes:
+    return signature(tokenize(record["title"]) + tokenize(record["body"]))
+
+
+def make_copy(rng: random.Random, record: dict, keywords) -> dict:
+    """An edited copy of an article, as republished by another outlet."""
+    copy = dict(record, source=rng.choice([s for s in SOURCES if s != record["source"]]))
+    kind = rng.randrange(4)
+    if kind == 0:
+        copy["title"] = make_text(rng, keywords, 8).title()
+    elif kind == 1:
+        words = copy["body"].split()
+        for _ in range(rng.randint(1, 3)):
+            words[rng.randrange(len(words))] = rng.choice(FILLER_WORDS)
+        copy["body"] = " ".join(words)
+    elif kind == 2:
+        copy["body"] += " " + make_text(rng, keywords, 12)
+    return copy
+
+
+def corpus(count: int, copies: float, seed: int):
+    """Yield (record, position of the original or None) with planted copies."""
+    rng = random.Random(seed + 1)
+    keywords = _keywords()
+    originals = generate_articles(count, seed)
+    recent = deque(maxlen=RECENT)
+    for position in range(count):
+        if recent and rng.random() < copies:
+            original, record = rng.choice(recent)
+            yield make_copy(rng, record, keywords), original
+        else:
+            record = next(originals)
+            recent.append((position, record))
+            yield record, None
+
+
+def chain_length(index: DuplicateIndex, text_signature: bytes) -> int:
+    """Chain entries a lookup of the signature checks."""
+    bands = struct.unpack(f"={BANDS}I", text_signature)
+    walked = 0
+    for band, value in enumerate(bands):
+        position = index.heads[bucket(band, value)]
+        for _ in range(MAX_CHAIN):
+            if position < 0:
+                break
+            walked += 1
+            position = index.chains[position * BANDS + band]
+    return walked
+
+
+def index_bytes(index: DuplicateIndex) -> int:
+    arrays = sum(len(a) * a.itemsize for a in (index.signatures, index.heads, index.chains))
+    # Dictionary entries of the groups, roughly
+    return arrays + 100 * len(index.canonical) + 120 * len(index.groups)
+
+
+def run(count: int, copies: float, seed: int):
+    index = DuplicateIndex()
+    planted = {}
+    signatures = deque(maxlen=1000)
+    sign_s = add_s = 0.0
+    mark_sign = mark_add = 0.0
+    decade = 10000
+    print(f"{'articles':>9}  {'sign us':>8}  {'index us':>9}  {'chain':>6}  {'index MB':>9}")
+    for position, (record, original) in enumerate(corpus(count, copies, seed)):
+        start = time.perf_counter()
+        text_signature = sign(record)
+        middle = time.perf_counter()
+        index.add(position, text_signature)
+        end = time.perf_counter()
+        sign_s += middle - start
+        add_s += end - middle
+        signatures.append(text_signature)
+        if original is not None:
+            planted[position] = original
+
+        if position + 1 == decade or position + 1 == count:
+            done = position + 1
+            previous = decade // 10 if decade > 10000 else 0
+            walked = sum(chain_length(index, s) for s in signatures) / len(signatures)
+            print(
+                f"{done:>9}  {(sign_s - mark_sign) / (done - previous) * 1e6:>8.1f}  "
+                f"{(add_s - mark_add) / (done - previous) * 1e6:>9.1f}  {walked:>6.1f}  "
+                f"{index_bytes(index) / 1e6:>9.1f}"
+            )
+            mark_sign, mark_add = sign_s, add_s
+            decade *= 10
+
+    group = index.canonical.get
+    found = sum(1 for p, o in planted.items() if group(p, p) == group(o, o))
+    flagged = len(index.canonical)
+    correct = sum(1 for p, c in index.canonical.items() if p in planted and group(planted[p], planted[p]) == c)
+    print()
+    print(f"{count} articles in {sign_s + add_s:.1f} s: {count / (sign_s + add_s):.0f} articles/s")
+    print(f"planted copies {len(planted)}, flagged duplicates {flagged}")
+    print(f"recall {found / max(1, len(planted)):.4f}, precision {correct / max(1, flagged):.4f}")
+
+
+def pairwise(count: int, copies: float, seed: int, target: int):
+    """Check every article against all earlier ones, as without the index."""
+    signatures = [sign(record) for record, _ in corpus(count, copies, seed)]
+    comparisons = 0
+    start = time.perf_counter()
+    for i, text_signature in enumerate(signatures):
+        for other in signatures[:i]:
+            if similarity(other, text_signature) >= MIN_SIMILARITY:
+                break
+        comparisons += i
+    per_comparison = (time.perf_counter() - start) / comparisons
+    print(
+        f"pairwise, {count} articles: {per_comparison * 1e6:.2f} us per comparison, "
+        f"{per_comparison * count / 2 * 1e3:.1f} ms per article; "
+        f"{per_comparison * target / 2:.2f} s per article at {target}"
+    )
+
+
+def tokenizing(count: int, seed: int):
+    """Per-article cost of the search word counts alone and with the signature."""
+    records = list(generate_articles(count, seed))
+    for name, func in (
+        ("tokenize only", lambda r: tokenize(r["title"]) + tokenize(r["body"])),
+        ("word counts", lambda r: Counter(tokenize(r["title"]) + tokenize(r["body"]))),
+        ("analyze", lambda r: analyze(r["title"], r["body"])),
+    ):
+        start = time.perf_counter()
+        for record in records:
+            func(record)
+        print(f"  {name:<14} {(time.perf_counter() - start) / count * 1e6:>7.1f} us per article")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=1000000)
+    parser.add_argument("--copies", type=float, default=0.05, help="Share of articles that are copies")
+    parser.add_argument("--pairwise", type=int, default=3000, help="Corpus size of the pairwise comparison")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    run(args.articles, args.copies, args.seed)
+    print()
+    pairwise(args.pairwise, args.copies, args.seed, args.articles)
+    print()
+    print("load cost per article")
+    tokenizing(20000, args.seed)
+
+
+if __name__ == "__main__":
+    main()
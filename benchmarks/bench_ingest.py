@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Write throughput of incremental article ingestion.
+
+Adds batches of new articles to corpora of increasing size with
+DataService.add_articles and reports articles per second, next to the time
+a full reload of the same corpus takes. The batch cost should stay flat as
+the corpus grows.
+
+Usage:
+    python -m benchmarks.bench_ingest [--corpus N ...] [--batch B] [--batches K]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_articles, write_articles
+from src.data_service import DataService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'corpus':>8}  {'batch ms':>9}  {'articles/s':>11}  {'reload s':>9}")
+    for size in args.corpus:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_file = write_articles(os.path.join(tmp, "articles.json"), size, args.seed)
+            start = time.perf_counter()
+            service = DataService(data_file)
+            reload_s = time.perf_counter() - start
+
+        # New articles get ids past the corpus, from a different seed
+        extra = list(generate_articles(args.batch * args.batches, args.seed + 1))
+        for i, record in enumerate(extra):
+            record["id"] = str(size + i + 1)
+        batches = [extra[i:i + args.batch] for i in range(0, len(extra), args.batch)]
+
+        start = time.perf_counter()
+        for batch in batches:
+            service.add_articles(batch)
+        elapsed = time.perf_counter() - start
+
+        assert len(service.articles) == size + len(extra)
+        print(
+            f"{size:>8}  {elapsed / len(batches) * 1000:>9.1f}  "
+            f"{len(extra) / elapsed:>11.0f}  {reload_s:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
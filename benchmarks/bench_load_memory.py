@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Peak memory benchmark for loading the article corpus.
+
+Each loader runs in a fresh subprocess under tracemalloc. The benchmark
+reports the peak heap allocated during the load against the heap still
+allocated once the corpus is loaded, i.e. how many times the final corpus
+size the load needed. Peak RSS of the subprocess is reported alongside.
+
+Usage:
+    python -m benchmarks.bench_load_memory [--articles N] [--jsonl]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import write_articles
+
+
+LOADER_SCRIPT = r"""
+import gc, json, resource, sys, tracemalloc
+sys.path.insert(0, {root!r})
+
+from src.data_service import DataService
+from src.models import Article
+from src.tagging import ArticleTagger
+
+gc.collect()
+tracemalloc.start()
+
+if {mode!r} == "json.load":
+    # The previous loader: whole file parsed, then models built
+    tagger = ArticleTagger()
+    with open({path!r}, encoding="utf-8") as f:
+        raw = json.load(f)
+    articles = [
+        Article(id=int(r["id"]), title=r["title"], body=r["body"], source=r["source"],
+                date=r["date"], url=r.get("url", ""), tags=tagger.tag_article(r["title"], r["body"]))
+        for r in raw
+    ]
+    del raw
+else:
+    service = DataService({path!r})
+
+gc.collect()
+current, peak = tracemalloc.get_traced_memory()
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"corpus_bytes": current, "peak_bytes": peak, "max_rss_kb": rss}}))
+"""
+
+
+def run_loader(mode: str, path: str) -> dict:
+    """Load the corpus in a subprocess and return its memory readings."""
+    root = os.path.join(os.path.dirname(__file__), '..')
+    script = LOADER_SCRIPT.format(root=os.path.abspath(root), mode=mode, path=path)
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--jsonl", action="store_true", help="write the corpus as JSONL")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_articles(
+            os.path.join(tmp, "articles.jsonl" if args.jsonl else "articles.json"),
+            args.articles, args.seed, jsonl=args.jsonl
+        )
+        print(f"articles:  {args.articles} ({os.path.getsize(path) / 2**20:.1f} MiB on disk)")
+
+        modes = ["streaming"] if args.jsonl else ["json.load", "streaming"]
+        for mode in modes:
+            r = run_loader(mode, path)
+            final, peak = r["corpus_bytes"], r["peak_bytes"]
+            print(
+                f"{mode:<10} corpus {final / 2**20:8.1f} MiB  "
+                f"peak {peak / 2**20:8.1f} MiB  ratio {peak / max(final, 1):.2f}x  "
+                f"max RSS {r['max_rss_kb'] / 1024:8.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Overhead of request and stage metrics.
+
+Timing whole requests with metrics on and off cannot resolve a 1%
+difference; run-to-run noise is larger than that. Instead this measures
+the instrumentation itself in tight loops (the middleware around a no-op
+app, and one stage or result size observation), counts the observations
+each kind of request makes, and compares their cost with the request's
+latency: over HTTP against uvicorn, as clients see it, and through the
+ASGI app directly, which leaves out HTTP handling and is the stricter
+bound. Cache hits are the cheapest requests and so show the largest
+relative overhead; the other requests bypass the cache.
+
+Usage:
+    python -m benchmarks.bench_metrics [--articles N] [--requests K]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from benchmarks.bench_mixed_load import start_server
+from benchmarks.synthetic import write_articles
+from src import api, main as app_main
+from src.cache import ResponseCache
+from src.data_service import DataService
+from src.metrics import RESULT_SIZE, STAGE_SECONDS, Histogram, MetricsMiddleware, Registry
+
+
+REQUESTS = {
+    "cache hit": ("/api/v1/stats", True),
+    "page of 20": ("/api/v1/articles?limit=20", False),
+    "tag, 100 rows": ("/api/v1/articles?tag=health&limit=100", False),
+    "search": ("/api/v1/search?q=election%20hospital", False),
+    "facets": ("/api/v1/facets?tag=health", False),
+}
+
+
+def make_scope(url: str) -> dict:
+    parts = urlsplit(url)
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": parts.path, "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(), "root_path": "", "headers": [],
+        "client": ("127.0.0.1", 1234), "server": ("127.0.0.1", 8000),
+    }
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def call(app, url: str) -> int:
+    """Run one GET request through the app and return its status."""
+    status = 0
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(make_scope(url), receive, send)
+    return status
+
+
+async def noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def middleware_cost(calls: int) -> float:
+    """Seconds the metrics middleware adds to a request, net of the app it wraps."""
+    wrapped = MetricsMiddleware(noop_app, registry=Registry())
+    scope = make_scope("/health")
+
+    async def send(message):
+        pass
+
+    async def run(app) -> float:
+        start = time.perf_counter()
+        for _ in range(calls):
+            await app(scope, receive, send)
+        return time.perf_counter() - start
+
+    bare = min([await run(noop_app) for _ in range(5)])
+    timed = min([await run(wrapped) for _ in range(5)])
+    return (timed - bare) / calls
+
+
+def observation_cost(calls: int) -> float:
+    """Seconds one timed stage observation takes, including the with block."""
+    series = Histogram("bench_seconds", "Benchmark", ["stage"], registry=Registry()).labels("x")
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(calls):
+            with series.time():
+                pass
+        best = min(best, time.perf_counter() - start)
+    return best / calls
+
+
+def observations() -> int:
+    """Total number of stage and result size observations so far."""
+    return sum(
+        series.counts[-1]
+        for histogram in (STAGE_SECONDS, RESULT_SIZE)
+        for series in histogram._series.values()
+    )
+
+
+def http_latencies(args, data_file: str, cached: bool):
+    """Median latency over HTTP of every request kind that is cached, or not."""
+    server = start_server(data_file, args.port, workers=2, cache_max_bytes=64 * 1024 * 1024 if cached else 0)
+    latencies = {}
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=60.0) as client:
+            while True:
+                try:
+                    if client.get("/ready").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.1)
+            for name, (url, is_cached) in REQUESTS.items():
+                if is_cached != cached:
+                    continue
+                client.get(url)
+                samples = []
+                for _ in range(args.requests):
+                    start = time.perf_counter()
+                    client.get(url)
+                    samples.append(time.perf_counter() - start)
+                latencies[name] = statistics.median(samples)
+    finally:
+        server.terminate()
+        server.wait()
+    return latencies
+
+
+async def asgi_latencies(args):
+    """Median in-process latency and observation count of every request kind."""
+    # Run the lifespan so the app is fully started
+    lifespan = app_main.app.router.lifespan_context(app_main.app)
+    await lifespan.__aenter__()
+    results = {}
+    try:
+        for name, (url, cached) in REQUESTS.items():
+            api.response_cache = ResponseCache(max_bytes=64 * 1024 * 1024 if cached else 0)
+            assert await call(app_main.app, url) == 200
+
+            before = observations()
+            await call(app_main.app, url)
+            count = observations() - before
+
+            samples = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                await call(app_main.app, url)
+                samples.append(time.perf_counter() - start)
+            results[name] = (statistics.median(samples), count)
+    finally:
+        await lifespan.__aexit__(None, None, None)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=500, help="Requests timed per kind")
+    parser.add_argument("--calls", type=int, default=100000, help="Iterations of each isolated measurement")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    middleware_s = asyncio.run(middleware_cost(args.calls))
+    observe_s = observation_cost(args.calls)
+    print(f"middleware: {middleware_s * 1e6:.2f} us per request")
+    print(f"stage:      {observe_s * 1e6:.2f} us per observation")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = write_articles(os.path.join(tmp, "articles.json"), args.articles, args.seed)
+        http = http_latencies(args, data_file, cached=True)
+        http.update(http_latencies(args, data_file, cached=False))
+        api.data_service = app_main.data_service = DataService(data_file)
+    asgi = asyncio.run(asgi_latencies(args))
+
+    print(
+        f"{'request':<15} {'obs':>4} {'metrics us':>11} {'http us':>9} {'overhead':>9} "
+        f"{'asgi us':>9} {'overhead':>9}"
+    )
+    for name in REQUESTS:
+        asgi_latency, count = asgi[name]
+        cost = middleware_s + count * observe_s
+        print(
+            f"{name:<15} {count:>4} {cost * 1e6:>11.2f} {http[name] * 1e6:>9.1f} {cost / http[name]:>9.2%} "
+            f"{asgi_latency * 1e6:>9.1f} {cost / asgi_latency:>9.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
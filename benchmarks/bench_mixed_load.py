@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tail latency of small requests while large queries are running.
+
+Starts the API with uvicorn on a synthetic corpus and, for a few seconds,
+runs heavy clients that request 1000-article pages and broad searches
+next to light clients that call /health and small filtered queries. The
+response cache is disabled so every query does its full work. Reports
+p50/p99 latency and status counts per client class, once with queries run
+on the event loop (MEDIA_API_QUERY_WORKERS=0) and once with the query pool.
+
+Usage:
+    python -m benchmarks.bench_mixed_load [--articles N] [--duration S] [--workers W ...]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+from benchmarks.synthetic import SOURCES, write_articles
+
+
+HEAVY_PATHS = [
+    "/api/v1/articles?limit=1000&offset={n}",
+    "/api/v1/search?q=government&limit=1000&offset={n}",
+]
+
+LIGHT_PATHS = [
+    "/health",
+    "/api/v1/articles?source={source}&limit=5&offset={n}",
+]
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def start_server(data_file: str, port: int, workers: int, cache_max_bytes: int = 0) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        MEDIA_API_DATA_FILE=data_file,
+        MEDIA_API_QUERY_WORKERS=str(workers),
+        MEDIA_API_CACHE_MAX_BYTES=str(cache_max_bytes)
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 300.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def run_client(client, paths, deadline, latencies, statuses, seed: int):
+    rng = random.Random(seed)
+    while time.monotonic() < deadline:
+        path = rng.choice(paths).format(n=rng.randrange(5000), source=rng.choice(SOURCES))
+        start = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status_code] += 1
+        if response.status_code == 503:
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")) / 10)
+
+
+async def measure(base_url: str, heavy: int, light: int, duration: float):
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    limits = httpx.Limits(max_connections=heavy + light + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        await wait_ready(client)
+        deadline = time.monotonic() + duration
+        clients = [
+            run_client(client, HEAVY_PATHS, deadline, latencies["heavy"], statuses["heavy"], seed=i)
+            for i in range(heavy)
+        ] + [
+            run_client(client, LIGHT_PATHS, deadline, latencies["light"], statuses["light"], seed=100 + i)
+            for i in range(light)
+        ]
+        await asyncio.gather(*clients)
+    return latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=100000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--heavy", type=int, default=4, help="Concurrent heavy clients")
+    parser.add_argument("--light", type=int, default=8, help="Concurrent light clients")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2], help="Query pool sizes to compare")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = write_articles(os.path.join(tmp, "articles.json"), args.articles, args.seed)
+        print(f"{args.articles} articles, {args.heavy} heavy and {args.light} light clients, {args.duration:.0f} s each")
+        print()
+        print(f"{'workers':>7}  {'class':<6} {'requests':>8} {'p50 ms':>8} {'p99 ms':>9}  statuses")
+        for workers in args.workers:
+            server = start_server(data_file, args.port, workers)
+            try:
+                latencies, statuses = asyncio.run(
+                    measure(f"http://127.0.0.1:{args.port}", args.heavy, args.light, args.duration)
+                )
+            finally:
+                server.terminate()
+                server.wait()
+
+            for name in ("heavy", "light"):
+                samples = latencies[name]
+                codes = " ".join(f"{code}:{count}" for code, count in sorted(statuses[name].items()))
+                print(
+                    f"{workers:>7}  {name:<6} {len(samples):>8} "
+                    f"{percentile(samples, 0.5) * 1000:>8.1f} {percentile(samples, 0.99) * 1000:>9.1f}  {codes}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Latency of full-text search on a large synthetic corpus.
+
+Indexes synthetic titles and bodies with SearchIndex, then times a mix of
+single-word, AND, OR, phrase and filtered queries. Besides the filler and
+tag keywords every body gets a few words from a Zipf-distributed
+vocabulary, so the index has both very long and very short posting lists.
+
+Usage:
+    python -m benchmarks.bench_search [--articles N] [--runs R]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.synthetic import make_pairs
+from src.corpus import analyze
+from src.search import SearchIndex
+
+
+VOCABULARY_SIZE = 50000
+
+QUERIES = {
+    "common word": "government",
+    "keyword": "election",
+    "rare word": "w40000",
+    "AND": "election hospital",
+    "OR": "election OR hospital",
+    "phrase": '"mental health"',
+    # Both words are in nearly every article, so every one is checked
+    "stop-word phrase": '"the government"',
+    "keyword + filter": "election",
+}
+
+
+def add_rare_words(pairs, seed: int):
+    """Append a few Zipf-distributed vocabulary words to every body."""
+    rng = random.Random(seed)
+    for title, body in pairs:
+        words = [f"w{min(int(rng.paretovariate(1.0)), VOCABULARY_SIZE)}" for _ in range(rng.randint(2, 6))]
+        words += [f"w{rng.randrange(VOCABULARY_SIZE)}" for _ in range(2)]
+        yield title, body + " " + " ".join(words)
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=1000000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    pairs = list(add_rare_words(make_pairs(args.articles, args.seed), args.seed))
+    print(f"generated {len(pairs)} articles in {time.perf_counter() - start:.1f} s")
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    for position, (title, body) in enumerate(pairs):
+        index.add(position, analyze(title, body)[0])
+    build_s = time.perf_counter() - start
+
+    postings = sum(p.count for p in index.postings.values())
+    packed = sum(len(p.blocks) + len(p.docs) * 6 for p in index.postings.values())
+    print(f"indexed in {build_s:.1f} s: {len(index.postings)} terms, {postings} postings")
+    print(f"postings:  {packed / postings:.2f} bytes each ({packed / 2**20:.0f} MiB)")
+    print()
+
+    # A date filter keeping roughly one article in ten
+    filtered = list(range(0, args.articles, 10))
+    texts = pairs.__getitem__
+
+    print(f"{'query':<18} {'matches':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, query in QUERIES.items():
+        candidates = filtered if name.endswith("filter") else None
+        samples = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            _, total = index.search(query, candidates=candidates, texts=texts, limit=args.limit)
+            samples.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<18} {total:>9} {statistics.median(samples):>8.1f} {percentile(samples, 0.99):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Per-article cost of serializing /articles responses.
+
+Compares the previous path, which built an ArticleResponse per article and
+then let FastAPI validate and encode the List[ArticleResponse] response,
+with the direct path that encodes stored articles straight to JSON bytes.
+
+Usage:
+    python -m benchmarks.bench_serialization [--articles N] [--repeat R]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import List
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from benchmarks.synthetic import write_articles
+from src.data_service import DataService
+from src.models import ArticleResponse
+from src import serialization
+
+
+def previous_path(service: DataService, field) -> bytes:
+    """Build validated models, then run FastAPI's response serialization."""
+    models = [
+        ArticleResponse(
+            id=a.id, title=a.title, body=a.body, source=a.source,
+            date=a.date, url=a.url or "", tags=a.tags
+        )
+        for a in service.articles
+    ]
+    content = asyncio.run(serialize_response(field=field, response_content=models))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def direct_path(service: DataService) -> bytes:
+    """Encode stored articles directly."""
+    page = service.query_articles()
+    return service.render_articles(page)
+
+
+def per_article_us(func, count: int, repeat: int) -> float:
+    """Best-of-repeat cost per article, in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = DataService(write_articles(os.path.join(tmp, "articles.json"), args.articles))
+
+    field = create_response_field(name="response", type_=List[ArticleResponse], mode="serialization")
+    assert json.loads(previous_path(service, field)) == json.loads(direct_path(service))
+
+    previous = per_article_us(lambda: previous_path(service, field), args.articles, args.repeat)
+    direct = per_article_us(lambda: direct_path(service), args.articles, args.repeat)
+
+    print(f"articles:  {args.articles}")
+    print(f"encoder:   {'orjson' if serialization.orjson is not None else 'json'}")
+    print(f"previous:  {previous:.2f} us/article")
+    print(f"direct:    {direct:.2f} us/article")
+    print(f"speedup:   {previous / direct:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Per-worker memory and attach time with a shared corpus snapshot.
+
+Builds a snapshot once, then starts several worker processes that attach
+to it and touch every article. Once all of them are running, each reports
+how long attaching took, its memory private to it, and its proportional
+set size (PSS), which splits shared pages between the processes mapping
+them. The PSS total should stay close to one copy of the corpus however
+many workers run.
+
+Usage:
+    python -m benchmarks.bench_shared_memory [--articles N] [--workers W]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import write_articles
+from src.data_service import DataService
+
+
+WORKER_SCRIPT = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+
+def smaps():
+    fields = {{}}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields
+
+from src.data_service import DataService
+
+before = smaps()
+start = time.perf_counter()
+service = DataService({data_file!r}, snapshot_file={snapshot_file!r})
+attach_ms = (time.perf_counter() - start) * 1000
+
+# Touch every row, as a full export would
+for position in range(len(service.articles)):
+    service.articles.row_dict(position)
+
+# Wait until every worker has attached before measuring
+print("ready", flush=True)
+sys.stdin.readline()
+
+after = smaps()
+private = (after["Private_Clean"] + after["Private_Dirty"]) - (before["Private_Clean"] + before["Private_Dirty"])
+pss = after["Pss"] - before["Pss"]
+print(json.dumps({{"attach_ms": attach_ms, "private_kb": private, "pss_kb": pss}}), flush=True)
+
+# Stay attached until every worker has measured
+sys.stdin.readline()
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = write_articles(os.path.join(tmp, "articles.json"), args.articles)
+        snapshot_file = os.path.join(tmp, "articles.snapshot")
+        DataService(data_file, snapshot_file=snapshot_file)
+        print(f"articles:  {args.articles} (snapshot {os.path.getsize(snapshot_file) / 2**20:.1f} MiB)")
+
+        script = WORKER_SCRIPT.format(root=root, data_file=data_file, snapshot_file=snapshot_file)
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "-c", script],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+            )
+            for _ in range(args.workers)
+        ]
+        for worker in workers:
+            worker.stdout.readline()
+        for worker in workers:
+            worker.stdin.write("measure\n")
+            worker.stdin.flush()
+        results = [json.loads(worker.stdout.readline()) for worker in workers]
+        for worker in workers:
+            worker.communicate("exit\n")
+
+        total_pss = 0
+        for i, result in enumerate(results):
+            total_pss += result["pss_kb"]
+            print(
+                f"worker {i}: attach {result['attach_ms']:7.1f} ms  "
+                f"private {result['private_kb'] / 1024:7.1f} MiB  "
+                f"pss {result['pss_kb'] / 1024:7.1f} MiB"
+            )
+        print(f"total pss: {total_pss / 1024:.1f} MiB across {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
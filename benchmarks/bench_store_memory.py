@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Memory footprint of the columnar ArticleStore against a list of models.
+
+Builds both layouts from the same tagged synthetic articles and reports the
+heap each one retains, measured with tracemalloc.
+
+Usage:
+    python -m benchmarks.bench_store_memory [--articles N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.synthetic import generate_articles
+from src.models import Article
+from src.store import ArticleStore
+from src.tagging import ArticleTagger
+
+
+def retained_bytes(build) -> int:
+    """Heap still allocated by the object build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    tagger = ArticleTagger()
+
+    def models():
+        # Models are built from freshly decoded records, as the loader does
+        return [
+            Article(
+                id=int(r["id"]), title=r["title"], body=r["body"], source=r["source"],
+                date=r["date"], url=r["url"], tags=tagger.tag_article(r["title"], r["body"])
+            )
+            for r in generate_articles(args.articles, args.seed)
+        ]
+
+    def store():
+        result = ArticleStore(tag_names=tagger.get_available_tags())
+        for r in generate_articles(args.articles, args.seed):
+            result.append(Article(
+                id=int(r["id"]), title=r["title"], body=r["body"], source=r["source"],
+                date=r["date"], url=r["url"], tags=tagger.tag_article(r["title"], r["body"])
+            ))
+        return result
+
+    list_bytes = retained_bytes(models)
+    store_bytes = retained_bytes(store)
+
+    print(f"articles:        {args.articles}")
+    print(f"list of models:  {list_bytes / 2**20:8.1f} MiB ({list_bytes / args.articles:,.0f} B/article)")
+    print(f"ArticleStore:    {store_bytes / 2**20:8.1f} MiB ({store_bytes / args.articles:,.0f} B/article)")
+    print(f"reduction:       {list_bytes / store_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for ArticleTagger.
+
+Compares the compiled single-pass matcher against the original
+implementation, which built and searched one regex per keyword.
+
+Usage:
+    python -m benchmarks.bench_tagging [--articles N] [--seed S]
+"""
+
+import argparse
+import re
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.tagging import ArticleTagger
+from benchmarks.synthetic import make_pairs
+
+
+def legacy_tag_article(tagger: ArticleTagger, title: str, body: str):
+    """The original per-keyword implementation, kept as a baseline."""
+    content = f"{title} {body}".lower()
+    matched_tags = []
+    for tag, keywords in tagger.tag_keywords.items():
+        for keyword in keywords:
+            pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
+            if re.search(pattern, content):
+                matched_tags.append(tag)
+                break
+    return matched_tags
+
+
+def measure(func, articles):
+    """Return articles per second for a tagging function."""
+    start = time.perf_counter()
+    for title, body in articles:
+        func(title, body)
+    elapsed = time.perf_counter() - start
+    return len(articles) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    tagger = ArticleTagger()
+    articles = make_pairs(args.articles, args.seed)
+
+    mismatches = sum(
+        1 for title, body in articles
+        if tagger.tag_article(title, body) != legacy_tag_article(tagger, title, body)
+    )
+
+    legacy = measure(lambda t, b: legacy_tag_article(tagger, t, b), articles)
+    compiled = measure(tagger.tag_article, articles)
+
+    print(f"articles:  {len(articles)}")
+    print(f"legacy:    {legacy:,.0f} articles/s")
+    print(f"compiled:  {compiled:,.0f} articles/s")
+    print(f"speedup:   {compiled / legacy:.1f}x")
+    print(f"mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
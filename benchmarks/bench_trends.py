@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Latency of trend queries read from rollups against counting the matches.
+
+Times /trends-style queries answered by TrendRollups, and the same counts
+computed by filtering the index and counting dates over the matching
+articles, as /facets does.
+
+Usage:
+    python -m benchmarks.bench_trends [--articles N] [--runs R]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.synthetic import write_articles
+from src.data_service import DataService
+
+
+QUERIES = {
+    "monthly, one tag": dict(tags=["health"], interval="month"),
+    "weekly, one source, 3 months": dict(
+        sources=["Reuters"], interval="week", date_from="2024-03-13", date_to="2024-06-17"
+    ),
+    "daily, source and tag, 30 days": dict(
+        sources=["Daily Nation"], tags=["elections"], interval="day",
+        date_from="2024-05-01", date_to="2024-05-30"
+    ),
+    "monthly, all articles": dict(interval="month"),
+}
+
+
+def timed(func, runs: int) -> float:
+    """Median time of a call, in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def by_scan(service: DataService, sources=None, tags=None, interval="day", date_from=None, date_to=None):
+    """Compute the same counts from the matching articles."""
+    return [
+        service.get_facets(source=source, tags=[tag] if tag else None,
+                           date_from=date_from, date_to=date_to, interval=interval)["dates"]
+        for source in sources or [None]
+        for tag in tags or [None]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = DataService(write_articles(os.path.join(tmp, "articles.json"), args.articles))
+
+    print(f"articles: {args.articles}")
+    print(f"{'query':<32} {'rollup ms':>10} {'scan ms':>9}")
+    for name, query in QUERIES.items():
+        rollup = [series["counts"] for series in service.get_trends(**query)]
+        scan = by_scan(service, **query)
+        # The rollups include empty buckets, the scan only non-empty ones
+        assert [{k: v for k, v in r.items() if v} for r in rollup] == scan
+
+        rollup_ms = timed(lambda: service.get_trends(**query), args.runs)
+        scan_ms = timed(lambda: by_scan(service, **query), args.runs)
+        print(f"{name:<32} {rollup_ms:>10.3f} {scan_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
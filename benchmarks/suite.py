@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite with machine-readable results.
+
+Writes a seeded synthetic corpus, then times:
+
+- tagging: ArticleTagger.tag_article per article
+- load: DataService._load_data from the data file, and from a snapshot
+- get_articles: every filter combination, as full lists and as 100-article
+  rendered pages (the /articles path)
+- stats: get_stats with and without breakdowns
+- startup: time until the server answers /health, and until /ready
+- http: a mixed heavy/light load against src.main:app under uvicorn
+
+Results are written as JSON, by default to benchmarks/results/<commit>.json,
+so a run can be compared with one from another commit:
+
+    python -m benchmarks.suite --articles 1000000
+    python -m benchmarks.suite --compare benchmarks/results/abc1234.json
+
+Usage:
+    python -m benchmarks.suite [--articles N] [--runs R] [--only NAME ...]
+                               [--output PATH] [--compare PATH] [--no-http]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_mixed_load import measure as measure_http, start_server
+from benchmarks.synthetic import SOURCES, make_pairs, write_articles
+from src.data_service import DataService
+from src.tagging import ArticleTagger
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+GROUPS = ["tagging", "load", "get_articles", "stats", "startup", "http"]
+
+# Filter combinations for get_articles; SOURCES[0] is the most common source
+FILTERS = {
+    "none": {},
+    "source": {"source": SOURCES[0]},
+    "rare source": {"source": SOURCES[-1]},
+    "tag": {"tags": ["health"]},
+    "two tags": {"tags": ["health", "elections"]},
+    "date range": {"date_from": "2024-03-01", "date_to": "2024-03-31"},
+    "source + tag": {"source": SOURCES[0], "tags": ["corruption"]},
+    "source + tag + dates": {
+        "source": SOURCES[0], "tags": ["corruption"],
+        "date_from": "2024-03-01", "date_to": "2024-03-31"
+    },
+}
+
+# Articles per page in the rendered page benchmarks
+PAGE_SIZE = 100
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(samples: List[float], scale: float = 1000.0, unit: str = "ms") -> Dict:
+    """Summarize timings in seconds as p50/p99/mean in the given unit."""
+    return {
+        "runs": len(samples),
+        f"p50_{unit}": round(percentile(samples, 0.5) * scale, 4),
+        f"p99_{unit}": round(percentile(samples, 0.99) * scale, 4),
+        f"mean_{unit}": round(statistics.fmean(samples) * scale, 4),
+    }
+
+
+def time_calls(func: Callable[[], object], runs: int) -> List[float]:
+    """Time a function over several runs, after one warm-up call."""
+    func()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_tagging(args) -> Dict[str, Dict]:
+    tagger = ArticleTagger()
+    pairs = make_pairs(min(args.articles, args.tag_articles), args.seed)
+    samples = []
+    for title, body in pairs:
+        start = time.perf_counter()
+        tagger.tag_article(title, body)
+        samples.append(time.perf_counter() - start)
+    result = summarize(samples, scale=1e6, unit="us")
+    result["per_second"] = round(len(samples) / sum(samples))
+    return {"tagging/tag_article": result}
+
+
+def bench_load(args, data_file: str, tmp: str) -> Dict[str, Dict]:
+    service = DataService(data_file)
+    parse = time_calls(service._load_data, args.load_runs)
+
+    snapshot = DataService(data_file, snapshot_file=os.path.join(tmp, "articles.snapshot"))
+    attach = time_calls(snapshot._load_data, args.load_runs)
+
+    results = {"load/_load_data": summarize(parse), "load/_load_data snapshot": summarize(attach)}
+    results["load/_load_data"]["articles_per_second"] = round(args.articles / statistics.fmean(parse))
+    return results
+
+
+def bench_get_articles(args, service: DataService) -> Dict[str, Dict]:
+    results = {}
+    for name, filters in FILTERS.items():
+        matches = len(service.query_articles(**filters).positions)
+
+        result = summarize(time_calls(lambda: service.get_articles(**filters), args.runs))
+        result["matches"] = matches
+        results[f"get_articles/{name}"] = result
+
+        def page():
+            service.render_articles(service.query_articles(limit=PAGE_SIZE, **filters))
+
+        result = summarize(time_calls(page, args.runs))
+        result["matches"] = matches
+        results[f"get_articles/{name} page"] = result
+    return results
+
+
+def bench_stats(args, service: DataService) -> Dict[str, Dict]:
+    return {
+        "stats/get_stats": summarize(time_calls(service.get_stats, args.runs)),
+        "stats/get_stats breakdowns": summarize(
+            time_calls(lambda: service.get_stats(breakdowns=True), args.runs)
+        ),
+    }
+
+
+def bench_startup(args, data_file: str) -> Dict[str, Dict]:
+    samples = {"startup/health": [], "startup/ready": []}
+    for _ in range(args.load_runs):
+        start = time.perf_counter()
+        server = start_server(data_file, args.port, workers=args.http_workers)
+        try:
+            for path in ("/health", "/ready"):
+                while True:
+                    try:
+                        if httpx.get(f"http://127.0.0.1:{args.port}{path}").status_code == 200:
+                            break
+                    except httpx.TransportError:
+                        pass
+                    # Frequent polls would take the GIL from the loader thread
+                    time.sleep(0.005 if path == "/health" else 0.1)
+                samples[f"startup{path}"].append(time.perf_counter() - start)
+        finally:
+            server.terminate()
+            server.wait()
+    return {name: summarize(times) for name, times in samples.items()}
+
+
+def bench_http(args, data_file: str) -> Dict[str, Dict]:
+    server = start_server(data_file, args.port, workers=args.http_workers)
+    try:
+        latencies, statuses = asyncio.run(
+            measure_http(f"http://127.0.0.1:{args.port}", args.heavy, args.light, args.http_duration)
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+    results = {}
+    for name in ("heavy", "light"):
+        result = summarize(latencies[name])
+        result["per_second"] = round(len(latencies[name]) / args.http_duration, 1)
+        result["statuses"] = {str(code): count for code, count in sorted(statuses[name].items())}
+        results[f"http/{name}"] = result
+    return results
+
+
+def git_commit() -> Optional[str]:
+    """Short hash of the checked-out commit, with -dirty if the tree has changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def compare(results: Dict[str, Dict], baseline_path: str):
+    """Print every timing metric next to the same metric from a baseline run."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    print()
+    print(f"compared with {baseline['meta'].get('commit')} ({baseline_path}); ratio > 1 is slower")
+    print(f"{'benchmark':<42} {'metric':<10} {'before':>10} {'after':>10} {'ratio':>7}")
+    for name, result in results.items():
+        before = baseline["results"].get(name, {})
+        for metric in ("p50_ms", "p99_ms", "p50_us", "p99_us"):
+            if metric in result and before.get(metric):
+                ratio = result[metric] / before[metric]
+                flag = "  <-" if ratio > 1.1 else ""
+                print(
+                    f"{name:<42} {metric:<10} {before[metric]:>10.3f} "
+                    f"{result[metric]:>10.3f} {ratio:>7.2f}{flag}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=20, help="Runs of each query benchmark")
+    parser.add_argument("--load-runs", type=int, default=3, help="Runs of each load benchmark")
+    parser.add_argument("--tag-articles", type=int, default=20000, help="Articles tagged one by one")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=GROUPS)
+    parser.add_argument("--no-http", action="store_true", help="Skip the HTTP load scenario")
+    parser.add_argument("--http-duration", type=float, default=10.0)
+    parser.add_argument("--http-workers", type=int, default=2, help="MEDIA_API_QUERY_WORKERS for the server")
+    parser.add_argument("--heavy", type=int, default=4, help="Concurrent heavy HTTP clients")
+    parser.add_argument("--light", type=int, default=8, help="Concurrent light HTTP clients")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Results file of an earlier run to compare with")
+    args = parser.parse_args()
+
+    groups = [g for g in args.only if not (g == "http" and args.no_http)]
+    commit = git_commit()
+    results: Dict[str, Dict] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        data_file = write_articles(os.path.join(tmp, "articles.json"), args.articles, args.seed)
+        print(f"generated {args.articles} articles in {time.perf_counter() - start:.1f} s")
+
+        service = None
+        if {"get_articles", "stats"} & set(groups):
+            service = DataService(data_file)
+
+        for group in groups:
+            start = time.perf_counter()
+            if group == "tagging":
+                group_results = bench_tagging(args)
+            elif group == "load":
+                group_results = bench_load(args, data_file, tmp)
+            elif group == "get_articles":
+                group_results = bench_get_articles(args, service)
+            elif group == "stats":
+                group_results = bench_stats(args, service)
+            elif group == "startup":
+                group_results = bench_startup(args, data_file)
+            else:
+                group_results = bench_http(args, data_file)
+            print(f"{group}: {time.perf_counter() - start:.1f} s")
+            for name, result in group_results.items():
+                metrics = ", ".join(f"{k}={v}" for k, v in result.items() if k != "runs")
+                print(f"  {name:<40} {metrics}")
+            results.update(group_results)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "argv": sys.argv[1:],
+            "articles": args.articles,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import asyncio
+import hmac
+import time
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from typing import Literal, Optional
+from . import api
+from .settings import settings
+
+# Longest time window a single profiling request may ask for
+MAX_PROFILE_SECONDS = 300.0
+
+# Time window when only a number of requests is given and they never arrive
+DEFAULT_REQUEST_WINDOW = 60.0
+
+
+def require_admin(authorization: Optional[str] = Header(None)):
+    """
+    Check the bearer token of an admin request.
+
+    Answers 404 while no admin token is configured, so the endpoints do
+    not exist unless enabled, and 401 for a missing or wrong token.
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.admin_token.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.post("/profile")
+async def profile(
+    mode: Literal["sample", "cprofile"] = Query("sample", description="Stack sampling or cProfile"),
+    seconds: Optional[float] = Query(None, gt=0, le=MAX_PROFILE_SECONDS, description="Time window to profile"),
+    requests: Optional[int] = Query(None, ge=1, le=10000, description="Profile the next N queries"),
+    interval: float = Query(0.01, ge=0.001, le=1.0, description="Seconds between stack samples"),
+    idle: bool = Query(False, description="Also sample threads waiting for work"),
+    format: Optional[Literal["text", "pstats", "collapsed"]] = Query(None, description="Output format"),
+    sort: str = Query("cumulative", description="pstats sort key for text output"),
+    limit: int = Query(50, ge=1, le=1000, description="Functions listed in text output")
+):
+    """
+    Profile the live server for a time window or the next N queries.
+
+    `sample` mode records the stacks of all threads every `interval`
+    seconds, including the corpus loader and the ingestion pipeline, and
+    returns collapsed stacks for flamegraph tools. `cprofile` mode runs
+    every query through the query pool under cProfile and returns a pstats
+    report, as text or in the binary format read by pstats and snakeviz.
+    One session runs at a time; a second request answers 409.
+    """
+    if format is None:
+        format = "collapsed" if mode == "sample" else "text"
+    if (format == "collapsed") != (mode == "sample"):
+        raise HTTPException(status_code=400, detail=f"Format {format} is not available in {mode} mode")
+    if seconds is None and requests is None:
+        seconds = 10.0
+
+    try:
+        session = api.profiler.start(mode=mode, calls=requests, seconds=seconds, interval=interval, idle=idle)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    # Waiting for requests is bounded too, in case they never come
+    deadline = time.monotonic() + (seconds if seconds is not None else DEFAULT_REQUEST_WINDOW)
+    try:
+        while not session.done() and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+    finally:
+        api.profiler.stop()
+
+    headers = {
+        "X-Profile-Seconds": f"{time.monotonic() - session.started:.3f}",
+        "X-Profile-Requests": str(session.completed),
+    }
+    if mode == "sample":
+        headers["X-Profile-Samples"] = str(session.samples)
+        return Response(session.collapsed(), media_type="text/plain", headers=headers)
+    if format == "pstats":
+        if not session.profiles:
+            raise HTTPException(status_code=404, detail="No queries ran while profiling")
+        return Response(session.stats_dump(), media_type="application/octet-stream", headers=headers)
+    try:
+        report = session.stats_text(sort=sort, limit=limit)
+    except KeyError:
+        raise HTTPException(status_code=400, detail=f"Unknown sort key: {sort}")
+    return Response(report, media_type="text/plain", headers=headers)
@@ -1,13 +1,94 @@
-from fastapi import APIRouter, Query
-from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Literal, Optional, Tuple
+from .cache import ResponseCache, etag_matches
+from .compression import choose_encoding, compress, encoded_etag
 from .data_service import DataService
-from .models import ArticleResponse, StatsResponse
+from .executor import Overloaded, QueryExecutor
+from .metrics import RESULT_SIZE, STAGE_SERIALIZATION, Counter, Gauge
+from .models import (
+    ArticleCreate, ArticleResponse, BatchResponse, CacheStatsResponse, FacetsResponse,
+    SearchResult, StatsResponse, TrendsResponse
+)
+from .profiler import Profiler
+from .serialization import dumps
+from .settings import settings
 
-# Initialize data service
-data_service = DataService()
+# Initialize data service; the corpus is loaded in the background by the
+# app lifespan, so importing the API does not wait for it
+data_service = DataService(
+    data_file=settings.data_file,
+    tag_workers=settings.tag_workers,
+    tag_chunk_size=settings.tag_chunk_size,
+    snapshot_file=settings.snapshot_file,
+    journal_file=settings.journal_file,
+    load=False
+)
 
-# Create router
-router = APIRouter()
+# Serialized /articles and /stats responses, invalidated when the corpus changes
+response_cache = ResponseCache(max_bytes=settings.cache_max_bytes, ttl=settings.cache_ttl)
+
+# Bounded pool for rendering and ingestion, keeping the event loop free
+query_executor = QueryExecutor(workers=settings.query_workers, max_queue=settings.query_queue)
+
+# Profiles queries on demand, through the /admin endpoints
+profiler = Profiler()
+
+# Cache and query pool state, read when /metrics is scraped
+Counter(
+    "media_api_cache_lookups_total",
+    "Response cache lookups by result (hit or miss)",
+    ["result"],
+    function=lambda: {("hit",): response_cache.hits, ("miss",): response_cache.misses}
+)
+Counter(
+    "media_api_cache_evictions_total",
+    "Responses evicted from the cache to stay under its size limit",
+    function=lambda: response_cache.evictions
+)
+Gauge(
+    "media_api_cache_size_bytes",
+    "Total size of the cached response bodies",
+    function=lambda: response_cache.size_bytes
+)
+Gauge(
+    "media_api_query_pending",
+    "Queries running or waiting in the query pool",
+    function=lambda: query_executor.pending
+)
+Counter(
+    "media_api_query_rejected_total",
+    "Queries rejected with 503 because the query pool was full",
+    function=lambda: query_executor.rejected
+)
+
+
+def require_ready():
+    """Answer 503 until the corpus has finished loading."""
+    if not data_service.ready:
+        raise HTTPException(
+            status_code=503,
+            detail="Articles are still loading",
+            headers={"Retry-After": "5"}
+        )
+
+
+# Create router; every data route waits for the corpus
+router = APIRouter(dependencies=[Depends(require_ready)])
+
+
+# Fields that can be requested with the fields= projection
+ARTICLE_FIELDS = list(ArticleResponse.model_fields)
+
+# Articles returned by /articles without a limit; bulk clients follow the
+# X-Next-Cursor header or use /articles/export
+DEFAULT_PAGE_SIZE = 100
+
+# Articles encoded per chunk of a streaming export
+EXPORT_CHUNK_SIZE = 500
+
+# Largest number of articles accepted in one ingestion batch
+MAX_BATCH_SIZE = 10000
 
 
 @router.get("/articles", response_model=List[ArticleResponse])
@@ -15,7 +96,14 @@ async def get_articles(
     source: Optional[str] = Query(None, description="Filter by source name"),
     tag: Optional[List[str]] = Query(None, description="Filter by tags (can specify multiple)"),
     date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
-    date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)")
+    date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=1000, description="Maximum number of articles to return"),
+    offset: int = Query(0, ge=0, description="Number of matching articles to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of a previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (e.g. id,title,tags)"),
+    dedupe: bool = Query(False, description="Return one article per group of near-duplicates"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
 ):
     """
     Get articles with optional filtering.
@@ -24,23 +112,352 @@ async def get_articles(
     - **tag**: Filter by articles containing at least one of the provided tags (can specify multiple)
     - **date_from**: Filter by start date in YYYY-MM-DD format
     - **date_to**: Filter by end date in YYYY-MM-DD format
+    - **limit** / **offset**: Page through the results, 100 articles per page by default
+    - **cursor**: Continue after a previous page, using its `X-Next-Cursor` header
+    - **fields**: Only return these fields
+    - **dedupe**: Only return the first matching article of each group of
+      near-duplicates, with the ids of the others in `duplicate_ids`
+    
+    The total number of matches is returned in the `X-Total-Count` header,
+    and `X-Next-Cursor` is set while more pages follow; use `/articles/export`
+    to fetch every match at once. Responses carry an `ETag`; send it back in
+    `If-None-Match` to get a 304 while the articles are unchanged.
+    """
+    selected = _parse_fields(fields)
+    
+    def render() -> Tuple[bytes, Dict[str, str]]:
+        try:
+            page = data_service.query_articles(
+                source=source,
+                tags=tag,
+                date_from=date_from,
+                date_to=date_to,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                dedupe=dedupe
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        RESULT_SIZE.observe(page.total, "/articles")
+        headers = {"X-Total-Count": str(page.total)}
+        if page.next_cursor:
+            headers["X-Next-Cursor"] = page.next_cursor
+        # Articles are serialized directly; response_model only documents the shape
+        return data_service.render_articles(page, fields=selected), headers
+    
+    # Source matching is case-insensitive and tags are matched as a set
+    key = (
+        "articles",
+        source.lower() if source else None,
+        tuple(sorted(set(tag))) if tag else None,
+        date_from,
+        date_to,
+        limit,
+        offset,
+        cursor,
+        tuple(selected) if selected else None,
+        dedupe
+    )
+    return await _cached_response(key, if_none_match, accept_encoding, render)
+
+
+@router.get("/search", response_model=List[SearchResult])
+async def search_articles(
+    q: str = Query(..., description="Words to search for in titles and bodies"),
+    source: Optional[str] = Query(None, description="Filter by source name"),
+    tag: Optional[List[str]] = Query(None, description="Filter by tags (can specify multiple)"),
+    date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    limit: int = Query(20, ge=1, le=1000, description="Maximum number of articles to return"),
+    offset: int = Query(0, ge=0, description="Number of ranked articles to skip"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (e.g. id,title,tags)"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Search article titles and bodies, most relevant first.
+    
+    - **q**: Words that must all appear, e.g. `election results`. Use `OR`
+      between words for either (`health OR hospital`) and quotes for an exact
+      phrase (`"new hospital"`)
+    - **source**, **tag**, **date_from**, **date_to**: Same filters as `/articles`
+    - **limit** / **offset**: Page through the ranked results
+    - **fields**: Only return these article fields; the `score` is always included
+    
+    Results are ranked by BM25 relevance. The total number of matches is
+    returned in the `X-Total-Count` header.
+    """
+    selected = _parse_fields(fields)
+    
+    def render() -> Tuple[bytes, Dict[str, str]]:
+        try:
+            page = data_service.search_articles(
+                q,
+                source=source,
+                tags=tag,
+                date_from=date_from,
+                date_to=date_to,
+                limit=limit,
+                offset=offset
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        RESULT_SIZE.observe(page.total, "/search")
+        return data_service.render_search(page, fields=selected), {"X-Total-Count": str(page.total)}
+    
+    key = (
+        "search",
+        q,
+        source.lower() if source else None,
+        tuple(sorted(set(tag))) if tag else None,
+        date_from,
+        date_to,
+        limit,
+        offset,
+        tuple(selected) if selected else None
+    )
+    return await _cached_response(key, if_none_match, accept_encoding, render)
+
+
+@router.post("/articles:batch", response_model=BatchResponse)
+async def add_articles(
+    articles: List[ArticleCreate] = Body(..., description="Articles to add")
+):
+    """
+    Add a batch of articles.
+    
+    The articles are tagged and indexed as they arrive and show up in
+    `/articles` and `/stats` as soon as the request returns. Tags are
+    assigned by the API.
     """
-    return data_service.get_articles(
-        source=source,
-        tags=tag,
-        date_from=date_from,
-        date_to=date_to
+    if len(articles) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch of {len(articles)} articles exceeds the limit of {MAX_BATCH_SIZE}"
+        )
+    
+    # Tagging runs in the query pool so other requests are not held up
+    added = await _run_query(
+        data_service.add_articles,
+        [article.model_dump() for article in articles]
     )
+    return BatchResponse(added=added, total_articles=len(data_service.articles))
 
 
-@router.get("/stats", response_model=StatsResponse)
-async def get_stats():
+@router.get(
+    "/articles/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}}
+)
+async def export_articles(
+    source: Optional[str] = Query(None, description="Filter by source name"),
+    tag: Optional[List[str]] = Query(None, description="Filter by tags (can specify multiple)"),
+    date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)")
+):
+    """
+    Export matching articles as newline-delimited JSON, one article per line.
+    
+    The response is streamed in chunks as articles are serialized, so bulk
+    exports start immediately and hold only one chunk in memory; it is
+    compressed chunk by chunk when the client accepts gzip. Accepts the
+    same filters as `/articles`.
+    """
+    # The matches are looked up in the query pool like any other query
+    rows = await _run_query(data_service.iter_article_dicts, source, tag, date_from, date_to)
+    return StreamingResponse(_ndjson_chunks(rows), media_type="application/x-ndjson")
+
+
+def _ndjson_chunks(rows: Iterable[Dict], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Encode rows as NDJSON, yielding one chunk of lines at a time."""
+    lines = []
+    for row in rows:
+        lines.append(dumps(row))
+        if len(lines) >= chunk_size:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+@router.get("/stats", response_model=StatsResponse, response_model_exclude_none=True)
+async def get_stats(
+    breakdowns: bool = Query(False, description="Include per-day and per-source-per-tag counts"),
+    dedupe: bool = Query(False, description="Count each group of near-duplicates as one article"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
     """
     Get statistics about articles, including counts per tag and per source.
+    
+    - **breakdowns**: Also return `daily` article counts and `source_tags` counts
+    - **dedupe**: Leave near-duplicates out of the counts
+    
+    `duplicates` is the number of articles that are near-duplicates of an
+    earlier one.
+    """
+    def render() -> Tuple[bytes, Dict[str, str]]:
+        # The counters already have the StatsResponse shape
+        stats = data_service.get_stats(breakdowns=breakdowns, dedupe=dedupe)
+        with STAGE_SERIALIZATION.time():
+            return dumps(stats), {}
+    
+    return await _cached_response(("stats", breakdowns, dedupe), if_none_match, accept_encoding, render)
+
+
+@router.get("/facets", response_model=FacetsResponse)
+async def get_facets(
+    source: Optional[str] = Query(None, description="Filter by source name"),
+    tag: Optional[List[str]] = Query(None, description="Filter by tags (can specify multiple)"),
+    date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    interval: Literal["day", "week", "month"] = Query("day", description="Date histogram bucket size"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
     """
-    stats = data_service.get_stats()
-    return StatsResponse(
-        tags=stats["tags"],
-        sources=stats["sources"],
-        total_articles=stats["total_articles"]
-    ) 
\ No newline at end of file
+    Count tags, sources and dates among the articles matching the filters.
+    
+    Accepts the same filters as `/articles`. Tag and source counts are
+    ordered by descending count; the `dates` histogram is bucketed by day,
+    by week (starting on Monday) or by month.
+    """
+    def render() -> Tuple[bytes, Dict[str, str]]:
+        facets = data_service.get_facets(
+            source=source,
+            tags=tag,
+            date_from=date_from,
+            date_to=date_to,
+            interval=interval
+        )
+        RESULT_SIZE.observe(facets["total"], "/facets")
+        with STAGE_SERIALIZATION.time():
+            return dumps(facets), {}
+    
+    key = (
+        "facets",
+        source.lower() if source else None,
+        tuple(sorted(set(tag))) if tag else None,
+        date_from,
+        date_to,
+        interval
+    )
+    return await _cached_response(key, if_none_match, accept_encoding, render)
+
+
+@router.get("/trends", response_model=TrendsResponse)
+async def get_trends(
+    source: Optional[List[str]] = Query(None, description="Sources to chart (can specify multiple)"),
+    tag: Optional[List[str]] = Query(None, description="Tags to chart (can specify multiple)"),
+    interval: Literal["day", "week", "month"] = Query("day", description="Bucket size"),
+    date_from: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Get article volume over time, for trend charts.
+    
+    Returns one series per `tag`, per `source`, or per source and tag pair
+    when both are given; with neither, a single series counts all articles.
+    Buckets are days, weeks (starting on Monday) or months, and buckets
+    without articles are included as zero.
+    """
+    def render() -> Tuple[bytes, Dict[str, str]]:
+        series = data_service.get_trends(
+            sources=source,
+            tags=tag,
+            interval=interval,
+            date_from=date_from,
+            date_to=date_to
+        )
+        with STAGE_SERIALIZATION.time():
+            return dumps({"interval": interval, "series": series}), {}
+    
+    key = (
+        "trends",
+        tuple(s.lower() for s in source) if source else None,
+        tuple(tag) if tag else None,
+        interval,
+        date_from,
+        date_to
+    )
+    return await _cached_response(key, if_none_match, accept_encoding, render)
+
+
+@router.get("/cache/stats", response_model=CacheStatsResponse)
+async def get_cache_stats():
+    """Get hit, miss and eviction counts of the response cache."""
+    return CacheStatsResponse(**response_cache.metrics())
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a fields= projection, rejecting unknown fields."""
+    if not fields:
+        return None
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in ARTICLE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return selected
+
+
+async def _run_query(func: Callable, *args):
+    """Run CPU-heavy work in the query pool, answering 503 when it is full."""
+    try:
+        return await query_executor.run(profiler.wrap(func), *args)
+    except Overloaded:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, try again shortly",
+            headers={"Retry-After": "1"}
+        )
+
+
+async def _cached_response(
+    key: Hashable,
+    if_none_match: Optional[str],
+    accept_encoding: Optional[str],
+    render: Callable[[], Tuple[bytes, Dict[str, str]]]
+) -> Response:
+    """
+    Serve a JSON response from the cache, rendering and caching it on a miss.
+    
+    Cache hits are answered on the event loop; misses are rendered in the
+    query pool. Answers 304 Not Modified when If-None-Match matches the
+    response ETag.
+    
+    Bodies of at least `compress_min_bytes` are compressed as negotiated
+    from Accept-Encoding, and the compressed copy is cached next to the
+    body, so repeated hits are not compressed again. Each coding has its
+    own ETag.
+    """
+    # Read the version before rendering, so a response that raced with a
+    # corpus change is cached under the older version and never served
+    version = data_service.corpus.version
+    entry = response_cache.get(key, version)
+    status = "HIT"
+    if entry is None:
+        body, headers = await _run_query(render)
+        entry = response_cache.put(key, version, body, headers)
+        status = "MISS"
+    
+    encoding = None
+    if settings.compress_level > 0 and len(entry.body) >= settings.compress_min_bytes:
+        encoding = choose_encoding(accept_encoding)
+    etag = encoded_etag(entry.etag, encoding) if encoding else entry.etag
+    headers = dict(entry.headers, ETag=etag, Vary="Accept-Encoding")
+    headers["X-Cache"] = status
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    body = entry.body
+    if encoding:
+        body = entry.encoded.get(encoding)
+        if body is None:
+            body = await _run_query(compress, entry.body, encoding, settings.compress_level)
+            response_cache.put_encoded(key, entry, encoding, body)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,165 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, NamedTuple, Optional
+
+
+class CachedResponse(NamedTuple):
+    """A serialized response body with the headers it was sent with."""
+    body: bytes
+    etag: str
+    headers: Dict[str, str]
+    version: int
+    # time.monotonic() deadline, or None if the entry does not expire
+    expires: Optional[float]
+    # Compressed copies of the body by content coding, added as requested
+    encoded: Dict[str, bytes]
+
+
+def make_etag(body: bytes) -> str:
+    """Compute a strong ETag for a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag, using weak comparison."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of serialized responses.
+
+    Entries are keyed on normalized query parameters and tagged with the
+    corpus version they were computed from. As soon as a newer version is
+    seen every older entry is dropped, so a reload or an ingested batch
+    never serves stale results. The cache is bounded by the total size of
+    the cached bodies, including their compressed copies, and entries can
+    optionally expire after a TTL.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl or None
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[CachedResponse]:
+        """
+        Look up a response computed for the given corpus version.
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry.version != version
+                or entry.expires is not None and entry.expires <= self.clock()
+            ):
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, version: int, body: bytes, headers: Dict[str, str]) -> CachedResponse:
+        """
+        Cache a serialized response.
+
+        Bodies larger than the whole cache are not stored, but an entry with
+        its ETag is returned either way.
+        """
+        expires = self.clock() + self.ttl if self.ttl else None
+        entry = CachedResponse(body, make_etag(body), headers, version, expires, {})
+        with self._lock:
+            self._check_version(version)
+            # A response computed from an older corpus is already stale
+            if version < self._version or len(body) > self.max_bytes:
+                return entry
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = entry
+            self.size_bytes += len(body)
+            self._evict()
+        return entry
+
+    def put_encoded(self, key: Hashable, entry: CachedResponse, encoding: str, body: bytes):
+        """
+        Store a compressed copy of a cached body, so hits are not compressed again.
+
+        The copy counts towards the cache size. Nothing is stored if the
+        entry has been evicted or replaced in the meantime.
+        """
+        with self._lock:
+            if self._entries.get(key) is not entry or encoding in entry.encoded:
+                return
+            entry.encoded[encoding] = body
+            self.size_bytes += len(body)
+            self._evict()
+
+    def clear(self):
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def metrics(self) -> Dict:
+        """Get hit, miss and eviction counters and the current cache size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_version(self, version: int):
+        """Drop every entry when the corpus has moved to a newer version."""
+        if version > self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.size_bytes = 0
+            self._version = version
+
+    def _evict(self):
+        """Drop the least recently used entries until the cache fits its size limit."""
+        while self.size_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.evictions += 1
+
+    def _discard(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self.size_bytes -= len(entry.body) + sum(len(body) for body in entry.encoded.values())
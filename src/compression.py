@@ -0,0 +1,204 @@
+import gzip
+import zlib
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+# Responses smaller than this are sent uncompressed
+MIN_SIZE = 1024
+
+# gzip level for streamed responses, which are compressed anew on every
+# request: level 1 compresses about 4x faster than level 6 and sends about
+# a third more bytes, and an export would otherwise be limited by gzip
+STREAM_LEVEL = 1
+
+# Brotli quality for responses; 11 is several times slower for a few
+# percent smaller bodies, which does not pay off for dynamic responses
+BROTLI_QUALITY = 5
+
+# Media types worth compressing; images and archives already are
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Content codings this server can produce, in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+@lru_cache(maxsize=256)
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header.
+
+    The coding with the highest q-value wins, with brotli preferred over
+    gzip on ties. Returns None when the client accepts neither.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    default = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, default)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    """Compress a whole response body with gzip or brotli."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output, and so cached bodies, deterministic
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """The ETag of a compressed variant, distinct from the uncompressed one."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+class StreamCompressor:
+    """
+    Incremental gzip or brotli compressor for streamed responses.
+
+    Each chunk is flushed as soon as it is compressed, so clients receive
+    data as it is produced, and memory stays bounded by the chunk size.
+    """
+
+    def __init__(self, encoding: str, level: int = STREAM_LEVEL):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            # wbits 31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def _compressible(headers: MutableHeaders) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with gzip, or brotli if installed.
+
+    The coding is negotiated from Accept-Encoding. Whole responses are
+    compressed in one go when at least `minimum_size` bytes; streamed
+    responses, such as exports, are compressed chunk by chunk. Responses
+    that already carry a Content-Encoding, like the precompressed bodies
+    of the response cache, are passed through unchanged.
+
+    Streams are compressed at STREAM_LEVEL rather than `level`, since they
+    are compressed again for every request.
+    """
+
+    def __init__(self, app, minimum_size: int = MIN_SIZE, level: int = 6):
+        """
+        Args:
+            app: ASGI app to wrap
+            minimum_size: Smallest body, in bytes, that is compressed
+            level: gzip compression level (0 disables compression)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.level <= 0:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                # First body chunk: decide whether to compress at all
+                headers = MutableHeaders(raw=start["headers"])
+                if (
+                    start["status"] < 200 or start["status"] in (204, 304)
+                    or not _compressible(headers)
+                    or not more_body and len(body) < self.minimum_size
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # The compressed bytes differ, so a strong ETag would be wrong
+                    headers["ETag"] = "W/" + etag
+                if not more_body:
+                    body = compress(body, encoding, self.level)
+                    headers["Content-Length"] = str(len(body))
+                    start["headers"] = headers.raw
+                    passthrough = True
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                del headers["Content-Length"]
+                start["headers"] = headers.raw
+                compressor = StreamCompressor(encoding)
+                await send(start)
+
+            data = compressor.compress(body) if body else b""
+            if not more_body:
+                data += compressor.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
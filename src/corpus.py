@@ -0,0 +1,116 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from .dedup import DuplicateIndex, signature
+from .indexes import ArticleIndex
+from .models import Article
+from .search import SearchIndex, tokenize
+from .stats import CorpusStats
+from .store import ArticleStore
+from .trends import TrendRollups
+
+# Word counts for the search index and the near-duplicate signature
+Analysis = Tuple[Dict[str, int], Optional[bytes]]
+
+
+def analyze(title: str, body: str) -> Analysis:
+    """
+    Tokenize an article once for both the search index and duplicate detection.
+    """
+    tokens = tokenize(title) + tokenize(body)
+    return Counter(tokens), signature(tokens)
+
+
+class Corpus:
+    """
+    A consistent set of articles together with their indexes and statistics.
+
+    DataService replaces its corpus as a whole when the data file is
+    reloaded, so a request that holds on to one Corpus sees the store,
+    indexes and counts from the same load.
+    """
+
+    __slots__ = ("articles", "index", "search", "stats", "unique_stats", "trends", "dedup", "version")
+
+    def __init__(
+        self,
+        articles: ArticleStore,
+        index: ArticleIndex,
+        search: SearchIndex,
+        stats: CorpusStats,
+        unique_stats: CorpusStats,
+        trends: TrendRollups,
+        dedup: DuplicateIndex,
+        version: int = 0
+    ):
+        self.articles = articles
+        self.index = index
+        self.search = search
+        self.stats = stats
+        # Counts of the canonical articles only, without near-duplicates
+        self.unique_stats = unique_stats
+        self.trends = trends
+        self.dedup = dedup
+        # Incremented whenever the visible articles change
+        self.version = version
+
+    @classmethod
+    def empty(cls, tag_names: Optional[List[str]] = None) -> "Corpus":
+        """Create a corpus with no articles."""
+        return cls(
+            ArticleStore(tag_names=tag_names),
+            ArticleIndex(),
+            SearchIndex(),
+            CorpusStats(),
+            CorpusStats(),
+            TrendRollups(),
+            DuplicateIndex()
+        )
+
+    def add(self, article: Article, analysis: Optional[Analysis] = None) -> int:
+        """
+        Add an article while loading; call index.finish() once all are added.
+
+        Args:
+            article: The article to add
+            analysis: Its word counts and signature, if already computed
+                with analyze()
+
+        Returns:
+            The position of the new article
+        """
+        if analysis is None:
+            analysis = analyze(article.title, article.body)
+        position = self.articles.append(article)
+        self.index.add(position, article)
+        self._count(position, article, analysis)
+        return position
+
+    def append(self, article: Article, analysis: Optional[Analysis] = None) -> int:
+        """
+        Add an article to a loaded corpus, updating every index right away.
+
+        Args:
+            article: The article to add
+            analysis: Its word counts and signature, if already computed
+                with analyze()
+
+        Returns:
+            The position of the new article
+        """
+        if analysis is None:
+            analysis = analyze(article.title, article.body)
+        position = self.articles.append(article)
+        self.index.append(position, article)
+        self._count(position, article, analysis)
+        return position
+
+    def _count(self, position: int, article: Article, analysis: Analysis):
+        counts, text_signature = analysis
+        self.search.add(position, counts)
+        self.stats.add(article)
+        if self.dedup.add(position, text_signature) is None:
+            self.unique_stats.add(article)
+        self.trends.add(self.index.position_days[position], article.source, article.tags)
+
+    def __len__(self) -> int:
+        return len(self.articles)
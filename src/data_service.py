@@ -1,43 +1,373 @@
 import json
-from typing import List, Dict, Optional
-from datetime import datetime, date
+import threading
+import time
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .corpus import Analysis, Corpus
+from .facets import count_facets
+from .indexes import ArticleIndex, parse_bound
+from .ingest import iter_records, tag_and_analyze
+from .journal import Journal
+from .metrics import (
+    STAGE_FILTERING, STAGE_INDEX_LOOKUP, STAGE_LOAD, STAGE_SEARCH, STAGE_SERIALIZATION
+)
 from .models import Article, ArticleResponse
+from .pagination import ArticlePage, SearchPage, decode_cursor, encode_cursor
+from .serialization import dumps
+from .snapshot import cached_snapshot_key, read_snapshot, snapshot_lock, write_snapshot
+from .stats import CorpusStats
+from .store import ArticleStore
 from .tagging import ArticleTagger
 
 
 class DataService:
     """Service for managing article data and operations."""
     
-    def __init__(self, data_file: str = "data/articles.json"):
+    def __init__(
+        self,
+        data_file: str = "data/articles.json",
+        tag_workers: int = 1,
+        tag_chunk_size: int = 1000,
+        snapshot_file: Optional[str] = None,
+        journal_file: Optional[str] = None,
+        load: bool = True
+    ):
+        """
+        Args:
+            data_file: Articles file to load (JSON array or JSONL)
+            tag_workers: Processes used to tag articles while loading
+            tag_chunk_size: Articles sent to a tagging process at a time
+            snapshot_file: Pre-tagged corpus snapshot to reuse, if any
+            journal_file: File that added articles are written to and
+                replayed from on every load, if any
+            load: Load the data file now; with False the service starts
+                with an empty corpus and is not ready until load() is called
+        """
         self.data_file = data_file
-        self.articles: List[Article] = []
+        self.tag_workers = tag_workers
+        self.tag_chunk_size = tag_chunk_size
+        self.snapshot_file = snapshot_file
+        self.journal = Journal(journal_file) if journal_file else None
+        # Journal offset up to which batches are in the current corpus
+        self._journal_offset = 0
         self.tagger = ArticleTagger()
-        self._load_data()
+        # Serializes changes to the corpus with index and stats reads
+        self._write_lock = threading.Lock()
+        # Serializes whole loads, so a reload never races the initial load
+        self._load_lock = threading.Lock()
+        # Corpus being built by the load in progress, for load_status()
+        self._loading: Optional[Corpus] = None
+        self._load_started: Optional[float] = None
+        self._load_seconds: Optional[float] = None
+        self.ready = False
+        self.corpus = Corpus.empty(tag_names=self.tagger.get_available_tags())
+        if load:
+            self.load()
+    
+    @property
+    def articles(self) -> ArticleStore:
+        """Articles of the current corpus."""
+        return self.corpus.articles
+    
+    @property
+    def index(self) -> ArticleIndex:
+        """Query indexes of the current corpus."""
+        return self.corpus.index
+    
+    @property
+    def stats(self) -> CorpusStats:
+        """Statistics of the current corpus."""
+        return self.corpus.stats
+    
+    def load(self) -> bool:
+        """
+        Load the data file and mark the service ready.
+        
+        A data file that is missing or fails to load part way still makes
+        the service ready, with whatever articles were loaded, as before.
+        
+        Returns:
+            True if the data file loaded cleanly
+        """
+        with self._load_lock:
+            self._load_started = time.monotonic()
+            with STAGE_LOAD.time():
+                corpus, loaded = self._load_data()
+                journal_offset = self._replay_journal(corpus)
+            with self._write_lock:
+                self._journal_offset = journal_offset
+                # Nothing is served from the empty corpus, so the first load
+                # keeps its version
+                corpus.version = self.corpus.version + 1 if self.ready else self.corpus.version
+                self.corpus = corpus
+                self.ready = True
+            self._load_seconds = time.monotonic() - self._load_started
+        return loaded
+    
+    def load_status(self) -> Dict:
+        """
+        Report whether the corpus is loaded, and how far the load has got.
+        
+        Returns:
+            The status (`loading` or `ready`), the number of articles
+            loaded so far and the seconds spent loading
+        """
+        if self.ready:
+            return {
+                "status": "ready",
+                "articles": len(self.corpus.articles),
+                "seconds": round(self._load_seconds or 0.0, 3)
+            }
+        loading = self._loading
+        started = self._load_started
+        return {
+            "status": "loading",
+            "articles": len(loading.articles) if loading is not None else 0,
+            "seconds": round(time.monotonic() - started, 3) if started is not None else 0.0
+        }
     
-    def _load_data(self):
-        """Load articles from JSON file and tag them."""
+    def reload(self) -> bool:
+        """
+        Reload the data file and swap in the new corpus.
+        
+        The new corpus is built without touching the current one and then
+        replaces it in a single assignment. Requests that already hold the
+        old corpus finish against it. Articles added with add_articles() are
+        replaced too, unless they were also written to the data file or a
+        journal is configured, from which they are replayed.
+        
+        Returns:
+            True if the data file loaded cleanly and was swapped in
+        """
+        with self._load_lock:
+            with STAGE_LOAD.time():
+                corpus, loaded = self._load_data()
+                if loaded:
+                    journal_offset = self._replay_journal(corpus)
+            if not loaded:
+                print(f"Warning: keeping the current corpus, {self.data_file} did not load cleanly.")
+                return False
+            with self._write_lock:
+                self._journal_offset = journal_offset
+                corpus.version = self.corpus.version + 1
+                self.corpus = corpus
+        return True
+    
+    def add_articles(self, records: Iterable[Dict]) -> int:
+        """
+        Tag and add a batch of articles to the current corpus.
+        
+        Only the new articles are tagged and indexed, so the cost depends on
+        the batch size rather than the corpus size. The batch is validated
+        and tagged before anything is changed, so an invalid record leaves
+        the corpus untouched.
+        
+        With a journal, the batch is written to it before it is added, and
+        batches other processes wrote to it since the last sync are added
+        first.
+        
+        Args:
+            records: Raw articles in the data file format
+            
+        Returns:
+            The number of articles added
+            
+        Raises:
+            KeyError: If a record is missing a required field
+            ValueError: If a record is not a valid article
+            OSError: If the batch could not be written to the journal
+        """
+        records = list(records)
+        articles = []
+        analyses = []
+        for data, tags, analysis in tag_and_analyze(self.tagger, records):
+            article = self._make_article(data, tags)
+            # Check the row fits the store before the batch is journaled
+            ArticleStore.encode_row(article)
+            articles.append(article)
+            analyses.append(analysis)
+        if not articles:
+            return 0
+        # Tag what other workers added outside the lock; usually all of it
+        self.sync_journal()
+        
+        if self.journal is None:
+            with self._write_lock:
+                corpus = self.corpus
+                for article, analysis in zip(articles, analyses):
+                    corpus.append(article, analysis)
+                corpus.version += 1
+            return len(articles)
+        
+        # The journal is written and anything pending tagged before taking
+        # the write lock, so queries are not held up by the disk
+        start = self._journal_offset
+        with self.journal.locked():
+            pending, _ = self.journal.read(start)
+            journal_offset = self.journal.append(records)
+        pending = self._journal_articles(pending)
+        
+        with self._write_lock:
+            if self._journal_offset == start:
+                corpus = self.corpus
+                # Anything written since the sync above goes in first
+                self._append_journal_articles(corpus, pending)
+                for article, analysis in zip(articles, analyses):
+                    corpus.append(article, analysis)
+                self._journal_offset = journal_offset
+                corpus.version += 1
+                return len(articles)
+        
+        # A sync, reload or other batch moved the offset in the meantime; the
+        # batch is in the journal either way, so pick it up from there
+        while self._journal_offset < journal_offset:
+            offset = self._journal_offset
+            self.sync_journal()
+            if self._journal_offset == offset:
+                break
+        return len(articles)
+    
+    def sync_journal(self) -> int:
+        """
+        Add the batches other processes have written to the journal.
+        
+        The new records are tagged before the lock is taken. If a batch was
+        added or the corpus reloaded in the meantime, nothing is added and
+        the next sync reads them again.
+        
+        Returns:
+            The number of articles added
+        """
+        if self.journal is None or not self.ready:
+            return 0
+        start = self._journal_offset
+        records, end = self.journal.read(start)
+        if end == start:
+            return 0
+        added = self._journal_articles(records)
+        with self._write_lock:
+            if self._journal_offset != start:
+                return 0
+            corpus = self.corpus
+            count = self._append_journal_articles(corpus, added)
+            self._journal_offset = end
+            if count:
+                corpus.version += 1
+        return count
+    
+    def _replay_journal(self, corpus: Corpus) -> int:
+        """
+        Add the articles of the journal to a newly loaded corpus.
+        
+        Returns:
+            The journal offset the corpus is now up to date with
+        """
+        if self.journal is None:
+            return 0
+        records, offset = self.journal.read()
+        self._append_journal_articles(corpus, self._journal_articles(records, workers=self.tag_workers))
+        return offset
+    
+    def _append_journal_articles(self, corpus: Corpus, added: List[Tuple[Article, Analysis]]) -> int:
+        """
+        Append tagged journal articles, skipping any the corpus rejects.
+        
+        Returns:
+            The number of articles appended
+        """
+        count = 0
+        for article, analysis in added:
+            try:
+                corpus.append(article, analysis)
+            except ValueError as e:
+                print(f"Warning: skipping an invalid article in {self.journal.path}: {e}")
+                continue
+            count += 1
+        return count
+    
+    def _journal_articles(self, records: List[Dict], workers: int = 1) -> List[Tuple[Article, Analysis]]:
+        """Tag and analyze journal records, skipping any that are not valid articles."""
+        result = []
+        tagged = tag_and_analyze(self.tagger, records, workers=workers, chunk_size=self.tag_chunk_size)
+        for data, tags, analysis in tagged:
+            try:
+                article = self._make_article(data, tags)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Warning: skipping an invalid article in {self.journal.path}: {e}")
+                continue
+            result.append((article, analysis))
+        return result
+    
+    def _make_article(self, data: Dict, tags: List[str]) -> Article:
+        """Create a validated Article from a raw record and its tags."""
+        return Article(
+            id=int(data['id']),  # Convert string ID to int
+            title=data['title'],
+            body=data['body'],
+            source=data['source'],
+            date=data['date'],
+            url=data.get('url', ''),  # Handle missing url field
+            tags=tags
+        )
+    
+    def _load_data(self) -> Tuple[Corpus, bool]:
+        """
+        Load the corpus, from a snapshot when one matches the data file.
+        
+        With a snapshot configured, the process that builds the snapshot
+        holds a lock while doing so; every process then attaches to the
+        snapshot, so the corpus pages are shared between workers.
+        
+        Returns:
+            The new corpus, and True if it loaded without errors
+        """
+        if not self.snapshot_file:
+            return self._parse_data()
+        
+        with snapshot_lock(self.snapshot_file):
+            try:
+                key = cached_snapshot_key(self.data_file, self.tagger, self.snapshot_file)
+            except OSError:
+                key = None
+            
+            corpus = read_snapshot(self.snapshot_file, key) if key else None
+            if corpus is not None:
+                return corpus, True
+            
+            corpus, loaded = self._parse_data()
+            # Only snapshot a corpus that loaded cleanly
+            if key and loaded:
+                write_snapshot(self.snapshot_file, key, corpus)
+                corpus = read_snapshot(self.snapshot_file, key) or corpus
+            return corpus, loaded
+    
+    def _parse_data(self) -> Tuple[Corpus, bool]:
+        """
+        Load articles from a JSON or JSONL file and tag them, in parallel if configured.
+        
+        Returns:
+            The new corpus, and True if the whole file was loaded without errors
+        """
+        corpus = Corpus.empty(tag_names=self.tagger.get_available_tags())
+        self._loading = corpus
+        loaded = False
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                raw_articles = json.load(f)
+            # Stream records so the raw file is never held in memory at once
+            raw_articles = iter_records(self.data_file)
             
-            for article_data in raw_articles:
-                # Tag the article
-                tags = self.tagger.tag_article(
-                    article_data['title'], 
-                    article_data['body']
-                )
-                
-                # Create Article object with tags
-                article = Article(
-                    id=int(article_data['id']),  # Convert string ID to int
-                    title=article_data['title'],
-                    body=article_data['body'],
-                    source=article_data['source'],
-                    date=article_data['date'],
-                    url=article_data.get('url', ''),  # Handle missing url field
-                    tags=tags
-                )
-                self.articles.append(article)
+            # Word counts and signatures are computed with the tags, in
+            # the worker processes when there are any
+            tagged = tag_and_analyze(
+                self.tagger,
+                raw_articles,
+                workers=self.tag_workers,
+                chunk_size=self.tag_chunk_size
+            )
+            
+            for article_data, tags, analysis in tagged:
+                corpus.add(self._make_article(article_data, tags), analysis)
+            
+            loaded = True
                 
         except FileNotFoundError:
             print(f"Warning: Data file {self.data_file} not found.")
@@ -45,6 +375,11 @@ class DataService:
             print(f"Error parsing JSON file: {e}")
         except Exception as e:
             print(f"Error loading data: {e}")
+        
+        # Sort the date index once the corpus is in memory
+        corpus.index.finish()
+        self._loading = None
+        return corpus, loaded
     
     def get_articles(
         self,
@@ -65,88 +400,311 @@ class DataService:
         Returns:
             Filtered list of articles
         """
-        filtered_articles = self.articles.copy()
-        
-        # Filter by source
-        if source:
-            filtered_articles = [
-                article for article in filtered_articles 
-                if article.source.lower() == source.lower()
-            ]
-        
-        # Filter by tags
-        if tags:
-            filtered_articles = [
-                article for article in filtered_articles
-                if any(tag in article.tags for tag in tags)
-            ]
-        
-        # Filter by date range
-        if date_from or date_to:
-            filtered_articles = self._filter_by_date_range(
-                filtered_articles, date_from, date_to
-            )
+        page = self.query_articles(
+            source=source,
+            tags=tags,
+            date_from=date_from,
+            date_to=date_to
+        )
+        store = page.corpus.articles
+        return [ArticleResponse.model_construct(**store.row_dict(p)) for p in page.positions]
+    
+    def query_articles(
+        self,
+        source: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        dedupe: bool = False
+    ) -> ArticlePage:
+        """
+        Get one page of filtered articles.
+        
+        Only positions are returned; articles are converted with
+        render_articles() or get_articles(), so the cost is bounded by the
+        page size rather than the match count. The page keeps a reference to
+        the corpus it was computed from, so it renders consistently even if
+        the corpus is reloaded in between.
+        
+        Args:
+            source: Filter by source name
+            tags: Filter by tags (articles must have at least one of these tags)
+            date_from: Start date in YYYY-MM-DD format
+            date_to: End date in YYYY-MM-DD format
+            limit: Maximum number of articles to return (None for all)
+            offset: Number of matching articles to skip
+            cursor: Continue after the last article of a previous page
+            dedupe: Only return the first matching article of each group of
+                near-duplicates; the total counts groups rather than articles
+            
+        Returns:
+            The page positions, the total match count and the next cursor
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        corpus = self.corpus
+        positions = self._match_positions(corpus, source, tags, date_from, date_to, dedupe=dedupe)
+        total = len(positions)
+        
+        start = bisect_right(positions, decode_cursor(cursor)) if cursor else 0
+        start = min(total, start + offset)
+        end = total if limit is None else min(total, start + limit)
+        page = positions[start:end]
+        
+        next_cursor = encode_cursor(page[-1]) if page and end < total else None
+        duplicates = None
+        if dedupe:
+            with self._write_lock:
+                group = corpus.dedup.group
+                duplicates = [[q for q in group(p) if q != p] for p in page]
+        return ArticlePage(
+            positions=page, total=total, next_cursor=next_cursor, corpus=corpus, duplicates=duplicates
+        )
+    
+    def render_articles(self, page: ArticlePage, fields: Optional[List[str]] = None) -> bytes:
+        """
+        Serialize articles straight to a JSON array.
+        
+        Stored articles were validated when they were loaded, so this skips
+        building and re-validating response models. Pages of deduplicated
+        articles list the ids of the other articles of each group in
+        `duplicate_ids`.
+        
+        Args:
+            page: Page returned by query_articles()
+            fields: Only include these fields (None for all)
+            
+        Returns:
+            UTF-8 encoded JSON
+        """
+        store = page.corpus.articles
+        with STAGE_SERIALIZATION.time():
+            rows = [store.row_dict(p) for p in page.positions]
+            if fields is not None:
+                rows = [{field: row[field] for field in fields} for row in rows]
+            if page.duplicates is not None:
+                ids = store.ids
+                for others, row in zip(page.duplicates, rows):
+                    row["duplicate_ids"] = [ids[q] for q in others]
+            return dumps(rows)
+    
+    def search_articles(
+        self,
+        query: str,
+        source: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> SearchPage:
+        """
+        Search article titles and bodies, ranked by BM25 relevance.
         
-        # Convert to response format
-        return [
-            ArticleResponse(
-                id=article.id,
-                title=article.title,
-                body=article.body,
-                source=article.source,
-                date=article.date,
-                url=article.url or "",
-                tags=article.tags
+        Args:
+            query: Words to search for; see search.parse_query() for OR and phrases
+            source: Filter by source name
+            tags: Filter by tags (articles must have at least one of these tags)
+            date_from: Start date in YYYY-MM-DD format
+            date_to: End date in YYYY-MM-DD format
+            limit: Maximum number of articles to return (None for all)
+            offset: Number of ranked articles to skip
+            
+        Returns:
+            The page positions and scores, and the total match count
+            
+        Raises:
+            ValueError: If the query has no words
+        """
+        corpus = self.corpus
+        store = corpus.articles
+        
+        def texts(position: int):
+            return store.text_field(position, "title"), store.text_field(position, "body")
+        
+        with self._write_lock:
+            with STAGE_INDEX_LOOKUP.time():
+                candidates = corpus.index.lookup(
+                    source=source,
+                    tags=tags,
+                    date_from=date_from,
+                    date_to=date_to
+                )
+            # Scoring and phrase checks run on the view, without the lock
+            index = corpus.search.view(query)
+        with STAGE_SEARCH.time():
+            ranked, total = index.search(
+                query,
+                candidates=candidates,
+                texts=texts,
+                limit=limit,
+                offset=offset
             )
-            for article in filtered_articles
-        ]
+        return SearchPage(
+            positions=[p for p, _ in ranked],
+            scores=[score for _, score in ranked],
+            total=total,
+            corpus=corpus
+        )
     
-    def _filter_by_date_range(
+    def render_search(self, page: SearchPage, fields: Optional[List[str]] = None) -> bytes:
+        """
+        Serialize search results to a JSON array, each with its score.
+        
+        Args:
+            page: Page returned by search_articles()
+            fields: Only include these article fields (None for all)
+        """
+        store = page.corpus.articles
+        with STAGE_SERIALIZATION.time():
+            rows = []
+            for position, score in zip(page.positions, page.scores):
+                row = store.row_dict(position)
+                if fields is not None:
+                    row = {field: row[field] for field in fields}
+                row["score"] = round(score, 4)
+                rows.append(row)
+            return dumps(rows)
+    
+    def iter_article_dicts(
         self,
-        articles: List[Article],
+        source: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Lazily yield matching articles as plain dictionaries, for bulk export.
+        
+        The matches are resolved up front, but each article is only converted
+        when the consumer asks for it.
+        
+        Args:
+            source: Filter by source name
+            tags: Filter by tags (articles must have at least one of these tags)
+            date_from: Start date in YYYY-MM-DD format
+            date_to: End date in YYYY-MM-DD format
+        """
+        corpus = self.corpus
+        positions = self._match_positions(corpus, source, tags, date_from, date_to)
+        return (corpus.articles.row_dict(position) for position in positions)
+    
+    def _match_positions(
+        self,
+        corpus: Corpus,
+        source: Optional[str],
+        tags: Optional[List[str]],
         date_from: Optional[str],
-        date_to: Optional[str]
-    ) -> List[Article]:
-        """Filter articles by date range."""
-        filtered = articles
+        date_to: Optional[str],
+        dedupe: bool = False
+    ):
+        """
+        Get the sorted positions of matching articles in a corpus.
         
-        if date_from:
-            try:
-                from_date = datetime.strptime(date_from, "%Y-%m-%d").date()
-                filtered = [
-                    article for article in filtered
-                    if datetime.strptime(article.date, "%Y-%m-%d").date() >= from_date
-                ]
-            except ValueError:
-                print(f"Invalid date_from format: {date_from}")
-        
-        if date_to:
-            try:
-                to_date = datetime.strptime(date_to, "%Y-%m-%d").date()
-                filtered = [
-                    article for article in filtered
-                    if datetime.strptime(article.date, "%Y-%m-%d").date() <= to_date
-                ]
-            except ValueError:
-                print(f"Invalid date_to format: {date_to}")
-        
-        return filtered
-    
-    def get_stats(self) -> Dict:
-        """Get statistics about articles, tags, and sources."""
-        # Count by tags
-        tag_counts = {}
-        for article in self.articles:
-            for tag in article.tags:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
-        
-        # Count by sources
-        source_counts = {}
-        for article in self.articles:
-            source_counts[article.source] = source_counts.get(article.source, 0) + 1
+        With dedupe, only the first match of each group of near-duplicates
+        is kept. Groups grow as articles are added, so they are read under
+        the same lock as the index.
+        """
+        with self._write_lock, STAGE_INDEX_LOOKUP.time():
+            positions = corpus.index.lookup(
+                source=source,
+                tags=tags,
+                date_from=date_from,
+                date_to=date_to
+            )
+            if positions is None:
+                positions = range(len(corpus.articles))
+            if dedupe:
+                positions = corpus.dedup.collapse(positions)
+        return positions
+    
+    def get_facets(
+        self,
+        source: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        interval: str = "day"
+    ) -> Dict:
+        """
+        Count tags, sources and dates among the filtered articles.
         
-        return {
-            "tags": tag_counts,
-            "sources": source_counts,
-            "total_articles": len(self.articles)
-        } 
\ No newline at end of file
+        The counts come from the index and the store's columns, so no
+        article is built and the cost depends on the number of matches.
+        
+        Args:
+            source: Filter by source name
+            tags: Filter by tags (articles must have at least one of these tags)
+            date_from: Start date in YYYY-MM-DD format
+            date_to: End date in YYYY-MM-DD format
+            interval: Date histogram bucket size: day, week or month
+        """
+        corpus = self.corpus
+        positions = self._match_positions(corpus, source, tags, date_from, date_to)
+        with STAGE_FILTERING.time():
+            return count_facets(corpus, positions, interval)
+    
+    def get_trends(
+        self,
+        sources: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        interval: str = "day",
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Get article counts over time from the precomputed rollups.
+        
+        There is one series per source, per tag, or per source and tag pair
+        when both are given, and a single series for all articles when
+        neither is.
+        
+        Args:
+            sources: Sources to count (case-insensitive)
+            tags: Tags to count
+            interval: Bucket size: day, week or month
+            date_from: Start date in YYYY-MM-DD format
+            date_to: End date in YYYY-MM-DD format
+            
+        Returns:
+            One dictionary per series, with its source, tag and counts by bucket
+        """
+        from_day = parse_bound(date_from, "date_from") if date_from else None
+        to_day = parse_bound(date_to, "date_to") if date_to else None
+        
+        corpus = self.corpus
+        result = []
+        with self._write_lock, STAGE_FILTERING.time():
+            for source in sources or [None]:
+                for tag in tags or [None]:
+                    counts = corpus.trends.series(
+                        source=source,
+                        tag=tag,
+                        interval=interval,
+                        from_day=from_day,
+                        to_day=to_day
+                    )
+                    result.append({"source": source, "tag": tag, "counts": counts})
+        return result
+    
+    def get_stats(self, breakdowns: bool = False, dedupe: bool = False) -> Dict:
+        """
+        Get statistics about articles, tags, and sources.
+        
+        Counts are maintained as articles are loaded, so this does not scan
+        the corpus.
+        
+        Args:
+            breakdowns: Also include per-day and per-source-per-tag counts
+            dedupe: Count each group of near-duplicates as one article
+        """
+        with self._write_lock:
+            corpus = self.corpus
+            stats = corpus.unique_stats if dedupe else corpus.stats
+            result = stats.to_dict(breakdowns=breakdowns)
+            result["duplicates"] = corpus.dedup.duplicates
+            return result
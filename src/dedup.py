@@ -0,0 +1,249 @@
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from itertools import chain, repeat
+from operator import eq
+from typing import Dict, List, Optional, Sequence
+from .store import writable
+
+
+# One-permutation MinHash: the hashes of a text's shingles are split by
+# value into BINS ranges, and the low byte of the smallest hash in each is
+# kept, so a signature is BINS bytes. The fraction of equal bins of two
+# signatures estimates the Jaccard similarity of their shingle sets
+BINS = 32
+_BIN_BOUNDS = [-(1 << 63) + (i << 59) for i in range(BINS)] + [1 << 63]
+
+# Texts sharing at least this estimated fraction of their shingles are
+# near-duplicates
+MIN_SIMILARITY = 0.75
+
+# LSH: an article is only compared with articles whose bins all match in
+# at least one of BANDS bands of ROWS bins. With 8 bands of 4, pairs at
+# similarity 0.75 are compared 95% of the time, pairs at 0.9 almost always
+# and unrelated pairs practically never
+BANDS = 8
+ROWS = BINS // BANDS
+_BAND_FORMAT = f"={BANDS}I"
+
+# Articles are chained per band under BUCKET_BITS of a hash of the band;
+# the chain heads take 8 MB once an article is added, and chains stay a few
+# dozen entries long up to about ten million articles
+BUCKET_BITS = 18
+BUCKET_MASK = (1 << BUCKET_BITS) - 1
+
+# Chain entries checked per band, newest first. Copies are usually
+# published soon after the original, and in formulaic text a band shared
+# by many unrelated articles would otherwise make every lookup slow
+MAX_CHAIN = 64
+
+# Offset added to a bin value borrowed by an empty bin, per bin skipped
+_DENSIFY_STEP = 0x9D
+
+
+def signature(tokens: Sequence[str]) -> Optional[bytes]:
+    """
+    MinHash signature of the word 3-shingles of a text.
+
+    Shingles are hashed from the CRC-32 of their words, which unlike
+    hash() of a string is the same in every process, so signatures can be
+    kept in snapshots. One sort of the hashes and a bisect per bin find
+    every bin's minimum, instead of hashing the text once per bin.
+
+    Args:
+        tokens: Words of the text, as from search.tokenize()
+
+    Returns:
+        BINS bytes, or None for a text without words
+    """
+    hashes = list(map(zlib.crc32, map(str.encode, tokens)))
+    if len(hashes) >= 3:
+        shingles = sorted(map(hash, zip(hashes, hashes[1:], hashes[2:])))
+    else:
+        shingles = sorted(map(hash, zip(hashes)))
+    if not shingles:
+        return None
+    starts = list(map(bisect_left, repeat(shingles), _BIN_BOUNDS))
+    values = [shingles[start] & 0xFF if start < end else None for start, end in zip(starts, starts[1:])]
+    if None in values:
+        values = _densify(values)
+    return bytes(values)
+
+
+def _densify(values: List[Optional[int]]) -> List[int]:
+    """Fill empty bins, common in short texts, from the next non-empty bin."""
+    filled = list(values)
+    for i, value in enumerate(values):
+        if value is None:
+            for step in range(1, BINS):
+                borrowed = values[(i + step) % BINS]
+                if borrowed is not None:
+                    filled[i] = (borrowed + step * _DENSIFY_STEP) & 0xFF
+                    break
+    return filled
+
+
+def bucket(band: int, value: int) -> int:
+    """Chain of a band value: all four bins of the band pick it, not just two."""
+    # Multiplicative hashing: the middle bits of the product depend on every bin
+    return band << BUCKET_BITS | (value * 0x9E3779B1 >> 16) & BUCKET_MASK
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of the texts of two signatures."""
+    return sum(map(eq, a, b)) / BINS
+
+
+class DuplicateIndex:
+    """
+    Near-duplicate groups of a corpus, found by locality-sensitive hashing.
+
+    Each article's signature is compared with those of the canonical
+    articles before it that share a band: similar enough to one, the
+    article joins that article's group, otherwise it becomes canonical
+    itself. Checking an article looks at the newest entries of one chain
+    per band rather than at every article, so its cost is bounded however
+    large the corpus grows.
+
+    Signatures and chains are flat arrays of a fixed size per article, so
+    they are stored and attached like the other columns of a snapshot.
+    Duplicates are usually few, so groups are kept in dictionaries keyed by
+    position instead.
+    """
+
+    def __init__(self):
+        # BANDS band values per article, all 0 for articles without words
+        self.signatures = array('I')
+        # Last canonical article per band and bucket, -1 when none; allocated
+        # by the first add(), so empty corpora do not hold it
+        self.heads = array('i')
+        # Per article and band, the previous canonical article in the chain
+        self.chains = array('i')
+        # Position of a duplicate -> position of the canonical article
+        self.canonical: Dict[int, int] = {}
+        # Position of a canonical article -> positions of its duplicates
+        self.groups: Dict[int, List[int]] = {}
+
+    @property
+    def duplicates(self) -> int:
+        """Number of articles that are near-duplicates of an earlier one."""
+        return len(self.canonical)
+
+    def add(self, position: int, signature: Optional[bytes]) -> Optional[int]:
+        """
+        Record the signature of an article and group it.
+
+        Positions must be added in increasing order, one per article.
+
+        Args:
+            position: Position of the article
+            signature: Its signature, None for an article without words
+
+        Returns:
+            The position of the canonical article if this one is a
+            near-duplicate, None otherwise
+        """
+        if isinstance(self.signatures, memoryview):
+            self.signatures = writable(self.signatures)
+        if isinstance(self.heads, memoryview):
+            self.heads = writable(self.heads)
+        if isinstance(self.chains, memoryview):
+            self.chains = writable(self.chains)
+        if signature is None:
+            self.signatures.extend(repeat(0, BANDS))
+            self.chains.extend(repeat(-1, BANDS))
+            return None
+
+        if not self.heads:
+            self.heads = array('i', [-1]) * (BANDS << BUCKET_BITS)
+        bands = struct.unpack(_BAND_FORMAT, signature)
+        canonical = self.find(signature, bands)
+        self.signatures.extend(bands)
+        if canonical is not None:
+            self.chains.extend(repeat(-1, BANDS))
+            self.canonical[position] = canonical
+            self.groups.setdefault(canonical, []).append(position)
+            return canonical
+
+        heads = self.heads
+        for band, value in enumerate(bands):
+            chain = bucket(band, value)
+            self.chains.append(heads[chain])
+            heads[chain] = position
+        return None
+
+    def find(self, signature: bytes, bands: Optional[Sequence[int]] = None) -> Optional[int]:
+        """Position of the earliest canonical article similar to a signature, or None."""
+        if bands is None:
+            bands = struct.unpack(_BAND_FORMAT, signature)
+        signatures = self.signatures
+        heads = self.heads
+        chains = self.chains
+        if not heads:
+            return None
+        found = None
+        for band, value in enumerate(bands):
+            position = heads[bucket(band, value)]
+            for _ in range(MAX_CHAIN):
+                if position < 0:
+                    break
+                index = position * BANDS
+                if (
+                    signatures[index + band] == value
+                    and (found is None or position < found)
+                    and similarity(signatures[index:index + BANDS].tobytes(), signature) >= MIN_SIMILARITY
+                ):
+                    found = position
+                position = chains[index + band]
+        return found
+
+    def group(self, position: int) -> List[int]:
+        """Positions of all articles in the group of an article, canonical first."""
+        canonical = self.canonical.get(position, position)
+        return [canonical] + self.groups.get(canonical, [])
+
+    def collapse(self, positions: Sequence[int]) -> Sequence[int]:
+        """
+        Keep only the first article of each group among sorted positions.
+
+        Only articles in a group with more than one member can be dropped,
+        so when the positions outnumber those, the groups are looked up in
+        the positions rather than each position in the groups.
+        """
+        if not self.groups:
+            return positions
+        canonical = self.canonical
+        if len(positions) <= len(canonical) + len(self.groups):
+            seen = set()
+            kept = []
+            for position in positions:
+                first = canonical.get(position, position)
+                if first not in seen:
+                    seen.add(first)
+                    kept.append(position)
+            return kept
+
+        dropped = []
+        for first, members in self.groups.items():
+            present = [
+                position for position in chain((first,), members)
+                if _contains(positions, position)
+            ]
+            dropped.extend(present[1:])
+        if not dropped:
+            return positions
+        dropped.sort()
+        pieces = []
+        start = 0
+        for position in dropped:
+            index = bisect_left(positions, position)
+            pieces.append(positions[start:index])
+            start = index + 1
+        pieces.append(positions[start:])
+        return list(chain.from_iterable(pieces))
+
+
+def _contains(positions: Sequence[int], position: int) -> bool:
+    index = bisect_left(positions, position)
+    return index < len(positions) and positions[index] == position
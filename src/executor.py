@@ -0,0 +1,77 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class Overloaded(Exception):
+    """Raised when the executor has no room for more work."""
+
+
+class QueryExecutor:
+    """
+    Bounded pool that runs CPU-heavy query work off the event loop.
+
+    At most `workers` calls run at once and at most `max_queue` more wait
+    for a thread. Work beyond that is rejected with Overloaded instead of
+    queueing without bound, so a burst of large requests turns into fast
+    503s rather than growing latency for everyone. While the pool is busy
+    the event loop keeps serving cheap requests such as /health and cache
+    hits.
+
+    Threads share the corpus without copying it; they hold the GIL while
+    computing, but the interpreter switches threads every few milliseconds,
+    so the event loop is never stalled for the length of a whole request.
+    Because the work is GIL-bound, more threads than a few add contention
+    rather than throughput. With workers=0 calls run inline on the event
+    loop.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 64):
+        self.workers = workers
+        self.max_queue = max_queue
+        # Started on first use, so a shut down executor can be reused
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # Only changed from the event loop thread, so no lock is needed
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a function in the pool and wait for its result.
+
+        Raises:
+            Overloaded: If `workers + max_queue` calls are already pending
+        """
+        if self.workers <= 0:
+            return func(*args, **kwargs)
+        if self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise Overloaded(f"{self.pending} queries pending")
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="query")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, functools.partial(func, *args, **kwargs))
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    def metrics(self) -> Dict:
+        """Get the pool size and the pending, completed and rejected call counts."""
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self):
+        """Stop the worker threads once pending calls finish."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
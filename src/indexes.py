@@ -0,0 +1,257 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, date
+from itertools import chain
+from typing import Dict, List, Optional, Sequence, Tuple
+from .models import Article
+from .store import writable
+
+
+# Day number stored for articles whose date could not be parsed
+MISSING_DAY = -1
+
+# Largest day number a date can have
+MAX_DAY = date.max.toordinal()
+
+# Back-dated appends kept aside before they are merged into the date arrays
+MAX_LATE_DATES = 4096
+
+class ArticleIndex:
+    """
+    Inverted indexes over article positions.
+
+    Positions refer to the order in which articles were loaded, so every
+    posting list is kept sorted and query results come back in load order.
+    """
+
+    def __init__(self):
+        # Lower-cased source name -> sorted positions
+        self.source_postings: Dict[str, Sequence[int]] = {}
+        # Tag -> sorted positions
+        self.tag_postings: Dict[str, Sequence[int]] = {}
+        # Proleptic Gregorian ordinal of each article's date, by position
+        self.position_days = array('i')
+        # Parallel arrays sorted by day, used for range bisection
+        self.date_keys = array('i')
+        self.date_positions = array('q')
+        # Appended articles older than the newest date, sorted by day
+        self.late_keys = array('i')
+        self.late_positions = array('q')
+        # Ids of articles whose date could not be parsed
+        self.malformed_dates: List[int] = []
+
+    def add(self, position: int, article: Article):
+        """
+        Index an article during loading.
+
+        Positions must be added in increasing order. Call finish() once all
+        articles have been added.
+        """
+        if isinstance(self.position_days, memoryview) or isinstance(self.date_positions, memoryview):
+            self._make_writable()
+        self._add_postings(position, article)
+        day = parse_day(article.date)
+        if day == MISSING_DAY:
+            self.malformed_dates.append(article.id)
+        self.position_days.append(day)
+
+    def finish(self):
+        """Sort the date arrays and report malformed dates after loading."""
+        # Positions with malformed dates are left out of the date arrays
+        order = sorted(
+            (p for p, day in enumerate(self.position_days) if day != MISSING_DAY),
+            key=self.position_days.__getitem__
+        )
+        self.date_positions = array('q', order)
+        self.date_keys = array('i', (self.position_days[p] for p in order))
+        self.late_keys = array('i')
+        self.late_positions = array('q')
+
+        if self.malformed_dates:
+            sample = ", ".join(str(i) for i in self.malformed_dates[:5])
+            print(
+                f"Warning: {len(self.malformed_dates)} article(s) have malformed dates "
+                f"and are excluded from date filters (ids: {sample})"
+            )
+
+    def append(self, position: int, article: Article):
+        """
+        Index an article added after loading.
+
+        Unlike add(), the date arrays are updated right away. Articles are
+        usually newer than the corpus, in which case this is an append.
+        Older dates would have to be inserted into the middle of the date
+        arrays, so they are kept in small side arrays that lookups also
+        search, and merged in one pass once MAX_LATE_DATES have piled up.
+        """
+        self.add(position, article)
+        day = self.position_days[position]
+        if day == MISSING_DAY:
+            return
+        if not self.date_keys or day >= self.date_keys[-1]:
+            self.date_keys.append(day)
+            self.date_positions.append(position)
+            return
+        # Insert after equal days so positions stay in load order
+        i = bisect_right(self.late_keys, day)
+        self.late_keys.insert(i, day)
+        self.late_positions.insert(i, position)
+        if len(self.late_keys) >= MAX_LATE_DATES:
+            self._merge_late_dates()
+
+    def _merge_late_dates(self):
+        """Merge the back-dated appends into the date arrays."""
+        keys = array('i')
+        positions = array('q')
+        start = 0
+        for day, position in zip(self.late_keys, self.late_positions):
+            # Earlier articles of the same day keep their place in front
+            end = bisect_right(self.date_keys, day, start)
+            keys.extend(self.date_keys[start:end])
+            positions.extend(self.date_positions[start:end])
+            keys.append(day)
+            positions.append(position)
+            start = end
+        keys.extend(self.date_keys[start:])
+        positions.extend(self.date_positions[start:])
+        self.date_keys = keys
+        self.date_positions = positions
+        self.late_keys = array('i')
+        self.late_positions = array('q')
+
+    def _make_writable(self):
+        """Copy columns attached from a snapshot into private arrays."""
+        self.position_days = writable(self.position_days)
+        self.date_keys = writable(self.date_keys)
+        self.date_positions = writable(self.date_positions)
+        self.late_keys = writable(self.late_keys)
+        self.late_positions = writable(self.late_positions)
+        for postings in (self.source_postings, self.tag_postings):
+            for key, positions in postings.items():
+                postings[key] = writable(positions)
+
+    def _add_postings(self, position: int, article: Article):
+        """Append a position to the source and tag posting lists."""
+        _posting_list(self.source_postings, article.source.lower()).append(position)
+        for tag in article.tags or []:
+            postings = _posting_list(self.tag_postings, tag)
+            # Guard against duplicate tags on the same article
+            if not postings or postings[-1] != position:
+                postings.append(position)
+
+    def lookup(
+        self,
+        source: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> Optional[List[int]]:
+        """
+        Find the positions of articles matching all of the given filters.
+
+        Args:
+            source: Source name (case-insensitive)
+            tags: Tags to match (an article needs at least one of them)
+            date_from: Start date in YYYY-MM-DD format
+            date_to: End date in YYYY-MM-DD format
+
+        Returns:
+            Sorted list of matching positions, or None when no filter applies
+        """
+        candidates: List[Sequence[int]] = []
+
+        if source:
+            candidates.append(self.source_postings.get(source.lower(), []))
+
+        if tags:
+            candidates.append(self._union_tags(tags))
+
+        from_day = parse_bound(date_from, "date_from") if date_from else None
+        to_day = parse_bound(date_to, "date_to") if date_to else None
+        has_date_filter = from_day is not None or to_day is not None
+
+        if has_date_filter:
+            lo, hi = _date_slice(self.date_keys, from_day, to_day)
+            late_lo, late_hi = _date_slice(self.late_keys, from_day, to_day)
+            # Materialize the date range only when it is the most selective filter
+            if not candidates or hi - lo + late_hi - late_lo <= min(len(c) for c in candidates):
+                candidates.append(sorted(chain(
+                    self.date_positions[lo:hi], self.late_positions[late_lo:late_hi]
+                )))
+                has_date_filter = False
+
+        if not candidates:
+            return None
+
+        candidates.sort(key=len)
+        result = candidates[0]
+        for other in candidates[1:]:
+            result = [p for p in result if _contains(other, p)]
+
+        if has_date_filter:
+            days = self.position_days
+            lo_day = from_day if from_day is not None else 0
+            hi_day = to_day if to_day is not None else MAX_DAY
+            result = [p for p in result if lo_day <= days[p] <= hi_day]
+
+        return list(result)
+
+    def _union_tags(self, tags: List[str]) -> Sequence[int]:
+        """Merge the posting lists of several tags into one sorted list."""
+        postings = [self.tag_postings[tag] for tag in set(tags) if tag in self.tag_postings]
+        if not postings:
+            return []
+        if len(postings) == 1:
+            return postings[0]
+        return sorted(set().union(*postings))
+
+
+def parse_day(value: str) -> int:
+    """
+    Parse a YYYY-MM-DD string into a day ordinal.
+
+    Accepts the same strings as datetime.strptime(value, "%Y-%m-%d"),
+    with a fast path for zero-padded dates.
+
+    Returns:
+        The date's proleptic Gregorian ordinal, or MISSING_DAY if malformed
+    """
+    try:
+        if len(value) == 10 and value[4] == "-" and value[7] == "-" and value[:4].isdigit() \
+                and value[5:7].isdigit() and value[8:].isdigit():
+            return date(int(value[:4]), int(value[5:7]), int(value[8:])).toordinal()
+        return datetime.strptime(value, "%Y-%m-%d").toordinal()
+    except (TypeError, ValueError):
+        return MISSING_DAY
+
+
+def parse_bound(value: str, name: str) -> Optional[int]:
+    """Parse a date filter bound, ignoring it if it is malformed."""
+    day = parse_day(value)
+    if day == MISSING_DAY:
+        print(f"Invalid {name} format: {value}")
+        return None
+    return day
+
+
+def _posting_list(postings: Dict[str, Sequence[int]], key: str) -> array:
+    """Get an appendable posting list, copying it if it is attached from a snapshot."""
+    positions = postings.get(key)
+    if positions is None:
+        positions = postings[key] = array('q')
+    elif isinstance(positions, memoryview):
+        positions = postings[key] = writable(positions)
+    return positions
+
+
+def _date_slice(keys: Sequence[int], from_day: Optional[int], to_day: Optional[int]) -> Tuple[int, int]:
+    """Return the [lo, hi) slice of a sorted day array inside the range."""
+    lo = bisect_left(keys, from_day) if from_day is not None else 0
+    hi = bisect_right(keys, to_day) if to_day is not None else len(keys)
+    return lo, max(lo, hi)
+
+
+def _contains(postings: Sequence[int], position: int) -> bool:
+    """Check whether a sorted posting list contains a position."""
+    i = bisect_left(postings, position)
+    return i < len(postings) and postings[i] == position
@@ -0,0 +1,253 @@
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from .corpus import Analysis, analyze
+from .metrics import STAGE_TAGGING
+from .tagging import ArticleTagger
+
+
+# Characters read from the data file per refill
+READ_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_records(path: str, read_size: int = READ_SIZE) -> Iterator[Any]:
+    """
+    Stream records from a JSON array file or a newline-delimited JSON file.
+
+    Only the current element and a small read buffer are held in memory.
+    The format is detected from the first non-whitespace character: a '['
+    means a top-level JSON array, anything else is read as JSONL (one
+    article object per line).
+
+    Args:
+        path: Path to the data file
+        read_size: Number of characters read per refill
+
+    Returns:
+        Iterator over the decoded records
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON/JSONL
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _ArrayReader(f, read_size)
+        first = reader.peek()
+        if first == '[':
+            yield from reader.iter_array()
+        elif first:
+            yield from _iter_json_lines(reader.buffer[reader.pos:], f)
+
+
+def _iter_json_lines(head: str, f: TextIO) -> Iterator[Any]:
+    """Decode one JSON value per non-blank line, starting with buffered text."""
+    # Complete the last, possibly partial, line of the buffered text
+    head += f.readline()
+    # Split like the file iterator does: str.splitlines() would also split
+    # on characters such as U+2028 that JSON strings may contain raw
+    for line in chain(head.split("\n"), f):
+        if line.strip():
+            yield json.loads(line)
+
+
+class _ArrayReader:
+    """Incrementally decode the elements of a top-level JSON array."""
+
+    def __init__(self, f: TextIO, read_size: int):
+        self.f = f
+        self.read_size = read_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        """Read more text into the buffer; returns False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop the consumed prefix so the buffer stays bounded
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _skip_whitespace(self) -> int:
+        """Advance past whitespace, refilling as needed; returns the new position."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill(self.read_size):
+                return self.pos
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or '' at end of file."""
+        pos = self._skip_whitespace()
+        return self.buffer[pos] if pos < len(self.buffer) else ""
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield each element of the array the reader is positioned on."""
+        self.pos += 1  # consume '['
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            if not self.peek():
+                raise self._error("Unterminated array")
+            value, end = self._decode_value()
+            self.pos = end
+            yield value
+
+            delimiter = self.peek()
+            if not delimiter:
+                raise self._error("Unterminated array")
+            self.pos += 1
+            if delimiter == ']':
+                return
+            if delimiter != ',':
+                self.pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def _decode_value(self) -> Tuple[Any, int]:
+        """Decode the value at the current position, reading more as needed."""
+        size = self.read_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(size):
+                    raise
+            else:
+                # A number cut off by the buffer edge can decode early, so only
+                # accept a value once the following delimiter is buffered
+                tail = end
+                while tail < len(self.buffer) and self.buffer[tail] in _WHITESPACE:
+                    tail += 1
+                if tail < len(self.buffer) and self.buffer[tail] in ",]":
+                    return value, end
+                if not self._fill(size):
+                    return value, end
+                continue
+            # Grow the read size so a large element is not re-decoded too often
+            size = max(size, len(self.buffer) - self.pos)
+
+
+# Tagger used inside pool worker processes, set by _init_worker
+_worker_tagger: Optional[ArticleTagger] = None
+
+
+def _init_worker(tagger: ArticleTagger):
+    """Install the tagger once per worker process."""
+    global _worker_tagger
+    _worker_tagger = tagger
+
+
+def _tag_chunk(pairs: List[Tuple[str, str]]) -> Tuple[List[List[str]], List[Analysis], float]:
+    """
+    Tag and analyze one chunk of (title, body) pairs inside a worker process.
+
+    Args:
+        pairs: Titles and bodies of the chunk
+
+    Returns:
+        The tags, the word counts and signatures, and the seconds spent
+        tagging, recorded by the parent
+    """
+    start = time.perf_counter()
+    tags = _worker_tagger.tag_many(pairs)
+    seconds = time.perf_counter() - start
+    analyses = [analyze(title, body) for title, body in pairs]
+    return tags, analyses, seconds
+
+
+def _chunks(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Split an iterable of records into lists of at most size items."""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def tag_and_analyze(
+    tagger: ArticleTagger,
+    records: Iterable[Dict],
+    workers: int = 1,
+    chunk_size: int = 1000
+) -> Iterator[Tuple[Dict, List[str], Analysis]]:
+    """
+    Tag raw article records and analyze their text for the corpus indexes.
+
+    Chunks are optionally fanned out to a process pool, with only a bounded
+    number in flight at once, so the records iterable can be a stream. Each
+    record comes with the word counts and signature of corpus.analyze(),
+    computed in the worker that tagged it, so a parallel load does not
+    tokenize every article again on the calling thread.
+
+    Args:
+        tagger: Tagger whose keyword table is used
+        records: Raw article dicts with 'title' and 'body' keys
+        workers: Number of worker processes (1 tags on the calling thread)
+        chunk_size: Number of articles sent to a worker at a time
+
+    Returns:
+        Iterator of (record, tags, analysis) triples in input order
+    """
+    for chunk, tags, analyses in _process_chunks(tagger, records, workers, chunk_size):
+        yield from zip(chunk, tags, analyses)
+
+
+def _process_chunks(
+    tagger: ArticleTagger,
+    records: Iterable[Dict],
+    workers: int,
+    chunk_size: int
+) -> Iterator[Tuple[List[Dict], List[List[str]], List[Analysis]]]:
+    """Tag and analyze records chunk by chunk, yielding chunks in input order."""
+    chunk_size = max(1, chunk_size)
+
+    if workers <= 1:
+        for chunk in _chunks(records, chunk_size):
+            pairs = [(r['title'], r['body']) for r in chunk]
+            with STAGE_TAGGING.time():
+                tags = tagger.tag_many(pairs)
+            yield chunk, tags, [analyze(title, body) for title, body in pairs]
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(tagger,)
+    ) as executor:
+        pending = deque()
+        for chunk in _chunks(records, chunk_size):
+            pairs = [(r['title'], r['body']) for r in chunk]
+            pending.append((chunk, executor.submit(_tag_chunk, pairs)))
+            # Keep a couple of chunks queued per worker, then drain in order
+            if len(pending) >= workers * 2:
+                done, future = pending.popleft()
+                yield (done,) + _chunk_result(future.result())
+
+        while pending:
+            done, future = pending.popleft()
+            yield (done,) + _chunk_result(future.result())
+
+
+def _chunk_result(
+    result: Tuple[List[List[str]], List[Analysis], float]
+) -> Tuple[List[List[str]], List[Analysis]]:
+    """Record the tagging time of a chunk tagged by a worker and return its tags and analyses."""
+    tags, analyses, seconds = result
+    STAGE_TAGGING.observe(seconds)
+    return tags, analyses
@@ -0,0 +1,93 @@
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+from .serialization import dumps
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+
+class Journal:
+    """
+    Append-only JSONL file of the article batches added after loading.
+
+    The data file is only ever replaced as a whole, so added batches are
+    written here and replayed on top of it whenever the corpus is loaded.
+    Readers remember the offset they have read up to, so a process can pick
+    up the batches other workers sharing the file have written since.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """
+        Hold an exclusive lock on the journal against other processes.
+
+        Locking is skipped on platforms without fcntl.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def read(self, offset: int = 0) -> Tuple[List[Dict], int]:
+        """
+        Read the records written after an offset.
+
+        A last line without its newline is a batch still being written, or
+        one cut short by a crash, and is left for a later read.
+
+        Args:
+            offset: Byte offset to read from, as returned by a previous read
+
+        Returns:
+            The records, and the offset just after the last complete line
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+        end = data.rfind(b"\n") + 1
+        records = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                print(f"Warning: skipping a malformed line in {self.path}")
+        return records, offset + end
+
+    def append(self, records: List[Dict]) -> int:
+        """
+        Write a batch of records and flush it to disk.
+
+        Call with the lock held when several processes share the journal.
+
+        Returns:
+            The size of the journal after the batch
+        """
+        lines = b"".join(dumps(record) + b"\n" for record in records)
+        with open(self.path, 'a+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size:
+                f.seek(size - 1)
+                # Start on a new line after a batch cut short by a crash
+                if f.read(1) != b"\n":
+                    lines = b"\n" + lines
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
@@ -1,14 +1,50 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 import os
-from .api import router
+import threading
+from . import admin
+from .api import data_service, query_executor, router
+from .compression import CompressionMiddleware
+from .metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware
+from .reloader import FileReloader
+from .settings import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load the corpus in the background, watch the data file for changes
+    while the app is running, if enabled, and stop the query pool on
+    shutdown.
+    
+    The server binds and answers /health at once; data routes answer 503
+    until /ready reports the corpus loaded. The loader is a daemon thread,
+    so shutting down mid-load does not wait for it.
+    """
+    if not data_service.ready:
+        loader = threading.Thread(target=data_service.load, name="corpus-loader", daemon=True)
+        loader.start()
+    reloader = None
+    if settings.reload_interval > 0:
+        reloader = FileReloader(data_service, interval=settings.reload_interval)
+        reloader.start()
+    try:
+        yield
+    finally:
+        if reloader is not None:
+            reloader.stop()
+        query_executor.shutdown()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Tiny Media Analysis API",
     description="A REST API for analyzing news articles with tagging and filtering capabilities",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -20,9 +56,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses the API has not already compressed, such as exports
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compress_min_bytes,
+    level=settings.compress_level
+)
+
+# Record request counts and latency per route, for /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Include API routes
 app.include_router(router, prefix="/api/v1")
 
+# Admin routes answer 404 unless MEDIA_API_ADMIN_TOKEN is set
+app.include_router(admin.router, prefix="/admin", include_in_schema=False)
+
 # Serve static files for the dashboard
 if os.path.exists("static"):
     app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -36,15 +85,37 @@ async def root():
         "endpoints": {
             "articles": "/api/v1/articles",
             "stats": "/api/v1/stats",
+            "ready": "/ready",
             "docs": "/docs"
         }
     }
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Liveness check; answers as soon as the server is up."""
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness check; 200 once the corpus is loaded, 503 while loading.
+    
+    Reports the articles loaded so far and the seconds spent loading.
+    """
+    status = data_service.load_status()
+    return JSONResponse(status, status_code=200 if status["status"] == "ready" else 503)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Request, stage, result size and cache metrics in Prometheus text format.
+    
+    Stages are load, tagging, index_lookup, filtering, search and
+    serialization.
+    """
+    # Set as a header, since media_type would get a second charset appended
+    return Response(REGISTRY.render(), headers={"Content-Type": CONTENT_TYPE})
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -0,0 +1,292 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from cache hits to full corpus loads
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Result set size buckets, in articles
+SIZE_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+
+Labels = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Registry:
+    """Metrics exposed together on /metrics."""
+
+    def __init__(self):
+        self.metrics: List["Metric"] = []
+        # Observations are skipped while disabled, e.g. to measure overhead
+        self.enabled = True
+
+    def register(self, metric: "Metric"):
+        self.metrics.append(metric)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, names, labels, value in metric.samples():
+                if names:
+                    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, labels))
+                    lines.append(f"{metric.name}{suffix}{{{pairs}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{metric.name}{suffix} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class Metric:
+    """
+    Base class of a metric with optional labels.
+
+    Label values are passed positionally, in the order of `labelnames`, to
+    keep the cost of an observation to a tuple and a dictionary lookup.
+    """
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], object]] = None,
+        registry: Optional[Registry] = None
+    ):
+        """
+        Args:
+            name: Metric name
+            help: One-line description
+            labelnames: Names of the labels, in the order values are passed
+            function: Read the value at scrape time instead of recording it;
+                returns a number, or a dict of label value tuples to numbers
+            registry: Registry to add the metric to (the default registry
+                if omitted)
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.function = function
+        self.registry = registry or REGISTRY
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+        self.registry.register(self)
+
+    def samples(self) -> Iterator[Tuple[str, Labels, Labels, float]]:
+        """Yield (suffix, label names, label values, value) for every series."""
+        if self.function is not None:
+            values = self.function()
+            if not isinstance(values, dict):
+                values = {(): values}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield "", self.labelnames, labels, value
+
+
+class Counter(Metric):
+    """A value that only goes up, such as a request count."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1):
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    """A value that can go up and down, such as the cache size, read at scrape time."""
+
+    kind = "gauge"
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in cumulative buckets.
+
+    Each series keeps a count per bucket, plus the sum and count of all
+    observations; buckets are only made cumulative when rendered. On hot
+    paths, bind a series once with labels() and observe on it directly.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        registry: Optional[Registry] = None
+    ):
+        super().__init__(name, help, labelnames, registry=registry)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Labels, "HistogramSeries"] = {}
+
+    def labels(self, *labels: str) -> "HistogramSeries":
+        """Get the series for a set of label values, creating it if needed."""
+        series = self._series.get(labels)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(labels, HistogramSeries(self))
+        return series
+
+    def observe(self, value: float, *labels: str):
+        self.labels(*labels).observe(value)
+
+    def time(self, *labels: str) -> "Timer":
+        """Time a block: `with histogram.time("label"): ...`"""
+        return Timer(self.labels(*labels))
+
+    def count(self, *labels: str) -> int:
+        """Get the number of observations of one series."""
+        series = self._series.get(labels)
+        return series.counts[-1] if series else 0
+
+    def samples(self) -> Iterator[Tuple[str, Labels, Labels, float]]:
+        with self._lock:
+            snapshot = {labels: list(series.counts) for labels, series in self._series.items()}
+        names = self.labelnames + ("le",)
+        for labels, counts in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield "_bucket", names, labels + (_format_value(bound),), cumulative
+            yield "_sum", self.labelnames, labels, counts[-2]
+            yield "_count", self.labelnames, labels, counts[-1]
+
+
+class HistogramSeries:
+    """One labelled series of a histogram."""
+
+    __slots__ = ("histogram", "counts")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        # A count per bucket and one for +Inf, then the sum and the count
+        self.counts: List[float] = [0] * (len(histogram.buckets) + 3)
+
+    def observe(self, value: float):
+        histogram = self.histogram
+        if not histogram.registry.enabled:
+            return
+        index = bisect_left(histogram.buckets, value)
+        counts = self.counts
+        with histogram._lock:
+            counts[index] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def time(self) -> "Timer":
+        """Time a block: `with series.time(): ...`"""
+        return Timer(self)
+
+
+class Timer:
+    """Context manager that observes the seconds spent in its block."""
+
+    __slots__ = ("series", "start")
+
+    def __init__(self, series: HistogramSeries):
+        self.series = series
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.series.observe(time.perf_counter() - self.start)
+
+
+REQUEST_SECONDS = Histogram(
+    "media_api_request_duration_seconds",
+    "HTTP request latency by route, method and status code",
+    ["route", "method", "status"]
+)
+
+STAGE_SECONDS = Histogram(
+    "media_api_stage_duration_seconds",
+    "Time spent per processing stage",
+    ["stage"]
+)
+
+# Stage series, bound once so timing a stage skips the label lookup
+STAGE_LOAD = STAGE_SECONDS.labels("load")
+STAGE_TAGGING = STAGE_SECONDS.labels("tagging")
+STAGE_INDEX_LOOKUP = STAGE_SECONDS.labels("index_lookup")
+STAGE_FILTERING = STAGE_SECONDS.labels("filtering")
+STAGE_SEARCH = STAGE_SECONDS.labels("search")
+STAGE_SERIALIZATION = STAGE_SECONDS.labels("serialization")
+
+RESULT_SIZE = Histogram(
+    "media_api_result_size",
+    "Number of matching articles per query, by route",
+    ["route"],
+    buckets=SIZE_BUCKETS
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency of HTTP requests.
+
+    Request counts are the `_count` of the latency histogram, which is
+    labelled with the status code, so one observation covers both.
+    Requests are labelled with the route template, e.g.
+    `/api/v1/articles`, rather than the raw path, so the number of series
+    stays bounded; requests that match no route are labelled `unmatched`.
+    Requests are timed until the whole response has been sent, so
+    streamed exports count the full stream.
+    """
+
+    def __init__(self, app, registry: Optional[Registry] = None):
+        self.app = app
+        self.registry = registry or REGISTRY
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            REQUEST_SECONDS.observe(time.perf_counter() - start, path, method, str(status))
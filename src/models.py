@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, conint
 from typing import List, Optional
 from datetime import date
 
@@ -14,6 +14,17 @@ class Article(BaseModel):
     tags: Optional[List[str]] = []
 
 
+class ArticleCreate(BaseModel):
+    """Request model for an article submitted for ingestion (tags are assigned by the API)."""
+    # Ids are stored in a signed 64-bit column
+    id: conint(ge=-2**63, lt=2**63)
+    title: str
+    body: str
+    source: str
+    date: str
+    url: Optional[str] = ""
+
+
 class ArticleResponse(BaseModel):
     """Response model for articles with tags."""
     id: int
@@ -25,8 +36,57 @@ class ArticleResponse(BaseModel):
     tags: List[str]
 
 
+class SearchResult(ArticleResponse):
+    """Response model for a search result with its relevance score."""
+    score: float
+
+
+class BatchResponse(BaseModel):
+    """Response model for a batch of ingested articles."""
+    added: int
+    total_articles: int
+
+
+class CacheStatsResponse(BaseModel):
+    """Response model for response cache metrics."""
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    invalidations: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class FacetsResponse(BaseModel):
+    """Response model for facet counts of a filtered set of articles."""
+    total: int
+    tags: dict[str, int]
+    sources: dict[str, int]
+    dates: dict[str, int]
+    interval: str
+
+
+class TrendSeries(BaseModel):
+    """Article counts over time for one source and/or tag."""
+    source: Optional[str] = None
+    tag: Optional[str] = None
+    counts: dict[str, int]
+
+
+class TrendsResponse(BaseModel):
+    """Response model for trend series."""
+    interval: str
+    series: List[TrendSeries]
+
+
 class StatsResponse(BaseModel):
     """Response model for statistics."""
     tags: dict[str, int]
     sources: dict[str, int]
-    total_articles: int 
\ No newline at end of file
+    total_articles: int
+    # Articles that are near-duplicates of an earlier one
+    duplicates: int = 0
+    daily: Optional[dict[str, int]] = None
+    source_tags: Optional[dict[str, dict[str, int]]] = None 
\ No newline at end of file
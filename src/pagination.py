@@ -0,0 +1,44 @@
+import base64
+from typing import List, NamedTuple, Optional, Sequence
+from .corpus import Corpus
+
+
+class ArticlePage(NamedTuple):
+    """One page of filtered articles, as positions in the corpus they came from."""
+    positions: Sequence[int]
+    total: int
+    next_cursor: Optional[str]
+    corpus: Optional[Corpus] = None
+    # When near-duplicates were collapsed, the positions of the other
+    # articles in the group of each article on the page
+    duplicates: Optional[List[List[int]]] = None
+
+
+class SearchPage(NamedTuple):
+    """One page of ranked search results, as positions in the corpus they came from."""
+    positions: Sequence[int]
+    scores: Sequence[float]
+    total: int
+    corpus: Optional[Corpus] = None
+
+
+def encode_cursor(position: int) -> str:
+    """Encode the position of the last returned article as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"p:{position}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        prefix, position = raw.split(":", 1)
+        if prefix != "p":
+            raise ValueError(prefix)
+        return int(position)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
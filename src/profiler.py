@@ -0,0 +1,246 @@
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Innermost frames of threads that are idle: the event loop waiting in
+# select(), pool workers waiting for work and threads waiting on events
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("thread.py", "_worker"),
+    ("queue.py", "get"),
+}
+
+
+def _code_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class ProfileSession:
+    """
+    One profiling run, limited to a number of calls or a time window.
+
+    In `sample` mode a background thread records the Python stack of every
+    other thread at a fixed interval, so the cost is the same however much
+    work the process does. In `cprofile` mode queries run through
+    Profiler.wrap() are profiled with cProfile, one at a time.
+    """
+
+    def __init__(
+        self,
+        mode: str = "sample",
+        calls: Optional[int] = None,
+        seconds: Optional[float] = None,
+        interval: float = 0.01,
+        idle: bool = False
+    ):
+        """
+        Args:
+            mode: `sample` or `cprofile`
+            calls: Stop after this many wrapped calls complete (None for no limit)
+            seconds: Stop after this many seconds (None for no limit)
+            interval: Seconds between stack samples in sample mode
+            idle: Also record threads that are waiting for work
+        """
+        if mode not in ("sample", "cprofile"):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.mode = mode
+        self.calls = calls
+        self.interval = interval
+        self.idle = idle
+        self.started = time.monotonic()
+        self.deadline = self.started + seconds if seconds is not None else None
+        self.completed = 0
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._idle_codes: Dict[object, bool] = {}
+        self._names: Dict[int, str] = {}
+        self.profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._profile_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        if mode == "sample":
+            self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+            self._sampler.start()
+
+    def accepting(self) -> bool:
+        """Check whether calls are still being counted and profiled."""
+        if self._stop.is_set():
+            return False
+        return self.calls is None or self.completed < self.calls
+
+    def done(self) -> bool:
+        """Check whether the call limit or the time window has been reached."""
+        if self._stop.is_set():
+            return True
+        if self.calls is not None and self.completed >= self.calls:
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def stop(self):
+        """Stop sampling and profiling; results stay available."""
+        self._stop.set()
+        if self._sampler is not None and self._sampler is not threading.current_thread():
+            self._sampler.join()
+
+    def begin_profile(self) -> Optional[cProfile.Profile]:
+        """
+        Start profiling a call on the current thread.
+
+        Only one profiler can be active per process on Python 3.12 and
+        later, so a call that overlaps one already being profiled, or
+        another profiling tool, is not profiled.
+
+        Returns:
+            The running profile, or None if the call is not profiled
+        """
+        if not self._profile_lock.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except Exception as e:
+            self._profile_lock.release()
+            print(f"Warning: could not start profiling a call: {e}")
+            return None
+        return profile
+
+    def end_profile(self, profile: cProfile.Profile) -> Optional[cProfile.Profile]:
+        """Stop a profile started by begin_profile(); None if it failed to stop."""
+        try:
+            profile.disable()
+        except Exception as e:
+            print(f"Warning: could not stop profiling a call: {e}")
+            return None
+        finally:
+            self._profile_lock.release()
+        return profile
+
+    def record_call(self, profile: Optional[cProfile.Profile] = None):
+        with self._lock:
+            self.completed += 1
+            if profile is not None:
+                self.profiles.append(profile)
+
+    def collapsed(self) -> str:
+        """Sampled stacks in the collapsed format read by flamegraph tools."""
+        stacks: Counter = Counter()
+        for (thread_id, codes), count in list(self._stacks.items()):
+            labels = [self._names.get(thread_id, str(thread_id))]
+            labels.extend(_code_label(code) for code in reversed(codes))
+            stacks[";".join(labels)] += count
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    def stats_text(self, sort: str = "cumulative", limit: int = 50) -> str:
+        """The merged cProfile statistics as a pstats report."""
+        if not self.profiles:
+            return "No calls were profiled.\n"
+        stream = io.StringIO()
+        stats = pstats.Stats(*self.profiles, stream=stream)
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def stats_dump(self) -> bytes:
+        """The merged cProfile statistics in the binary pstats format."""
+        if not self.profiles:
+            raise ValueError("No calls were profiled")
+        # The format written by Stats.dump_stats(), for snakeviz or pstats
+        return marshal.dumps(pstats.Stats(*self.profiles).stats)
+
+    def _sample(self):
+        own = threading.get_ident()
+        stacks = self._stacks
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                if not self.idle and self._is_idle(frame.f_code):
+                    continue
+                # Code objects only; labels are formatted when reporting
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stacks[thread_id, tuple(stack)] += 1
+                if thread_id not in self._names:
+                    # Named now, since the thread may have exited by the report
+                    self._names.update((thread.ident, thread.name) for thread in threading.enumerate())
+            self.samples += 1
+            if self.done():
+                return
+
+    def _is_idle(self, code) -> bool:
+        idle = self._idle_codes.get(code)
+        if idle is None:
+            idle = self._idle_codes[code] = (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+        return idle
+
+
+class Profiler:
+    """
+    Opt-in profiler for live workers, one session at a time.
+
+    Nothing is recorded until a session is started; until then wrap()
+    returns the function unchanged, so the only cost on the query path is
+    one attribute check.
+    """
+
+    def __init__(self):
+        self.session: Optional[ProfileSession] = None
+        self._lock = threading.Lock()
+
+    def start(self, **kwargs) -> ProfileSession:
+        """
+        Start a session; keyword arguments are those of ProfileSession.
+
+        Raises:
+            RuntimeError: If a session is already running
+            ValueError: If the mode is unknown
+        """
+        with self._lock:
+            if self.session is not None:
+                raise RuntimeError("A profiling session is already running")
+            self.session = ProfileSession(**kwargs)
+            return self.session
+
+    def stop(self) -> Optional[ProfileSession]:
+        """Stop the current session and return it."""
+        with self._lock:
+            session, self.session = self.session, None
+        if session is not None:
+            session.stop()
+        return session
+
+    def wrap(self, func: Callable[..., T]) -> Callable[..., T]:
+        """Wrap a query so the current session counts it, and profiles it in cprofile mode."""
+        session = self.session
+        if session is None:
+            return func
+
+        def profiled(*args, **kwargs):
+            if not session.accepting():
+                return func(*args, **kwargs)
+            profile = None
+            if session.mode == "cprofile":
+                profile = session.begin_profile()
+                # Calls that could not be profiled are not counted either
+                if profile is None:
+                    return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if profile is not None:
+                    profile = session.end_profile(profile)
+                session.record_call(profile)
+
+        return profiled
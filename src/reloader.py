@@ -0,0 +1,75 @@
+import os
+import threading
+from typing import Optional, Tuple
+from .data_service import DataService
+
+
+# Identifies one version of the data file: modification time, size and inode
+FileSignature = Tuple[int, int, int]
+
+
+def file_signature(path: str) -> Optional[FileSignature]:
+    """Get the signature of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class FileReloader:
+    """
+    Background thread that reloads a DataService when its data file changes.
+
+    The data file is polled for changes to its mtime, size or inode, so both
+    in-place writes and files renamed into place are picked up. The new
+    corpus is built on this thread and swapped in by DataService.reload(),
+    so requests keep being served from the old corpus in the meantime.
+    Between reloads, each poll also picks up the batches other workers
+    have written to the journal.
+    """
+
+    def __init__(self, service: DataService, interval: float = 5.0):
+        self.service = service
+        self.interval = interval
+        self._signature = file_signature(service.data_file)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start polling in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="data-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling and wait for a reload in progress to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> bool:
+        """
+        Reload the service if the data file changed since the last check.
+
+        Returns:
+            True if a new corpus was swapped in
+        """
+        signature = file_signature(self.service.data_file)
+        if signature is None or signature == self._signature:
+            self.service.sync_journal()
+            return False
+        # Remember the signature even if the reload fails, so a broken file
+        # is not reparsed on every poll; the next write will change it again
+        self._signature = signature
+        return self.service.reload()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Error reloading data: {e}")
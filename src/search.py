@@ -0,0 +1,394 @@
+import heapq
+import math
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from .store import writable
+
+
+# Words are runs of letters, digits and underscores, matched case-insensitively
+TOKEN_RE = re.compile(r"\w+")
+
+# Quoted phrases or bare words in a query
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+# Postings are packed in blocks of this many documents
+BLOCK_SIZE = 128
+
+# Block header: first position, document count minus one, and the byte
+# width codes of the position deltas (low nibble) and term frequencies
+BLOCK_HEADER = struct.Struct("<IBB")
+
+# Array typecodes by width code: 1, 2 and 4 bytes per value
+WIDTH_TYPECODES = ("B", "H", "I")
+
+# Term frequencies are capped to fit the widest tf column
+MAX_TF = 0xFFFF
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# A query clause is one term, or several terms that must appear as a phrase
+Clause = Tuple[str, ...]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-cased words."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def parse_query(query: str) -> List[List[Clause]]:
+    """
+    Parse a search query into OR-ed groups of AND-ed clauses.
+
+    Words are AND-ed by default; `OR` between words separates groups, and
+    `AND` is accepted but not needed. Quoted text must appear as a phrase,
+    as must a single word that splits into several, like `covid-19`.
+
+    Raises:
+        ValueError: If the query has no words
+    """
+    groups: List[List[Clause]] = [[]]
+    for phrase, word in QUERY_RE.findall(query):
+        if word == "OR":
+            groups.append([])
+        elif word != "AND":
+            tokens = tuple(tokenize(phrase or word))
+            if tokens:
+                groups[-1].append(tokens)
+    groups = [group for group in groups if group]
+    if not groups:
+        raise ValueError("Empty search query")
+    return groups
+
+
+def _width_code(value: int) -> int:
+    return 0 if value < 0x100 else 1 if value < 0x10000 else 2
+
+
+class _Postings:
+    """Positions and term frequencies of one term, packed in blocks."""
+
+    __slots__ = ("blocks", "docs", "tfs", "count")
+
+    def __init__(self):
+        # Sealed blocks, each a header followed by the packed deltas and tfs
+        self.blocks = bytearray()
+        # Postings of the block being filled
+        self.docs = array('I')
+        self.tfs = array('H')
+        # Document frequency
+        self.count = 0
+
+    def sealed_size(self) -> int:
+        """Bytes of sealed blocks."""
+        return len(self.blocks)
+
+    def frozen(self) -> "_FrozenPostings":
+        """Copy of the postings that later additions do not change."""
+        return _FrozenPostings(self)
+
+
+class _FrozenPostings(_Postings):
+    """
+    Postings as they were when a search started.
+
+    Sealed blocks are only ever appended to, so they are shared with the
+    live postings and read up to their size at the time; only the block
+    being filled is copied.
+    """
+
+    __slots__ = ("size",)
+
+    def __init__(self, postings: _Postings):
+        self.blocks = postings.blocks
+        self.size = len(postings.blocks)
+        self.docs = array('I', postings.docs)
+        self.tfs = array('H', postings.tfs)
+        self.count = postings.count
+
+    def sealed_size(self) -> int:
+        return self.size
+
+
+class SearchIndex:
+    """
+    Inverted index of the words in article titles and bodies.
+
+    Each term's postings are delta-encoded in blocks of BLOCK_SIZE, using
+    the narrowest of 1, 2 or 4 bytes that fits each block's deltas and term
+    frequencies, so common terms take about two bytes per posting. Blocks
+    are unpacked with array and accumulate rather than per-value Python
+    code, and a block header carries its first position so intersections
+    only unpack the blocks that can contain a candidate.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, _Postings] = {}
+        # Number of words in each article, by position
+        self.doc_lengths = array('I')
+        self.total_length = 0
+
+    @property
+    def doc_count(self) -> int:
+        """Number of indexed articles."""
+        return len(self.doc_lengths)
+
+    def add(self, position: int, counts: Dict[str, int]):
+        """
+        Index the words of an article.
+
+        Positions must be added in increasing order, one per article.
+
+        Args:
+            position: Position of the article
+            counts: Word counts from corpus.analyze()
+        """
+        if isinstance(self.doc_lengths, memoryview):
+            self.doc_lengths = writable(self.doc_lengths)
+        length = sum(counts.values())
+        self.doc_lengths.append(length)
+        self.total_length += length
+
+        for term, tf in counts.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = _Postings()
+            postings.docs.append(position)
+            postings.tfs.append(min(tf, MAX_TF))
+            postings.count += 1
+            if len(postings.docs) == BLOCK_SIZE:
+                self._seal(postings)
+
+    def _seal(self, postings: _Postings):
+        """Pack the block being filled onto the sealed blocks."""
+        docs, tfs = postings.docs, postings.tfs
+        deltas = [b - a for a, b in zip(docs, docs[1:])]
+        doc_code = _width_code(max(deltas, default=0))
+        tf_code = _width_code(max(tfs))
+
+        block = bytearray(BLOCK_HEADER.pack(docs[0], len(docs) - 1, doc_code | tf_code << 4))
+        block += array(WIDTH_TYPECODES[doc_code], deltas).tobytes()
+        block += array(WIDTH_TYPECODES[tf_code], tfs).tobytes()
+
+        if isinstance(postings.blocks, memoryview):
+            postings.blocks = writable(postings.blocks)
+        postings.blocks += block
+        postings.docs = array('I')
+        postings.tfs = array('H')
+
+    def view(self, query: str) -> "SearchIndex":
+        """
+        Take what a query reads from the index, to search it while articles are added.
+
+        Call with additions excluded; searching the view needs no lock.
+        Only the postings of the query's terms are taken, and of those only
+        the block being filled is copied.
+
+        Raises:
+            ValueError: If the query has no words
+        """
+        terms = {term for group in parse_query(query) for clause in group for term in clause}
+        return _SearchView(self, terms)
+
+    def doc_freq(self, term: str) -> int:
+        """Get the number of articles containing a term."""
+        postings = self.postings.get(term)
+        return postings.count if postings else 0
+
+    def search(
+        self,
+        query: str,
+        candidates: Optional[Sequence[int]] = None,
+        texts: Optional[Callable[[int], Iterable[str]]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        Find and rank the articles matching a query.
+
+        Args:
+            query: Query string, see parse_query()
+            candidates: Sorted positions to search within (None for all)
+            texts: Returns the title and body of a position, used to check
+                phrases; phrases are matched as AND-ed words without it
+            limit: Maximum number of results to return (None for all)
+            offset: Number of ranked results to skip
+
+        Returns:
+            (position, BM25 score) pairs by descending score, ties in load
+            order, and the total number of matches
+
+        Raises:
+            ValueError: If the query has no words
+        """
+        groups = parse_query(query)
+        matched = [self._match_group(group, candidates, texts) for group in groups]
+        matches = matched[0] if len(matched) == 1 else sorted(set().union(*matched))
+        if not matches:
+            return [], 0
+
+        terms = {term for group in groups for clause in group for term in clause}
+        scores = self._score(terms, matches)
+        count = len(scores) if limit is None else min(len(scores), offset + limit)
+        ranked = heapq.nlargest(count, scores.items(), key=lambda item: (item[1], -item[0]))
+        return ranked[offset:], len(matches)
+
+    def _match_group(
+        self,
+        clauses: List[Clause],
+        candidates: Optional[Sequence[int]],
+        texts: Optional[Callable[[int], Iterable[str]]]
+    ) -> List[int]:
+        """Find the positions containing every clause of a group."""
+        terms = {term for clause in clauses for term in clause}
+        if any(term not in self.postings for term in terms):
+            return []
+
+        # Intersect from the rarest term, so each step unpacks fewer blocks
+        docs = candidates
+        for term in sorted(terms, key=self.doc_freq):
+            docs, _ = self._decode(self.postings[term], docs)
+            if not docs:
+                return []
+
+        phrases = [_phrase_pattern(clause) for clause in clauses if len(clause) > 1]
+        if phrases and texts is not None:
+            docs = [d for d in docs if _has_phrases([t.lower() for t in texts(d)], phrases)]
+        return list(docs)
+
+    def _score(self, terms: Iterable[str], matches: List[int]) -> Dict[int, float]:
+        """Sum the BM25 score of every query term for each matched position."""
+        total_docs = self.doc_count
+        avg_length = self.total_length / total_docs if total_docs else 0.0
+        lengths = self.doc_lengths
+        scores = dict.fromkeys(matches, 0.0)
+
+        # score = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
+        base = K1 * (1 - B) if avg_length else K1
+        per_word = K1 * B / avg_length if avg_length else 0.0
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            df = postings.count
+            weight = math.log(1 + (total_docs - df + 0.5) / (df + 0.5)) * (K1 + 1)
+            docs, tfs = self._decode(postings, matches)
+            for doc, tf in zip(docs, tfs):
+                scores[doc] += weight * tf / (tf + base + per_word * lengths[doc])
+        return scores
+
+    def _decode(
+        self,
+        postings: _Postings,
+        within: Optional[Sequence[int]] = None
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Unpack a term's positions and term frequencies.
+
+        Args:
+            postings: The term's postings
+            within: Only return these sorted positions; blocks that cannot
+                contain any of them are skipped without being unpacked
+
+        Returns:
+            Sorted positions and their term frequencies
+        """
+        blocks = postings.blocks
+        size = postings.sealed_size()
+        headers = []
+        offset = 0
+        while offset < size:
+            first, count, codes = BLOCK_HEADER.unpack_from(blocks, offset)
+            headers.append((first, offset))
+            offset += BLOCK_HEADER.size + count * (1 << (codes & 0xF)) + (count + 1) * (1 << (codes >> 4))
+
+        out_docs: List[int] = []
+        out_tfs: List[int] = []
+        for i, (first, offset) in enumerate(headers):
+            if within is not None:
+                # The block holds positions from its first up to the next block's first
+                end = headers[i + 1][0] if i + 1 < len(headers) else (postings.docs[0] if postings.docs else None)
+                j = bisect_left(within, first)
+                if j == len(within) or (end is not None and within[j] >= end):
+                    continue
+            docs, tfs = _unpack_block(blocks, offset)
+            _collect(docs, tfs, within, out_docs, out_tfs)
+
+        if postings.docs:
+            _collect(postings.docs, postings.tfs, within, out_docs, out_tfs)
+        return out_docs, out_tfs
+
+
+class _SearchView(SearchIndex):
+    """The postings of some terms and the article lengths, as of one moment."""
+
+    def __init__(self, index: SearchIndex, terms: Iterable[str]):
+        self.postings = {
+            term: index.postings[term].frozen() for term in terms if term in index.postings
+        }
+        # Shared with the index; articles added later are never read
+        self.doc_lengths = index.doc_lengths
+        self.total_length = index.total_length
+        self._doc_count = index.doc_count
+
+    @property
+    def doc_count(self) -> int:
+        return self._doc_count
+
+
+def _unpack_block(blocks, offset: int) -> Tuple[List[int], array]:
+    """Unpack one sealed block into positions and term frequencies."""
+    first, count, codes = BLOCK_HEADER.unpack_from(blocks, offset)
+    start = offset + BLOCK_HEADER.size
+    deltas = array(WIDTH_TYPECODES[codes & 0xF])
+    end = start + count * deltas.itemsize
+    deltas.frombytes(blocks[start:end])
+    tfs = array(WIDTH_TYPECODES[codes >> 4])
+    tfs.frombytes(blocks[end:end + (count + 1) * tfs.itemsize])
+    return list(accumulate(deltas, initial=first)), tfs
+
+
+def _collect(
+    docs: Sequence[int],
+    tfs: Sequence[int],
+    within: Optional[Sequence[int]],
+    out_docs: List[int],
+    out_tfs: List[int]
+):
+    """Append the postings of a block, keeping only positions in within."""
+    if within is None:
+        out_docs.extend(docs)
+        out_tfs.extend(tfs)
+        return
+    lo = bisect_left(within, docs[0])
+    hi = bisect_left(within, docs[-1] + 1, lo)
+    wanted = set(within[lo:hi])
+    for doc, tf in zip(docs, tfs):
+        if doc in wanted:
+            out_docs.append(doc)
+            out_tfs.append(tf)
+
+
+def _phrase_pattern(phrase: Clause) -> "re.Pattern":
+    """
+    Compile a pattern matching the words of a phrase in lower-cased text.
+
+    The words must be whole tokens separated only by non-word characters,
+    which is what consecutive tokenize() results look like in the text. The
+    pattern starts with the first word as a literal, checking the word
+    boundary before it with a lookbehind, so the regex engine can scan for
+    that literal instead of trying every position.
+    """
+    first = re.escape(phrase[0])
+    rest = "".join(r"\W+" + re.escape(word) for word in phrase[1:])
+    return re.compile(first + r"(?<!\w" + first + ")" + rest + r"(?!\w)")
+
+
+def _has_phrases(texts: List[str], patterns: List["re.Pattern"]) -> bool:
+    """Check that every phrase pattern matches one of the lower-cased texts."""
+    return all(any(pattern.search(text) for text in texts) for pattern in patterns)
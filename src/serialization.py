@@ -0,0 +1,21 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode plain Python data as compact UTF-8 JSON.
+
+    Uses orjson when it is installed and falls back to the standard library
+    otherwise; both produce the same output as FastAPI's JSONResponse.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(
+        obj, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
@@ -0,0 +1,76 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to a default."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"Warning: ignoring invalid {name}={value!r}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to a default."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        print(f"Warning: ignoring invalid {name}={value!r}")
+        return default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Runtime configuration, read from MEDIA_API_* environment variables."""
+    data_file: str = "data/articles.json"
+    tag_workers: int = 1
+    tag_chunk_size: int = 1000
+    snapshot_file: Optional[str] = None
+    # JSONL file that added articles are written to and replayed from on load
+    journal_file: Optional[str] = None
+    # Seconds between checks of the data file for changes (0 disables reloading)
+    reload_interval: float = 0.0
+    # Total size of cached response bodies (0 disables the cache)
+    cache_max_bytes: int = 64 * 1024 * 1024
+    # Seconds a cached response stays valid (0 keeps it until the corpus changes)
+    cache_ttl: float = 0.0
+    # Threads running query work off the event loop (0 runs it on the loop)
+    query_workers: int = 2
+    # Queries that may wait for a thread before new ones are rejected with 503
+    query_queue: int = 64
+    # gzip level of whole responses; streams use level 1 (0 disables compression)
+    compress_level: int = 6
+    # Smallest response body that is compressed, in bytes
+    compress_min_bytes: int = 1024
+    # Token for the /admin endpoints (unset disables them)
+    admin_token: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from the environment."""
+        return cls(
+            data_file=os.environ.get("MEDIA_API_DATA_FILE", cls.data_file),
+            tag_workers=_env_int("MEDIA_API_TAG_WORKERS", cls.tag_workers),
+            tag_chunk_size=_env_int("MEDIA_API_TAG_CHUNK_SIZE", cls.tag_chunk_size),
+            snapshot_file=os.environ.get("MEDIA_API_SNAPSHOT_FILE") or None,
+            journal_file=os.environ.get("MEDIA_API_JOURNAL_FILE") or None,
+            reload_interval=_env_float("MEDIA_API_RELOAD_INTERVAL", cls.reload_interval),
+            cache_max_bytes=_env_int("MEDIA_API_CACHE_MAX_BYTES", cls.cache_max_bytes),
+            cache_ttl=_env_float("MEDIA_API_CACHE_TTL", cls.cache_ttl),
+            query_workers=_env_int("MEDIA_API_QUERY_WORKERS", cls.query_workers),
+            query_queue=_env_int("MEDIA_API_QUERY_QUEUE", cls.query_queue),
+            compress_level=_env_int("MEDIA_API_COMPRESS_LEVEL", cls.compress_level),
+            compress_min_bytes=_env_int("MEDIA_API_COMPRESS_MIN_BYTES", cls.compress_min_bytes),
+            admin_token=os.environ.get("MEDIA_API_ADMIN_TOKEN") or None
+        )
+
+
+settings = Settings.from_env()
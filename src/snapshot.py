@@ -0,0 +1,253 @@
+import hashlib
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+from array import array
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Tuple, Union
+from .tagging import ArticleTagger
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+
+# Bump when the layout of the pickled state changes
+SNAPSHOT_VERSION = 10
+
+MAGIC = b"TMASNAP"
+
+# Header: magic, one version byte, the 64-character hex key, then the
+# length of the pickled state as an unsigned 64-bit integer
+HEADER_SIZE = len(MAGIC) + 1 + 64
+LENGTH_FORMAT = "<Q"
+
+# Arrays at least this large are stored as raw bytes after the pickle and
+# attached as read-only views of the mapping instead of being copied
+MIN_SHARED_BYTES = 4096
+
+# Raw column data is aligned so every view starts on an item boundary
+ALIGNMENT = 8
+
+Column = Union[array, bytearray]
+
+
+def snapshot_key(data_file: str, tagger: ArticleTagger) -> str:
+    """
+    Compute the key a snapshot must match to be reused.
+
+    Args:
+        data_file: Path to the articles file
+        tagger: Tagger whose keyword configuration produced the tags
+
+    Returns:
+        Hex digest of the data file contents and the tagger fingerprint
+
+    Raises:
+        OSError: If the data file cannot be read
+    """
+    digest = hashlib.sha256()
+    with open(data_file, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    digest.update(tagger.fingerprint().encode("ascii"))
+    return digest.hexdigest()
+
+
+def cached_snapshot_key(data_file: str, tagger: ArticleTagger, snapshot_file: str) -> str:
+    """
+    Compute snapshot_key(), reusing the last digest if the data file is unchanged.
+
+    Hashing a large data file dominates worker start-up, so the digest is
+    remembered next to the snapshot together with the file's size, mtime
+    and inode, and only recomputed when one of them changes.
+    """
+    cache_path = f"{snapshot_file}.key"
+    stat = os.stat(data_file)
+    signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino, tagger.fingerprint()]
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get("signature") == signature:
+            return cached["key"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+
+    key = snapshot_key(data_file, tagger)
+    try:
+        tmp_path = f"{cache_path}.tmp.{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"signature": signature, "key": key}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: could not cache snapshot key {cache_path}: {e}")
+    return key
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _pad(f, offset: int):
+    """Write zero bytes up to the given file offset."""
+    f.write(b"\0" * (offset - f.tell()))
+
+
+class _ColumnPickler(pickle.Pickler):
+    """Pickler that moves large arrays out of the pickle stream."""
+
+    def __init__(self, f, columns: List[Column]):
+        super().__init__(f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.columns = columns
+        self.size = 0
+
+    def persistent_id(self, obj) -> Optional[Tuple[str, int, int]]:
+        if isinstance(obj, (array, bytearray)):
+            nbytes = len(obj) * obj.itemsize if isinstance(obj, array) else len(obj)
+            if nbytes >= MIN_SHARED_BYTES:
+                typecode = obj.typecode if isinstance(obj, array) else "B"
+                offset = _aligned(self.size)
+                self.columns.append(obj)
+                self.size = offset + nbytes
+                return (typecode, offset, nbytes)
+        return None
+
+
+class _ColumnUnpickler(pickle.Unpickler):
+    """Unpickler that maps out-of-band columns onto a shared buffer."""
+
+    def __init__(self, f, data: memoryview):
+        super().__init__(f)
+        self.data = data
+
+    def persistent_load(self, pid) -> memoryview:
+        typecode, offset, nbytes = pid
+        view = self.data[offset:offset + nbytes]
+        if len(view) != nbytes:
+            raise ValueError("truncated snapshot")
+        return view if typecode == "B" else view.cast(typecode)
+
+
+def read_snapshot(path: str, key: str) -> Optional[Any]:
+    """
+    Memory-map a snapshot and return its state if the key matches.
+
+    Large columns in the returned state are read-only memoryviews over the
+    mapping. Every process that attaches the same snapshot shares those
+    pages through the OS page cache, so the corpus is held in memory once
+    no matter how many workers serve it. The mapping stays open for as long
+    as any view refers to it.
+
+    Args:
+        path: Snapshot file path
+        key: Expected key, from snapshot_key()
+
+    Returns:
+        The stored state, or None if the snapshot is missing or stale
+    """
+    try:
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Warning: ignoring unreadable snapshot {path}: {e}")
+        return None
+
+    try:
+        if mm[:HEADER_SIZE] != MAGIC + bytes([SNAPSHOT_VERSION]) + key.encode("ascii"):
+            mm.close()
+            return None
+        length_end = HEADER_SIZE + struct.calcsize(LENGTH_FORMAT)
+        (length,) = struct.unpack(LENGTH_FORMAT, mm[HEADER_SIZE:length_end])
+        data_start = _aligned(length_end + length)
+        if data_start > len(mm):
+            raise ValueError("truncated snapshot")
+
+        view = memoryview(mm)
+        stream = io.BytesIO(view[length_end:length_end + length])
+        return _ColumnUnpickler(stream, view[data_start:]).load()
+    except (OSError, ValueError, TypeError, struct.error, pickle.UnpicklingError, EOFError) as e:
+        print(f"Warning: ignoring unreadable snapshot {path}: {e}")
+        return None
+
+
+def write_snapshot(path: str, key: str, state: Any):
+    """
+    Atomically write a snapshot of the given state.
+
+    The snapshot is written to a temporary file and renamed into place, so
+    a concurrent reader never sees a partial file.
+    """
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        columns: List[Column] = []
+        stream = io.BytesIO()
+        _ColumnPickler(stream, columns).dump(state)
+        payload = stream.getbuffer()
+
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC + bytes([SNAPSHOT_VERSION]) + key.encode("ascii"))
+            f.write(struct.pack(LENGTH_FORMAT, len(payload)))
+            f.write(payload)
+            _pad(f, _aligned(f.tell()))
+            data_start = f.tell()
+            for column in columns:
+                # Columns start on aligned offsets and are written without copying
+                _pad(f, data_start + _aligned(f.tell() - data_start))
+                f.write(memoryview(column))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: could not write snapshot {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@contextmanager
+def snapshot_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a snapshot while it is checked and rebuilt.
+
+    With several worker processes starting at once, the first one to get
+    the lock builds the snapshot and the others wait, then attach to it.
+    Locking is skipped on platforms without fcntl, and when the lock file
+    cannot be created, e.g. because the snapshot directory is missing; the
+    corpus is then parsed as if no snapshot were configured.
+    """
+    if fcntl is None:
+        yield
+        return
+    try:
+        lock_file = open(f"{path}.lock", 'a')
+    except OSError as e:
+        print(f"Warning: could not lock snapshot {path}: {e}")
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+if __name__ == "__main__":
+    # Build the snapshot ahead of time, e.g. before starting the workers:
+    #   MEDIA_API_SNAPSHOT_FILE=data/articles.snapshot python -m src.snapshot
+    from .data_service import DataService
+    from .settings import settings
+
+    if not settings.snapshot_file:
+        raise SystemExit("Set MEDIA_API_SNAPSHOT_FILE to the snapshot path")
+    service = DataService(
+        data_file=settings.data_file,
+        tag_workers=settings.tag_workers,
+        tag_chunk_size=settings.tag_chunk_size,
+        snapshot_file=settings.snapshot_file
+    )
+    print(f"Snapshot ready with {len(service.articles)} articles")
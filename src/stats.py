@@ -0,0 +1,78 @@
+from typing import Dict
+from .models import Article
+
+
+class CorpusStats:
+    """
+    Article counters kept up to date as articles are added and removed.
+
+    Reading the counts never touches the articles themselves, so the cost
+    of a stats request depends on the number of tags, sources and days, not
+    on the size of the corpus.
+    """
+
+    def __init__(self):
+        self.total_articles = 0
+        self.tag_counts: Dict[str, int] = {}
+        self.source_counts: Dict[str, int] = {}
+        # Optional breakdowns
+        self.daily_counts: Dict[str, int] = {}
+        self.source_tag_counts: Dict[str, Dict[str, int]] = {}
+
+    def add(self, article: Article):
+        """Count a newly added article."""
+        self._apply(article, 1)
+
+    def remove(self, article: Article):
+        """Stop counting an article that was removed."""
+        self._apply(article, -1)
+
+    def update(self, old: Article, new: Article):
+        """Recount an article whose source, date or tags changed."""
+        self.remove(old)
+        self.add(new)
+
+    def _apply(self, article: Article, delta: int):
+        """Add delta to every counter the article contributes to."""
+        self.total_articles += delta
+        _bump(self.source_counts, article.source, delta)
+        _bump(self.daily_counts, article.date, delta)
+
+        per_tag = self.source_tag_counts.setdefault(article.source, {})
+        for tag in article.tags or []:
+            _bump(self.tag_counts, tag, delta)
+            _bump(per_tag, tag, delta)
+        if not per_tag:
+            del self.source_tag_counts[article.source]
+
+    def to_dict(self, breakdowns: bool = False) -> Dict:
+        """
+        Get a copy of the counters.
+
+        Args:
+            breakdowns: Also include per-day and per-source-per-tag counts
+
+        Returns:
+            Dictionary with tags, sources and total_articles, plus daily and
+            source_tags when breakdowns are requested
+        """
+        result = {
+            "tags": dict(self.tag_counts),
+            "sources": dict(self.source_counts),
+            "total_articles": self.total_articles
+        }
+        if breakdowns:
+            result["daily"] = dict(sorted(self.daily_counts.items()))
+            result["source_tags"] = {
+                source: dict(counts) for source, counts in self.source_tag_counts.items()
+            }
+        return result
+
+
+def _bump(counts: Dict[str, int], key: str, delta: int):
+    """Adjust a counter, dropping keys that fall to zero."""
+    value = counts.get(key, 0) + delta
+    if value > 0:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
@@ -0,0 +1,196 @@
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from .models import Article
+
+
+# Text fields kept in the shared buffer, in row order
+TEXT_FIELDS = ("title", "body", "date", "url")
+
+# Tag sets are stored as bitmasks in an unsigned 64-bit column
+MAX_TAGS = 64
+
+# Columns are arrays, or read-only memoryviews when attached from a snapshot
+Column = Union[array, bytearray, memoryview]
+
+
+def writable(column: Column) -> Union[array, bytearray]:
+    """Return an appendable copy of a column attached from a snapshot."""
+    if not isinstance(column, memoryview):
+        return column
+    if column.format == "B":
+        return bytearray(column)
+    copy = array(column.format)
+    copy.frombytes(column.cast("B"))
+    return copy
+
+
+class ArticleStore(Sequence):
+    """
+    Compact columnar storage for articles.
+
+    Instead of one model object per article, each attribute lives in a
+    column: ids in an int array, sources as ids into an interned list, tags
+    as bitmasks, and all text in one UTF-8 buffer addressed by offsets.
+    Indexing the store builds an Article on demand, so only returned rows
+    pay for a Python object.
+
+    A store restored from a snapshot reads its columns straight from the
+    shared mapping; the first append copies them into private arrays.
+    """
+
+    __slots__ = (
+        "ids", "source_ids", "sources", "_source_lookup", "tag_masks",
+        "tag_names", "_tag_bits", "_mask_tags", "text", "offsets"
+    )
+
+    def __init__(self, tag_names: Optional[List[str]] = None):
+        self.ids = array('q')
+        self.source_ids = array('I')
+        self.sources: List[str] = []
+        self._source_lookup: Dict[str, int] = {}
+        self.tag_masks = array('Q')
+        self.tag_names: List[str] = []
+        self._tag_bits: Dict[str, int] = {}
+        # Decoded tag list per bitmask, shared by all rows with the same tags
+        self._mask_tags: Dict[int, List[str]] = {}
+        self.text = bytearray()
+        self.offsets = array('Q', [0])
+        # Registering the tagger's tags up front keeps tag lists in its order
+        for tag in tag_names or []:
+            self._tag_bit(tag)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        return Article.model_construct(**self.row_dict(position))
+
+    def __iter__(self) -> Iterator[Article]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def append(self, article: Article) -> int:
+        """
+        Add an article to the end of the store.
+
+        Returns:
+            The position of the new row
+        """
+        # Only columns above the snapshot's size threshold are shared; the
+        # offsets take the most bytes per row of the arrays, so checking them
+        # and the text covers every column
+        if isinstance(self.offsets, memoryview) or isinstance(self.text, memoryview):
+            self._make_writable()
+
+        # Every value is converted before the first column grows, so one that
+        # does not fit its column leaves no partial row behind
+        row_id, values = self.encode_row(article)
+        mask = 0
+        for tag in article.tags or []:
+            mask |= self._tag_bit(tag)
+        source_id = self._source_id(article.source)
+
+        for value in values:
+            self.text += value
+            self.offsets.append(len(self.text))
+        self.source_ids.append(source_id)
+        self.tag_masks.append(mask)
+        # The id column defines the length, so it is appended last and a
+        # concurrent reader never sees a partially written row
+        self.ids.extend(row_id)
+        return len(self.ids) - 1
+
+    @staticmethod
+    def encode_row(article: Article) -> Tuple[array, List[bytes]]:
+        """
+        Convert the id and text fields of an article to their column values.
+
+        Returns:
+            The id as a one-item array, and the encoded text fields
+
+        Raises:
+            ValueError: If a value does not fit its column
+        """
+        try:
+            row_id = array('q', [article.id])
+        except OverflowError:
+            raise ValueError(f"Article id {article.id} does not fit in a 64-bit integer") from None
+        values = [
+            value.encode("utf-8")
+            for value in (article.title, article.body, article.date, article.url or "")
+        ]
+        return row_id, values
+
+    def row_dict(self, position: int) -> Dict:
+        """Get one row as a plain dictionary with the ArticleResponse fields."""
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("article position out of range")
+
+        base = position * len(TEXT_FIELDS)
+        title, body, date, url = (
+            self._text(base + i) for i in range(len(TEXT_FIELDS))
+        )
+        return {
+            "id": self.ids[position],
+            "title": title,
+            "body": body,
+            "source": self.sources[self.source_ids[position]],
+            "date": date,
+            "url": url,
+            "tags": list(self.tags_for_mask(self.tag_masks[position]))
+        }
+
+    def text_field(self, position: int, field: str) -> str:
+        """Get one text field of a row, e.g. the title, without decoding the others."""
+        return self._text(position * len(TEXT_FIELDS) + TEXT_FIELDS.index(field))
+
+    def source(self, position: int) -> str:
+        """Get the source name of a row without decoding its text."""
+        return self.sources[self.source_ids[position]]
+
+    def tags(self, position: int) -> List[str]:
+        """Get the tags of a row without decoding its text."""
+        return list(self.tags_for_mask(self.tag_masks[position]))
+
+    def tags_for_mask(self, mask: int) -> List[str]:
+        """Decode a tag bitmask into tag names (the returned list is shared)."""
+        tags = self._mask_tags.get(mask)
+        if tags is None:
+            tags = [name for bit, name in enumerate(self.tag_names) if mask >> bit & 1]
+            self._mask_tags[mask] = tags
+        return tags
+
+    def _text(self, field_index: int) -> str:
+        start, end = self.offsets[field_index], self.offsets[field_index + 1]
+        return str(self.text[start:end], "utf-8")
+
+    def _make_writable(self):
+        """Copy shared columns into private arrays before modifying them."""
+        # The id column defines the length, so it is swapped in last
+        self.text = writable(self.text)
+        self.offsets = writable(self.offsets)
+        self.source_ids = writable(self.source_ids)
+        self.tag_masks = writable(self.tag_masks)
+        self.ids = writable(self.ids)
+
+    def _source_id(self, source: str) -> int:
+        source_id = self._source_lookup.get(source)
+        if source_id is None:
+            source_id = len(self.sources)
+            self.sources.append(source)
+            self._source_lookup[source] = source_id
+        return source_id
+
+    def _tag_bit(self, tag: str) -> int:
+        bit = self._tag_bits.get(tag)
+        if bit is None:
+            if len(self.tag_names) >= MAX_TAGS:
+                raise ValueError(f"ArticleStore supports at most {MAX_TAGS} distinct tags")
+            bit = 1 << len(self.tag_names)
+            self.tag_names.append(tag)
+            self._tag_bits[tag] = bit
+        return bit
@@ -1,4 +1,6 @@
-from typing import List, Dict
+from typing import Iterable, List, Dict, Set, Tuple
+import hashlib
+import json
 import re
 
 
@@ -23,6 +25,41 @@ class ArticleTagger:
                 "arrested", "charges", "suspended", "financial"
             ]
         }
+        self.compile()
+    
+    def compile(self):
+        """
+        Precompile the keyword table into a single matcher.
+        
+        Call this again after modifying tag_keywords at runtime.
+        """
+        # Map each keyword back to its tag; longest keywords first so that
+        # "mental health" wins over "health" at the same position
+        self._keyword_tags: Dict[str, str] = {}
+        for tag, keywords in self.tag_keywords.items():
+            for keyword in keywords:
+                self._keyword_tags.setdefault(keyword.lower(), tag)
+        
+        alternation = "|".join(
+            re.escape(keyword)
+            for keyword in sorted(self._keyword_tags, key=len, reverse=True)
+        )
+        self._pattern = re.compile(r'\b(?:' + alternation + r')\b') if alternation else None
+        
+        # A single pass only reports non-overlapping matches, so a tag whose
+        # keywords share words with another tag's keywords could be hidden
+        # behind a match for the other tag. Those tags get their own pattern.
+        words_by_tag = {
+            tag: {word for keyword in keywords for word in re.findall(r'\w+', keyword.lower())}
+            for tag, keywords in self.tag_keywords.items()
+        }
+        self._fallback_patterns: Dict[str, re.Pattern] = {}
+        for tag, words in words_by_tag.items():
+            others = set().union(*(w for t, w in words_by_tag.items() if t != tag))
+            if words & others and self.tag_keywords[tag]:
+                self._fallback_patterns[tag] = re.compile(
+                    r'\b(?:' + "|".join(re.escape(k.lower()) for k in self.tag_keywords[tag]) + r')\b'
+                )
     
     def tag_article(self, title: str, body: str) -> List[str]:
         """
@@ -38,19 +75,43 @@ class ArticleTagger:
         # Combine title and body for keyword search
         content = f"{title} {body}".lower()
         
-        # Find matching tags
-        matched_tags = []
+        # Find matching tags in a single pass over the content
+        found: Set[str] = set()
+        if self._pattern is not None:
+            remaining = len(self.tag_keywords)
+            for match in self._pattern.finditer(content):
+                tag = self._keyword_tags[match.group()]
+                if tag not in found:
+                    found.add(tag)
+                    if len(found) == remaining:
+                        break
         
-        for tag, keywords in self.tag_keywords.items():
-            for keyword in keywords:
-                # Use word boundary to avoid partial matches
-                pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-                if re.search(pattern, content):
-                    matched_tags.append(tag)
-                    break  # Only need one keyword match per tag
+        for tag, pattern in self._fallback_patterns.items():
+            if tag not in found and pattern.search(content):
+                found.add(tag)
+        
+        # Keep the tag order of the keyword table
+        matched_tags = [tag for tag in self.tag_keywords if tag in found]
         
         return matched_tags
     
+    def tag_many(self, articles: Iterable[Tuple[str, str]]) -> List[List[str]]:
+        """
+        Tag a batch of articles.
+        
+        Args:
+            articles: Iterable of (title, body) pairs
+            
+        Returns:
+            List of tag lists, in the same order as the input
+        """
+        return [self.tag_article(title, body) for title, body in articles]
+    
+    def fingerprint(self) -> str:
+        """Get a stable hash of the keyword table, used to key cached results."""
+        table = json.dumps(self.tag_keywords, separators=(",", ":"))
+        return hashlib.sha256(table.encode("utf-8")).hexdigest()
+    
     def get_available_tags(self) -> List[str]:
         """Get list of available tags."""
         return list(self.tag_keywords.keys())
@@ -0,0 +1,143 @@
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+from .indexes import MISSING_DAY
+
+
+# Bucket sizes of trends and date histograms
+INTERVALS = ("day", "week", "month")
+
+
+def bucket_start(day: int, interval: str) -> int:
+    """
+    Get the first day of the bucket containing a day.
+
+    Weeks start on Monday and months on their first day.
+
+    Args:
+        day: Day ordinal, as stored in ArticleIndex.position_days
+        interval: One of INTERVALS
+    """
+    if interval == "day":
+        return day
+    if interval == "week":
+        return day - date.fromordinal(day).weekday()
+    if interval == "month":
+        return date.fromordinal(day).replace(day=1).toordinal()
+    raise ValueError(f"Unknown interval: {interval}")
+
+
+def next_bucket_start(start: int, interval: str) -> int:
+    """Get the first day of the bucket after the one starting on a day."""
+    if interval == "day":
+        return start + 1
+    if interval == "week":
+        return start + 7
+    if interval == "month":
+        first = date.fromordinal(start)
+        if first.month == 12:
+            return date(first.year + 1, 1, 1).toordinal()
+        return date(first.year, first.month + 1, 1).toordinal()
+    raise ValueError(f"Unknown interval: {interval}")
+
+
+def bucket_label(start: int, interval: str) -> str:
+    """Format a bucket's first day as YYYY-MM-DD, or YYYY-MM for months."""
+    label = date.fromordinal(start).isoformat()
+    return label[:7] if interval == "month" else label
+
+
+# A series is identified by a lower-cased source and a tag; None stands for
+# all sources or all tags
+SeriesKey = Tuple[Optional[str], Optional[str]]
+
+
+class TrendRollups:
+    """
+    Article counts per day, week and month, kept up to date at ingest.
+
+    Every article is counted in the all-articles series, its source's
+    series, each of its tags' series and each (source, tag) series, at every
+    interval. A trend query then only reads precomputed buckets: whole
+    buckets inside the range come from the rollup at the requested
+    interval, and only the partial buckets at the edges of the range are
+    added up from daily counts.
+    """
+
+    def __init__(self):
+        # Interval -> series -> bucket start day -> article count
+        self.rollups: Dict[str, Dict[SeriesKey, Dict[int, int]]] = {
+            interval: {} for interval in INTERVALS
+        }
+
+    def add(self, day: int, source: str, tags: Iterable[str], delta: int = 1):
+        """
+        Count an article in every series it belongs to.
+
+        Args:
+            day: Day ordinal of the article; malformed dates are not counted
+            source: Source name
+            tags: Tags of the article
+            delta: 1 to add the article, -1 to remove it
+        """
+        if day == MISSING_DAY:
+            return
+        source = source.lower()
+        keys = [(None, None), (source, None)]
+        for tag in set(tags or []):
+            keys.append((None, tag))
+            keys.append((source, tag))
+
+        for interval, series in self.rollups.items():
+            start = bucket_start(day, interval)
+            for key in keys:
+                buckets = series.setdefault(key, {})
+                count = buckets.get(start, 0) + delta
+                if count > 0:
+                    buckets[start] = count
+                else:
+                    buckets.pop(start, None)
+
+    def series(
+        self,
+        source: Optional[str] = None,
+        tag: Optional[str] = None,
+        interval: str = "day",
+        from_day: Optional[int] = None,
+        to_day: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Get article counts per bucket for one source and/or tag.
+
+        Args:
+            source: Source name (case-insensitive), or None for all sources
+            tag: Tag, or None for all tags
+            interval: Bucket size, one of INTERVALS
+            from_day: First day ordinal to count (None for the first article)
+            to_day: Last day ordinal to count (None for the last article)
+
+        Returns:
+            Counts by bucket label, in date order, with empty buckets
+            between the first and last bucket included as zero
+        """
+        if interval not in self.rollups:
+            raise ValueError(f"Unknown interval: {interval}")
+        key = (source.lower() if source else None, tag)
+        daily = self.rollups["day"].get(key, {})
+        buckets = self.rollups[interval].get(key, {})
+        if not daily:
+            return {}
+
+        first = min(daily) if from_day is None else max(from_day, min(daily))
+        last = max(daily) if to_day is None else min(to_day, max(daily))
+        result: Dict[str, int] = {}
+        start = bucket_start(first, interval)
+        while start <= last:
+            end = next_bucket_start(start, interval)
+            if first <= start and end - 1 <= last:
+                count = buckets.get(start, 0)
+            else:
+                # Partial bucket at an edge of the range
+                count = sum(daily.get(day, 0) for day in range(max(start, first), min(end - 1, last) + 1))
+            result[bucket_label(start, interval)] = count
+            start = end
+        return result
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_service import DataService
+from tests.samples import SAMPLE_ARTICLES, write_articles
+
+
+@pytest.fixture
+def articles():
+    """Raw articles of the corpus behind the service fixture."""
+    return SAMPLE_ARTICLES
+
+
+@pytest.fixture
+def service(tmp_path, articles):
+    """Data service backed by a small temporary corpus."""
+    return DataService(write_articles(tmp_path / "articles.json", articles))
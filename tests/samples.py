@@ -0,0 +1,42 @@
+"""Sample articles shared by the test modules."""
+
+import json
+
+
+SAMPLE_ARTICLES = [
+    {
+        "id": "1",
+        "title": "Election Commission Announces New Guidelines",
+        "body": "The commission has released new voting procedures.",
+        "source": "Daily Nation",
+        "date": "2024-01-15"
+    },
+    {
+        "id": "2",
+        "title": "New Hospital Opens in Rural Area",
+        "body": "The medical facility provides healthcare services.",
+        "source": "The Guardian",
+        "date": "2024-01-20"
+    },
+    {
+        "id": "3",
+        "title": "Corruption Scandal Rocks Government",
+        "body": "Officials were arrested for accepting bribes during the election.",
+        "source": "daily nation",
+        "date": "2024-02-01"
+    },
+    {
+        "id": "4",
+        "title": "Weather Forecast for Tomorrow",
+        "body": "Sunny skies expected with light winds.",
+        "source": "Reuters",
+        "date": "2024-01-18"
+    }
+]
+
+
+def write_articles(path, articles):
+    """Write a list of raw articles to a JSON file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(articles, f)
+    return str(path)
@@ -1,20 +1,32 @@
 import pytest
 from fastapi.testclient import TestClient
+import json
 import sys
 import os
+import time
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from src.cache import ResponseCache
 from src.main import app
 
-client = TestClient(app)
+
+@pytest.fixture(scope="module")
+def client():
+    """Client running the app lifespan, once the corpus has loaded."""
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 30
+        while client.get("/ready").status_code != 200:
+            assert time.monotonic() < deadline, "corpus did not load"
+            time.sleep(0.01)
+        yield client
 
 
 class TestAPIEndpoints:
     """Integration tests for API endpoints."""
     
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, client):
         """Test the root endpoint returns API information."""
         response = client.get("/")
         
@@ -23,7 +35,7 @@ class TestAPIEndpoints:
         assert data["message"] == "Tiny Media Analysis API"
         assert "endpoints" in data
     
-    def test_health_check(self):
+    def test_health_check(self, client):
         """Test the health check endpoint."""
         response = client.get("/health")
         
@@ -31,7 +43,7 @@ class TestAPIEndpoints:
         data = response.json()
         assert data["status"] == "healthy"
     
-    def test_get_articles_no_filters(self):
+    def test_get_articles_no_filters(self, client):
         """Test getting all articles without filters."""
         response = client.get("/api/v1/articles")
         
@@ -51,7 +63,7 @@ class TestAPIEndpoints:
         assert "tags" in article
         assert isinstance(article["tags"], list)
     
-    def test_get_articles_filter_by_source(self):
+    def test_get_articles_filter_by_source(self, client):
         """Test filtering articles by source."""
         response = client.get("/api/v1/articles?source=Daily%20Nation")
         
@@ -62,7 +74,7 @@ class TestAPIEndpoints:
         for article in articles:
             assert article["source"] == "Daily Nation"
     
-    def test_get_articles_filter_by_tag(self):
+    def test_get_articles_filter_by_tag(self, client):
         """Test filtering articles by tag."""
         response = client.get("/api/v1/articles?tag=elections")
         
@@ -73,7 +85,7 @@ class TestAPIEndpoints:
         for article in articles:
             assert "elections" in article["tags"]
     
-    def test_get_articles_filter_by_multiple_tags(self):
+    def test_get_articles_filter_by_multiple_tags(self, client):
         """Test filtering articles by multiple tags."""
         response = client.get("/api/v1/articles?tag=elections&tag=health")
         
@@ -84,7 +96,7 @@ class TestAPIEndpoints:
         for article in articles:
             assert "elections" in article["tags"] or "health" in article["tags"]
     
-    def test_get_articles_filter_by_date_range(self):
+    def test_get_articles_filter_by_date_range(self, client):
         """Test filtering articles by date range."""
         response = client.get("/api/v1/articles?date_from=2024-01-15&date_to=2024-01-20")
         
@@ -96,7 +108,7 @@ class TestAPIEndpoints:
             article_date = article["date"]
             assert "2024-01-15" <= article_date <= "2024-01-20"
     
-    def test_get_stats(self):
+    def test_get_stats(self, client):
         """Test getting statistics."""
         response = client.get("/api/v1/stats")
         
@@ -111,7 +123,20 @@ class TestAPIEndpoints:
         assert isinstance(stats["total_articles"], int)
         assert stats["total_articles"] > 0
     
-    def test_get_articles_invalid_date_format(self):
+    def test_get_stats_breakdowns(self, client):
+        """Test that breakdowns are only included when requested."""
+        plain = client.get("/api/v1/stats").json()
+        detailed = client.get("/api/v1/stats?breakdowns=true").json()
+        
+        assert "daily" not in plain
+        assert "source_tags" not in plain
+        assert sum(detailed["daily"].values()) == detailed["total_articles"]
+        for source, tag_counts in detailed["source_tags"].items():
+            assert source in detailed["sources"]
+            for tag, count in tag_counts.items():
+                assert count <= detailed["tags"][tag]
+    
+    def test_get_articles_invalid_date_format(self, client):
         """Test that invalid date format returns all articles (graceful handling)."""
         response = client.get("/api/v1/articles?date_from=invalid-date")
         
@@ -120,7 +145,7 @@ class TestAPIEndpoints:
         articles = response.json()
         assert isinstance(articles, list)
     
-    def test_get_articles_nonexistent_source(self):
+    def test_get_articles_nonexistent_source(self, client):
         """Test filtering by nonexistent source returns empty list."""
         response = client.get("/api/v1/articles?source=NonexistentSource")
         
@@ -128,10 +153,588 @@ class TestAPIEndpoints:
         articles = response.json()
         assert len(articles) == 0
     
-    def test_get_articles_nonexistent_tag(self):
+    def test_get_articles_nonexistent_tag(self, client):
         """Test filtering by nonexistent tag returns empty list."""
         response = client.get("/api/v1/articles?tag=nonexistent")
         
         assert response.status_code == 200
         articles = response.json()
-        assert len(articles) == 0 
\ No newline at end of file
+        assert len(articles) == 0
+    
+    def test_get_articles_limit_and_offset(self, client):
+        """Test that limit and offset select a slice of the results."""
+        everything = client.get("/api/v1/articles").json()
+        response = client.get("/api/v1/articles?limit=3&offset=2")
+        
+        assert response.status_code == 200
+        assert response.json() == everything[2:5]
+        assert response.headers["X-Total-Count"] == str(len(everything))
+    
+    def test_get_articles_default_page_size(self, client, tmp_path, monkeypatch):
+        """Test that /articles without a limit returns one page and a cursor to the next."""
+        from src import api
+        from src.data_service import DataService
+        
+        data_file = tmp_path / "articles.json"
+        data_file.write_text(json.dumps([
+            {"id": str(i), "title": f"Story {i}", "body": "Parliament met.",
+             "source": "Reuters", "date": "2024-01-01"}
+            for i in range(api.DEFAULT_PAGE_SIZE + 20)
+        ]), encoding='utf-8')
+        monkeypatch.setattr(api, "data_service", DataService(str(data_file)))
+        monkeypatch.setattr(api, "response_cache", ResponseCache())
+        
+        response = client.get("/api/v1/articles?fields=id")
+        
+        assert len(response.json()) == api.DEFAULT_PAGE_SIZE
+        assert response.headers["X-Total-Count"] == str(api.DEFAULT_PAGE_SIZE + 20)
+        rest = client.get(f"/api/v1/articles?fields=id&cursor={response.headers['X-Next-Cursor']}")
+        assert len(rest.json()) == 20
+        assert "X-Next-Cursor" not in rest.headers
+        
+    def test_get_articles_cursor_pages_through_everything(self, client):
+        """Test that following cursors visits every article exactly once."""
+        everything = client.get("/api/v1/articles?tag=elections&tag=health").json()
+        
+        seen = []
+        url = "/api/v1/articles?tag=elections&tag=health&limit=2"
+        response = client.get(url)
+        while True:
+            seen.extend(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            response = client.get(f"{url}&cursor={cursor}")
+        
+        assert seen == everything
+    
+    def test_get_articles_invalid_cursor(self, client):
+        """Test that a malformed cursor is rejected."""
+        response = client.get("/api/v1/articles?cursor=not-a-cursor")
+        
+        assert response.status_code == 400
+    
+    def test_get_articles_field_projection(self, client):
+        """Test that fields= limits the returned fields."""
+        response = client.get("/api/v1/articles?fields=id,title,tags&limit=2")
+        
+        assert response.status_code == 200
+        for article in response.json():
+            assert set(article) == {"id", "title", "tags"}
+    
+    def test_get_articles_unknown_field(self, client):
+        """Test that unknown projection fields are rejected."""
+        response = client.get("/api/v1/articles?fields=id,secret")
+        
+        assert response.status_code == 400
+    
+    def test_export_articles_ndjson(self, client):
+        """Test that the export streams one JSON article per line."""
+        response = client.get("/api/v1/articles/export")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == client.get("/api/v1/articles").json()
+    
+    def test_export_articles_with_filters(self, client):
+        """Test that the export applies the same filters as /articles."""
+        query = "source=The%20Guardian&tag=elections&date_from=2024-05-01"
+        response = client.get(f"/api/v1/articles/export?{query}")
+        
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == client.get(f"/api/v1/articles?{query}").json()
+
+
+class TestBatchIngestion:
+    """Integration tests for adding articles through the API."""
+    
+    @pytest.fixture(autouse=True)
+    def service(self, tmp_path, monkeypatch):
+        """Serve a private corpus so added articles do not leak into other tests."""
+        from src import api
+        from src.data_service import DataService
+        
+        data_file = tmp_path / "articles.json"
+        data_file.write_text(json.dumps([{
+            "id": "1", "title": "Budget Debate", "body": "Parliament met.",
+            "source": "Reuters", "date": "2024-01-01"
+        }]), encoding='utf-8')
+        service = DataService(str(data_file))
+        monkeypatch.setattr(api, "data_service", service)
+        monkeypatch.setattr(api, "response_cache", ResponseCache())
+        return service
+    
+    def test_batch_is_tagged_indexed_and_counted(self, client):
+        """Test that added articles are tagged and visible to filters and stats."""
+        batch = [
+            {"id": 2, "title": "Election Results", "body": "Voters went to the polls.",
+             "source": "Daily Nation", "date": "2024-03-01"},
+            {"id": 3, "title": "Hospital Funding", "body": "A new clinic opens.",
+             "source": "Reuters", "date": "2023-12-31", "url": "https://example.com/3"}
+        ]
+        response = client.post("/api/v1/articles:batch", json=batch)
+        
+        assert response.status_code == 200
+        assert response.json() == {"added": 2, "total_articles": 3}
+        
+        elections = client.get("/api/v1/articles?tag=elections").json()
+        assert [a["id"] for a in elections] == [2]
+        in_2023 = client.get("/api/v1/articles?date_to=2023-12-31").json()
+        assert [a["id"] for a in in_2023] == [3]
+        
+        stats = client.get("/api/v1/stats").json()
+        assert stats["total_articles"] == 3
+        assert stats["sources"]["Reuters"] == 2
+    
+    def test_invalid_batch_is_rejected(self, client, service):
+        """Test that a batch with an invalid article is rejected without adding anything."""
+        batch = [
+            {"id": 2, "title": "Ok", "body": "Ok", "source": "Reuters", "date": "2024-01-02"},
+            {"id": "not-a-number", "title": "Bad", "body": "Bad", "source": "Reuters", "date": "2024-01-02"}
+        ]
+        response = client.post("/api/v1/articles:batch", json=batch)
+        
+        assert response.status_code == 422
+        assert len(service.articles) == 1
+    
+    @pytest.mark.parametrize("article_id", [2**63, -2**63 - 1])
+    def test_out_of_range_id_is_rejected(self, client, service, article_id):
+        """Test that an id that does not fit in 64 bits is rejected before the batch is added."""
+        batch = [
+            {"id": 2, "title": "Ok", "body": "Ok", "source": "Reuters", "date": "2024-01-02"},
+            {"id": article_id, "title": "Big", "body": "Big", "source": "Reuters", "date": "2024-01-02"}
+        ]
+        response = client.post("/api/v1/articles:batch", json=batch)
+        
+        assert response.status_code == 422
+        assert len(service.articles) == 1
+
+    def test_batch_invalidates_cached_responses(self, client):
+        """Test that cached responses are recomputed after a batch is added."""
+        before = client.get("/api/v1/stats")
+        client.post("/api/v1/articles:batch", json=[
+            {"id": 2, "title": "Ok", "body": "Ok", "source": "Reuters", "date": "2024-01-02"}
+        ])
+        after = client.get("/api/v1/stats", headers={"If-None-Match": before.headers["ETag"]})
+        
+        assert after.status_code == 200
+        assert after.headers["X-Cache"] == "MISS"
+        assert after.json()["total_articles"] == 2
+
+
+class TestDeduplication:
+    """Integration tests for collapsing near-duplicate articles."""
+    
+    @pytest.fixture(autouse=True)
+    def service(self, tmp_path, monkeypatch):
+        """Serve a private corpus with a syndicated copy of one article."""
+        from src import api
+        from src.data_service import DataService
+        
+        story = {"title": "Budget Debate", "body": "Parliament met to debate the county budget.",
+                 "date": "2024-01-01"}
+        data_file = tmp_path / "articles.json"
+        data_file.write_text(json.dumps([
+            dict(story, id="1", source="Reuters"),
+            {"id": "2", "title": "Election Results", "body": "Voters went to the polls.",
+             "source": "Daily Nation", "date": "2024-01-02"},
+            dict(story, id="3", source="Daily Nation"),
+        ]), encoding='utf-8')
+        service = DataService(str(data_file))
+        monkeypatch.setattr(api, "data_service", service)
+        monkeypatch.setattr(api, "response_cache", ResponseCache())
+        return service
+    
+    def test_dedupe_collapses_copies(self, client):
+        """Test that dedupe=true returns one article per group with the ids of the others."""
+        everything = client.get("/api/v1/articles?fields=id")
+        deduped = client.get("/api/v1/articles?fields=id&dedupe=true")
+        
+        assert everything.json() == [{"id": 1}, {"id": 2}, {"id": 3}]
+        assert deduped.json() == [{"id": 1, "duplicate_ids": [3]}, {"id": 2, "duplicate_ids": []}]
+        assert deduped.headers["X-Total-Count"] == "2"
+        
+        from_nation = client.get("/api/v1/articles?source=Daily Nation&fields=id&dedupe=true")
+        assert from_nation.json() == [{"id": 2, "duplicate_ids": []}, {"id": 3, "duplicate_ids": [1]}]
+    
+    def test_stats_leave_out_duplicates(self, client):
+        """Test that stats count duplicates, and only canonical articles with dedupe=true."""
+        stats = client.get("/api/v1/stats").json()
+        unique = client.get("/api/v1/stats?dedupe=true").json()
+        
+        assert (stats["total_articles"], stats["duplicates"]) == (3, 1)
+        assert unique["total_articles"] == 2
+        assert unique["sources"] == {"Reuters": 1, "Daily Nation": 1}
+
+
+class TestResponseCaching:
+    """Integration tests for cached responses and conditional requests."""
+    
+    @pytest.fixture(autouse=True)
+    def cache(self, monkeypatch):
+        """Start every test with an empty response cache."""
+        from src import api
+        
+        cache = ResponseCache()
+        monkeypatch.setattr(api, "response_cache", cache)
+        return cache
+    
+    def test_repeated_query_is_served_from_cache(self, client):
+        """Test that the same query is cached, including equivalent parameter spellings."""
+        first = client.get("/api/v1/articles?tag=health&tag=elections&source=daily%20nation")
+        second = client.get("/api/v1/articles?source=Daily%20Nation&tag=elections&tag=health")
+        
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.content == first.content
+        assert second.headers["X-Total-Count"] == first.headers["X-Total-Count"]
+    
+    def test_if_none_match_returns_304(self, client):
+        """Test that a matching ETag gets an empty 304 response."""
+        first = client.get("/api/v1/stats?breakdowns=true")
+        second = client.get("/api/v1/stats?breakdowns=true", headers={"If-None-Match": first.headers["ETag"]})
+        
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == first.headers["ETag"]
+    
+    def test_stale_etag_returns_full_response(self, client):
+        """Test that a non-matching ETag gets the full response."""
+        response = client.get("/api/v1/stats", headers={"If-None-Match": '"stale"'})
+        
+        assert response.status_code == 200
+        assert response.json()["total_articles"] > 0
+    
+    def test_cache_metrics(self, client):
+        """Test that hits and misses are reported."""
+        client.get("/api/v1/stats")
+        client.get("/api/v1/stats")
+        
+        metrics = client.get("/api/v1/cache/stats").json()
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 1
+        assert metrics["entries"] == 1
+        assert metrics["hit_ratio"] == 0.5
+
+
+class TestSearchEndpoint:
+    """Integration tests for full-text search."""
+    
+    def test_search_returns_scored_matches(self, client):
+        """Test that results contain the query words and are ranked by score."""
+        response = client.get("/api/v1/search?q=election")
+        
+        assert response.status_code == 200
+        results = response.json()
+        assert len(results) == int(response.headers["X-Total-Count"]) > 0
+        scores = [r["score"] for r in results]
+        assert scores == sorted(scores, reverse=True)
+        for result in results:
+            assert "election" in (result["title"] + " " + result["body"]).lower()
+    
+    def test_search_with_filters_and_fields(self, client):
+        """Test that search accepts the article filters and field projection."""
+        response = client.get("/api/v1/search?q=election%20OR%20health&source=The%20Guardian&fields=id,source")
+        
+        assert response.status_code == 200
+        for result in response.json():
+            assert set(result) == {"id", "source", "score"}
+            assert result["source"] == "The Guardian"
+    
+    def test_empty_search_query(self, client):
+        """Test that a query without words is rejected."""
+        response = client.get('/api/v1/search?q=%22%22')
+        
+        assert response.status_code == 400
+
+
+class TestFacetsEndpoint:
+    """Integration tests for facet counts."""
+    
+    def test_facets_for_filtered_articles(self, client):
+        """Test that facets count the same articles /articles returns."""
+        query = "source=The%20Guardian&date_from=2024-05-01"
+        articles = client.get(f"/api/v1/articles?{query}").json()
+        assert articles
+        facets = client.get(f"/api/v1/facets?{query}&interval=week").json()
+        
+        assert facets["total"] == len(articles)
+        assert facets["sources"] == {"The Guardian": len(articles)}
+        assert sum(facets["dates"].values()) == len(articles)
+        assert facets["interval"] == "week"
+    
+    def test_facets_invalid_interval(self, client):
+        """Test that an unknown interval is rejected."""
+        response = client.get("/api/v1/facets?interval=year")
+        
+        assert response.status_code == 422
+
+
+class TestTrendsEndpoint:
+    """Integration tests for trend series."""
+    
+    def test_series_per_tag(self, client):
+        """Test that each requested tag gets a series adding up to its article count."""
+        response = client.get("/api/v1/trends?tag=elections&tag=health&interval=month")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["interval"] == "month"
+        assert [s["tag"] for s in data["series"]] == ["elections", "health"]
+        stats = client.get("/api/v1/stats").json()
+        for series in data["series"]:
+            assert sum(series["counts"].values()) == stats["tags"].get(series["tag"], 0)
+    
+    def test_series_for_source_in_range(self, client):
+        """Test a daily series for one source within a date range."""
+        response = client.get("/api/v1/trends?source=Reuters&date_from=2024-06-01&date_to=2024-06-30")
+        
+        series = response.json()["series"]
+        assert len(series) == 1
+        assert series[0]["source"] == "Reuters"
+        assert all("2024-06-01" <= day <= "2024-06-30" for day in series[0]["counts"])
+
+
+class TestQueryAdmission:
+    """Integration tests for rejecting queries when the query pool is full."""
+    
+    def test_full_pool_answers_503(self, client, monkeypatch):
+        """Test that a cache miss is rejected with Retry-After while the pool is full."""
+        from src import api
+        from src.executor import QueryExecutor
+        
+        executor = QueryExecutor(workers=1, max_queue=0)
+        executor.pending = 1
+        monkeypatch.setattr(api, "query_executor", executor)
+        monkeypatch.setattr(api, "response_cache", ResponseCache())
+        
+        response = client.get("/api/v1/articles?limit=1")
+        
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert executor.metrics()["rejected"] == 1
+    
+    def test_export_is_admitted_like_queries(self, client, monkeypatch):
+        """Test that an export is rejected while the pool is full rather than matched outside it."""
+        from src import api
+        from src.executor import QueryExecutor
+        
+        executor = QueryExecutor(workers=1, max_queue=0)
+        executor.pending = 1
+        monkeypatch.setattr(api, "query_executor", executor)
+        
+        response = client.get("/api/v1/articles/export")
+        
+        assert response.status_code == 503
+        assert executor.metrics()["rejected"] == 1
+    
+    def test_cache_hits_bypass_the_pool(self, client, monkeypatch):
+        """Test that cached responses are still served while the pool is full."""
+        from src import api
+        from src.executor import QueryExecutor
+        
+        monkeypatch.setattr(api, "response_cache", ResponseCache())
+        client.get("/api/v1/stats")
+        executor = QueryExecutor(workers=1, max_queue=0)
+        executor.pending = 1
+        monkeypatch.setattr(api, "query_executor", executor)
+        
+        response = client.get("/api/v1/stats")
+        
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "HIT"
+
+
+class TestReadiness:
+    """Integration tests for serving before the corpus has loaded."""
+    
+    @pytest.fixture
+    def unloaded(self, tmp_path, monkeypatch):
+        """Serve a data service whose corpus has not been loaded yet."""
+        from src import api, main
+        from src.data_service import DataService
+        
+        data_file = tmp_path / "articles.json"
+        data_file.write_text(json.dumps([{
+            "id": "1", "title": "Budget Debate", "body": "Parliament met.",
+            "source": "Reuters", "date": "2024-01-01"
+        }]), encoding='utf-8')
+        service = DataService(str(data_file), load=False)
+        monkeypatch.setattr(api, "data_service", service)
+        monkeypatch.setattr(main, "data_service", service)
+        monkeypatch.setattr(api, "response_cache", ResponseCache())
+        return service
+    
+    def test_data_routes_answer_503_until_loaded(self, client, unloaded):
+        """Test that data routes and /ready answer 503 while /health answers 200."""
+        assert client.get("/health").status_code == 200
+        
+        ready = client.get("/ready")
+        assert ready.status_code == 503
+        assert ready.json()["status"] == "loading"
+        
+        response = client.get("/api/v1/articles")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+        
+        unloaded.load()
+        
+        ready = client.get("/ready")
+        assert ready.status_code == 200
+        assert ready.json()["status"] == "ready"
+        assert ready.json()["articles"] == 1
+        assert len(client.get("/api/v1/articles").json()) == 1
+    
+    def test_lifespan_loads_in_the_background(self, unloaded):
+        """Test that starting the app loads the corpus without waiting for it."""
+        with TestClient(app) as client:
+            deadline = time.monotonic() + 30
+            while not unloaded.ready:
+                assert time.monotonic() < deadline, "corpus did not load"
+                time.sleep(0.01)
+            assert client.get("/api/v1/articles").status_code == 200
+
+
+class TestMetricsEndpoint:
+    """Integration tests for the Prometheus /metrics endpoint."""
+    
+    def test_metrics_report_requests_stages_and_cache(self, client, monkeypatch):
+        """Test that a query shows up in the request, stage, result size and cache metrics."""
+        from src import api
+        
+        monkeypatch.setattr(api, "response_cache", ResponseCache())
+        client.get("/api/v1/articles?tag=health")
+        client.get("/api/v1/articles?tag=health")
+        
+        response = client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert 'media_api_request_duration_seconds_count{route="/api/v1/articles",method="GET",status="200"}' in text
+        for stage in ("index_lookup", "serialization", "load", "tagging"):
+            assert f'media_api_stage_duration_seconds_count{{stage="{stage}"}}' in text
+        assert 'media_api_result_size_count{route="/articles"}' in text
+        assert 'media_api_cache_lookups_total{result="hit"} 1' in text
+        assert 'media_api_cache_lookups_total{result="miss"} 1' in text
+    
+    def test_unknown_paths_share_one_series(self, client):
+        """Test that unmatched paths are not recorded under their raw path."""
+        client.get("/no/such/path/12345")
+        
+        text = client.get("/metrics").text
+        assert "/no/such/path" not in text
+        assert 'route="unmatched"' in text
+
+
+class TestAdminProfile:
+    """Integration tests for the admin profiling endpoint."""
+    
+    @pytest.fixture
+    def admin(self, monkeypatch):
+        """Enable the admin endpoints with a known token."""
+        from src import admin
+        from src.settings import Settings
+        
+        monkeypatch.setattr(admin, "settings", Settings(admin_token="secret"))
+        return {"Authorization": "Bearer secret"}
+    
+    def test_disabled_without_a_token(self, client):
+        """Test that the admin endpoints do not exist unless a token is configured."""
+        response = client.post("/admin/profile?seconds=0.1")
+        
+        assert response.status_code == 404
+    
+    def test_wrong_token_is_rejected(self, client, admin):
+        """Test that a missing or wrong bearer token is rejected."""
+        assert client.post("/admin/profile?seconds=0.1").status_code == 401
+        response = client.post("/admin/profile?seconds=0.1", headers={"Authorization": "Bearer wrong"})
+        
+        assert response.status_code == 401
+    
+    def test_sample_mode_returns_collapsed_stacks(self, client, admin):
+        """Test that a sampling window returns stacks in the collapsed format."""
+        response = client.post("/admin/profile?mode=sample&seconds=0.2&idle=true", headers=admin)
+        
+        assert response.status_code == 200
+        assert int(response.headers["x-profile-samples"]) > 0
+        for line in response.text.splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert stack and int(count) > 0
+    
+    def test_cprofile_mode_profiles_the_next_queries(self, client, admin, monkeypatch):
+        """Test that cprofile mode waits for the next queries and reports their functions."""
+        import threading
+        from src import api
+        
+        monkeypatch.setattr(api, "response_cache", ResponseCache(max_bytes=0))
+        results = {}
+        
+        def profile():
+            results["response"] = client.post("/admin/profile?mode=cprofile&requests=1&seconds=10", headers=admin)
+        
+        thread = threading.Thread(target=profile)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while api.profiler.session is None:
+            assert time.monotonic() < deadline, "profiling did not start"
+            time.sleep(0.01)
+        client.get("/api/v1/articles?tag=health")
+        thread.join()
+        
+        response = results["response"]
+        assert response.status_code == 200
+        assert response.headers["x-profile-requests"] == "1"
+        assert "render_articles" in response.text
+        assert api.profiler.session is None
+    
+    def test_sample_mode_rejects_pstats_output(self, client, admin):
+        """Test that a format that does not match the mode is rejected."""
+        response = client.post("/admin/profile?mode=sample&format=pstats&seconds=0.1", headers=admin)
+        
+        assert response.status_code == 400
+
+
+class TestCompression:
+    """Integration tests for compressed responses."""
+    
+    def test_cached_responses_are_compressed_once(self, client, monkeypatch):
+        """Test that a cached response is compressed on the first request and reused after."""
+        from src import api
+        
+        monkeypatch.setattr(api, "response_cache", ResponseCache())
+        first = client.get("/api/v1/articles", headers={"Accept-Encoding": "gzip"})
+        second = client.get("/api/v1/articles", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/api/v1/articles", headers={"Accept-Encoding": "identity"})
+        
+        assert first.headers["content-encoding"] == "gzip"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.content == first.content == plain.content
+        assert "content-encoding" not in plain.headers
+        assert plain.headers["ETag"] != first.headers["ETag"]
+        assert int(first.headers["content-length"]) < int(plain.headers["content-length"])
+        
+        key = ("articles", None, None, None, None, 100, 0, None, None, False)
+        entry = api.response_cache.get(key, api.data_service.corpus.version)
+        assert set(entry.encoded) == {"gzip"}
+    
+    def test_compressed_etag_revalidates(self, client):
+        """Test that the ETag of a compressed response gets a 304."""
+        headers = {"Accept-Encoding": "gzip"}
+        first = client.get("/api/v1/articles?limit=8", headers=headers)
+        second = client.get(
+            "/api/v1/articles?limit=8",
+            headers=dict(headers, **{"If-None-Match": first.headers["ETag"]})
+        )
+        
+        assert first.headers["content-encoding"] == "gzip"
+        assert second.status_code == 304
+    
+    def test_export_is_compressed_while_streaming(self, client):
+        """Test that the streamed export is gzip-encoded and decodes to the same lines."""
+        compressed = client.get("/api/v1/articles/export", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/api/v1/articles/export", headers={"Accept-Encoding": "identity"})
+        
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.text == plain.text
@@ -0,0 +1,110 @@
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.cache import ResponseCache, etag_matches, make_etag
+
+
+class FakeClock:
+    """Manually advanced replacement for time.monotonic."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResponseCache:
+    """Test cases for the response cache."""
+
+    def test_hit_after_put(self):
+        """Test that a cached response is returned for the same key and version."""
+        cache = ResponseCache()
+        cache.put("a", 0, b"[1]", {"X-Total-Count": "1"})
+
+        entry = cache.get("a", 0)
+        assert entry.body == b"[1]"
+        assert entry.headers == {"X-Total-Count": "1"}
+        assert entry.etag == make_etag(b"[1]")
+        assert cache.metrics()["hits"] == 1
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the cache stays within its size bound by evicting the oldest entry."""
+        cache = ResponseCache(max_bytes=10)
+        cache.put("a", 0, b"aaaa", {})
+        cache.put("b", 0, b"bbbb", {})
+        cache.get("a", 0)
+        cache.put("c", 0, b"cccc", {})
+
+        assert cache.get("b", 0) is None
+        assert cache.get("a", 0) is not None
+        assert cache.size_bytes == 8
+        assert cache.metrics()["evictions"] == 1
+
+    def test_oversized_body_is_not_stored(self):
+        """Test that a body larger than the cache is returned but not cached."""
+        cache = ResponseCache(max_bytes=2)
+        entry = cache.put("a", 0, b"abc", {})
+
+        assert entry.etag == make_etag(b"abc")
+        assert len(cache) == 0
+
+    def test_compressed_copies_count_towards_the_size(self):
+        """Test that compressed copies are kept with their entry and evicted with it."""
+        cache = ResponseCache(max_bytes=10)
+        entry = cache.put("a", 0, b"aaaa", {})
+        cache.put_encoded("a", entry, "gzip", b"zz")
+
+        assert cache.get("a", 0).encoded == {"gzip": b"zz"}
+        assert cache.size_bytes == 6
+
+        cache.put("b", 0, b"bbbbb", {})
+        assert cache.get("a", 0) is None
+        assert cache.size_bytes == 5
+
+        # A copy of an entry that is no longer cached is not stored
+        cache.put_encoded("a", entry, "br", b"yy")
+        assert cache.size_bytes == 5
+
+    def test_entries_expire_after_ttl(self):
+        """Test that entries are dropped once their TTL has passed."""
+        clock = FakeClock()
+        cache = ResponseCache(ttl=5, clock=clock)
+        cache.put("a", 0, b"[]", {})
+
+        clock.now = 4.9
+        assert cache.get("a", 0) is not None
+        clock.now = 5.0
+        assert cache.get("a", 0) is None
+        assert cache.size_bytes == 0
+
+    def test_newer_version_invalidates_everything(self):
+        """Test that seeing a newer corpus version drops all older entries."""
+        cache = ResponseCache()
+        cache.put("a", 0, b"[]", {})
+        cache.put("b", 0, b"[]", {})
+
+        assert cache.get("a", 1) is None
+        assert len(cache) == 0
+        assert cache.metrics()["invalidations"] == 1
+
+    def test_response_from_older_version_is_not_stored(self):
+        """Test that a response computed before a corpus change is not cached."""
+        cache = ResponseCache()
+        cache.get("a", 2)
+        cache.put("a", 1, b"[]", {})
+
+        assert len(cache) == 0
+
+    def test_etag_matching(self):
+        """Test If-None-Match parsing with lists, weak tags and wildcards."""
+        etag = make_etag(b"[]")
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
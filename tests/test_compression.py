@@ -0,0 +1,109 @@
+import asyncio
+import gzip
+import os
+import sys
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src import compression
+from src.compression import CompressionMiddleware, StreamCompressor, choose_encoding
+
+
+def run_app(app, accept_encoding="gzip"):
+    """Run one GET request through an ASGI app and collect the messages it sends."""
+    scope = {
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return dict(messages[0]["headers"]), b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def make_app(chunks, content_type=b"application/json", headers=()):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start", "status": 200,
+            "headers": [(b"content-type", content_type), *headers],
+        })
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+
+class TestCompression:
+    """Test cases for content negotiation and response compression."""
+
+    @pytest.mark.parametrize("header, expected", [
+        (None, None),
+        ("gzip", "gzip"),
+        ("gzip, deflate", "gzip"),
+        ("deflate", None),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("*;q=0.5, gzip;q=0", None),
+        ("GZIP;q=0.8, identity", "gzip"),
+    ])
+    def test_choose_encoding(self, header, expected, monkeypatch):
+        """Test that q-values and wildcards in Accept-Encoding are respected."""
+        monkeypatch.setattr(compression, "brotli", None)
+        choose_encoding.cache_clear()
+        try:
+            assert choose_encoding(header) == expected
+        finally:
+            choose_encoding.cache_clear()
+
+    def test_stream_compressor_round_trips(self):
+        """Test that chunks compressed one by one decode to the whole body."""
+        compressor = StreamCompressor("gzip")
+        chunks = [b'{"id": %d, "body": "wire story"}\n' % i * 50 for i in range(20)]
+        data = b"".join(compressor.compress(chunk) for chunk in chunks) + compressor.finish()
+
+        assert gzip.decompress(data) == b"".join(chunks)
+
+    def test_middleware_compresses_large_bodies_only(self):
+        """Test that bodies under the threshold and binary types are sent as they are."""
+        body = b'{"text": "' + b"election " * 500 + b'"}'
+        middleware = CompressionMiddleware(make_app([body]), minimum_size=1024)
+
+        headers, sent = run_app(middleware)
+        assert headers[b"content-encoding"] == b"gzip"
+        assert headers[b"vary"] == b"Accept-Encoding"
+        assert int(headers[b"content-length"]) == len(sent) < len(body)
+        assert gzip.decompress(sent) == body
+
+        headers, sent = run_app(CompressionMiddleware(make_app([b"{}"])))
+        assert b"content-encoding" not in headers and sent == b"{}"
+
+        headers, sent = run_app(CompressionMiddleware(make_app([body], content_type=b"image/png")))
+        assert b"content-encoding" not in headers and sent == body
+
+        headers, sent = run_app(middleware, accept_encoding="identity")
+        assert b"content-encoding" not in headers and sent == body
+
+    def test_middleware_streams_compressed_chunks(self):
+        """Test that a streamed response is compressed chunk by chunk without a length."""
+        chunks = [b'{"id": %d}\n' % i * 100 for i in range(10)]
+        headers, sent = run_app(CompressionMiddleware(make_app(chunks, content_type=b"application/x-ndjson")))
+
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        assert gzip.decompress(sent) == b"".join(chunks)
+
+    def test_already_encoded_responses_pass_through(self):
+        """Test that precompressed responses are not compressed twice."""
+        body = gzip.compress(b"x" * 5000)
+        app = make_app([body], headers=[(b"content-encoding", b"gzip")])
+
+        headers, sent = run_app(CompressionMiddleware(app))
+        assert sent == body
@@ -0,0 +1,424 @@
+import pytest
+import json
+import sys
+import os
+import random
+import threading
+from datetime import datetime
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_service import DataService
+from tests.samples import SAMPLE_ARTICLES, write_articles
+
+
+def brute_force_ids(service, source=None, tags=None, date_from=None, date_to=None):
+    """Reference implementation of the filters using linear scans."""
+    def parse(value):
+        return datetime.strptime(value, "%Y-%m-%d").date()
+
+    result = []
+    for article in service.articles:
+        if source and article.source.lower() != source.lower():
+            continue
+        if tags and not any(tag in article.tags for tag in tags):
+            continue
+        if date_from and parse(article.date) < parse(date_from):
+            continue
+        if date_to and parse(article.date) > parse(date_to):
+            continue
+        result.append(article.id)
+    return result
+
+
+class TestDataServiceFiltering:
+    """Test cases for index-backed filtering in DataService."""
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"source": "Daily Nation"},
+        {"source": "DAILY NATION"},
+        {"tags": ["elections"]},
+        {"tags": ["elections", "health"]},
+        {"tags": ["nonexistent"]},
+        {"date_from": "2024-01-16"},
+        {"date_to": "2024-01-18"},
+        {"date_from": "2024-01-15", "date_to": "2024-01-20"},
+        {"date_from": "2024-02-01", "date_to": "2024-01-01"},
+        {"source": "daily nation", "tags": ["corruption"], "date_from": "2024-01-01"},
+        {"source": "Reuters", "tags": ["health"]},
+    ])
+    def test_filters_match_linear_scan(self, service, filters):
+        """Test that indexed lookups return the same articles, in order, as a linear scan."""
+        ids = [article.id for article in service.get_articles(**filters)]
+
+        assert ids == brute_force_ids(service, **filters)
+
+    def test_invalid_date_bound_is_ignored(self, service):
+        """Test that a malformed date bound is ignored rather than filtering everything."""
+        articles = service.get_articles(date_from="invalid-date", date_to="2024-01-18")
+
+        assert [article.id for article in articles] == [1, 4]
+
+    def test_source_lookup_is_case_insensitive(self, service):
+        """Test that source names are matched case-insensitively."""
+        articles = service.get_articles(source="daily NATION")
+
+        assert [article.id for article in articles] == [1, 3]
+
+
+class TestDataServiceLoading:
+    """Test cases for loading and tagging the corpus."""
+
+    def test_parallel_tagging_matches_serial(self, tmp_path):
+        """Test that tagging in a process pool gives the same articles and indexes in the same order."""
+        articles = [dict(a, id=str(i)) for i, a in enumerate(SAMPLE_ARTICLES * 5)]
+        data_file = write_articles(tmp_path / "articles.json", articles)
+
+        serial = DataService(data_file)
+        parallel = DataService(data_file, tag_workers=2, tag_chunk_size=3)
+
+        assert [a.model_dump() for a in parallel.articles] == [a.model_dump() for a in serial.articles]
+        # Word counts and signatures are computed in the workers too
+        assert parallel.search_articles("election").positions == serial.search_articles("election").positions
+        assert parallel.corpus.dedup.canonical == serial.corpus.dedup.canonical
+
+    def test_loads_json_lines(self, tmp_path):
+        """Test that a newline-delimited JSON data file is loaded like a JSON array."""
+        path = tmp_path / "articles.jsonl"
+        path.write_text("\n".join(json.dumps(a) for a in SAMPLE_ARTICLES), encoding='utf-8')
+
+        from_lines = DataService(str(path))
+        from_array = DataService(write_articles(tmp_path / "articles.json", SAMPLE_ARTICLES))
+
+        assert [a.model_dump() for a in from_lines.articles] == [a.model_dump() for a in from_array.articles]
+
+    def test_malformed_dates_reported_at_load(self, tmp_path, capsys):
+        """Test that malformed article dates are reported once and excluded from date filters."""
+        articles = SAMPLE_ARTICLES + [dict(SAMPLE_ARTICLES[0], id="5", date="15/01/2024")]
+        service = DataService(write_articles(tmp_path / "articles.json", articles))
+
+        assert "malformed dates" in capsys.readouterr().out
+        assert service.index.malformed_dates == [5]
+        assert 5 not in [a.id for a in service.get_articles(date_from="2024-01-01")]
+        assert 5 in [a.id for a in service.get_articles()]
+
+    def test_deferred_load_reports_status(self, tmp_path):
+        """Test that a service created with load=False is empty and not ready until load()."""
+        service = DataService(write_articles(tmp_path / "articles.json", SAMPLE_ARTICLES), load=False)
+
+        assert not service.ready
+        assert service.load_status()["status"] == "loading"
+        assert len(service.articles) == 0
+
+        assert service.load()
+        assert service.ready
+        assert service.load_status()["articles"] == len(SAMPLE_ARTICLES)
+        assert service.corpus.version == 0
+
+    def test_unpadded_dates_are_accepted(self, tmp_path):
+        """Test that dates without zero padding are parsed like strptime does."""
+        articles = [dict(SAMPLE_ARTICLES[0], date="2024-1-5")]
+        service = DataService(write_articles(tmp_path / "articles.json", articles))
+
+        assert len(service.get_articles(date_from="2024-01-05", date_to="2024-01-05")) == 1
+
+
+class TestDataServiceReload:
+    """Test cases for reloading the corpus while it is being served."""
+
+    def test_reload_swaps_in_new_articles(self, service):
+        """Test that a reload picks up changes to the data file and bumps the version."""
+        articles = SAMPLE_ARTICLES + [dict(SAMPLE_ARTICLES[1], id="5")]
+        write_articles(service.data_file, articles)
+
+        assert service.reload()
+        assert service.corpus.version == 1
+        assert [a.id for a in service.get_articles()] == [1, 2, 3, 4, 5]
+        assert service.get_stats()["total_articles"] == 5
+
+    def test_page_renders_from_its_own_corpus(self, service):
+        """Test that a page queried before a reload still renders the articles it matched."""
+        page = service.query_articles(source="Reuters")
+        write_articles(service.data_file, [dict(SAMPLE_ARTICLES[0], id="9")])
+        service.reload()
+
+        assert [row["id"] for row in json.loads(service.render_articles(page))] == [4]
+        assert [a.id for a in service.get_articles()] == [9]
+
+    def test_failed_reload_keeps_current_corpus(self, service, capsys):
+        """Test that a data file that fails to load does not replace the corpus."""
+        with open(service.data_file, 'w', encoding='utf-8') as f:
+            f.write('[{"id": "1", "title": ')
+        corpus = service.corpus
+
+        assert not service.reload()
+        assert service.corpus is corpus
+        assert "keeping the current corpus" in capsys.readouterr().out
+
+
+class TestDataServiceAddArticles:
+    """Test cases for adding articles to a loaded corpus."""
+
+    def test_added_articles_match_a_full_load(self, service, tmp_path):
+        """Test that adding a batch indexes it exactly like loading it from the file."""
+        batch = [
+            dict(SAMPLE_ARTICLES[0], id="5", date="2024-01-16"),
+            dict(SAMPLE_ARTICLES[2], id="6", date="2023-12-01"),
+            dict(SAMPLE_ARTICLES[1], id="7", date="bad-date")
+        ]
+        assert service.add_articles(batch) == 3
+
+        loaded = DataService(write_articles(tmp_path / "all.json", SAMPLE_ARTICLES + batch))
+        for filters in ({}, {"tags": ["elections"]}, {"source": "daily nation"},
+                        {"date_from": "2024-01-16"}, {"date_to": "2024-01-16"}):
+            assert service.get_articles(**filters) == loaded.get_articles(**filters)
+        assert service.get_stats(breakdowns=True) == loaded.get_stats(breakdowns=True)
+        assert service.corpus.version == 1
+
+    def test_back_dated_articles_are_found_before_and_after_merging(self, service, monkeypatch):
+        """Test that date filters see older added articles, kept aside or merged in."""
+        from src import indexes
+
+        monkeypatch.setattr(indexes, "MAX_LATE_DATES", 3)
+        index = service.corpus.index
+        dates = ["2024-01-17", "2023-12-01", "2024-01-15", "2024-03-01", "2024-01-17", "2024-01-01"]
+        for i, value in enumerate(dates):
+            service.add_articles([dict(SAMPLE_ARTICLES[i % 4], id=str(5 + i), date=value)])
+            if i == 2:
+                assert len(index.late_keys) == 0
+                assert list(index.date_keys) == sorted(index.date_keys)
+
+        assert len(index.late_keys) == 2
+        for filters in ({"date_from": "2024-01-15"}, {"date_to": "2024-01-17"},
+                        {"date_from": "2024-01-01", "date_to": "2024-01-18"},
+                        {"date_from": "2023-12-01", "tags": ["elections"]}):
+            assert [a.id for a in service.get_articles(**filters)] == brute_force_ids(service, **filters)
+
+    def test_invalid_batch_changes_nothing(self, service):
+        """Test that a batch with an invalid record is rejected as a whole."""
+        batch = [dict(SAMPLE_ARTICLES[0], id="5"), dict(SAMPLE_ARTICLES[0], id="x")]
+
+        with pytest.raises(ValueError):
+            service.add_articles(batch)
+        assert len(service.articles) == len(SAMPLE_ARTICLES)
+        assert service.corpus.version == 0
+
+    def test_added_articles_are_memory_only_without_a_journal(self, service):
+        """Test that a reload drops added articles when no journal is configured."""
+        service.add_articles([dict(SAMPLE_ARTICLES[0], id="5")])
+
+        assert service.reload()
+        assert [a.id for a in service.articles] == [1, 2, 3, 4]
+
+
+class TestDataServiceJournal:
+    """Test cases for persisting added articles to a journal."""
+
+    def make_service(self, tmp_path, **kwargs):
+        data_file = tmp_path / "articles.json"
+        if not data_file.exists():
+            write_articles(data_file, SAMPLE_ARTICLES)
+        return DataService(str(data_file), journal_file=str(tmp_path / "articles.journal"), **kwargs)
+
+    def test_added_articles_survive_restart_and_reload(self, tmp_path):
+        """Test that batches are replayed from the journal on load and reload."""
+        service = self.make_service(tmp_path)
+        service.add_articles([dict(SAMPLE_ARTICLES[0], id="5", date="2023-12-01")])
+        service.add_articles([dict(SAMPLE_ARTICLES[1], id="6")])
+
+        restarted = self.make_service(tmp_path)
+        assert [a.id for a in restarted.articles] == [1, 2, 3, 4, 5, 6]
+        assert restarted.get_articles(date_to="2023-12-31")[0].id == 5
+        assert restarted.get_stats() == service.get_stats()
+
+        assert service.reload()
+        assert [a.id for a in service.articles] == [1, 2, 3, 4, 5, 6]
+
+    def test_workers_share_batches(self, tmp_path):
+        """Test that services sharing a journal pick up each other's batches."""
+        first = self.make_service(tmp_path)
+        second = self.make_service(tmp_path)
+
+        first.add_articles([dict(SAMPLE_ARTICLES[0], id="5")])
+        assert second.sync_journal() == 1
+        assert second.sync_journal() == 0
+        second.add_articles([dict(SAMPLE_ARTICLES[1], id="6")])
+        first.add_articles([dict(SAMPLE_ARTICLES[2], id="7")])
+
+        assert [a.id for a in first.articles] == [1, 2, 3, 4, 5, 6, 7]
+        assert second.sync_journal() == 1
+        assert [a.id for a in second.articles] == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_journal_is_written_without_the_write_lock(self, tmp_path):
+        """Test that queries are not blocked by the journal write, and a sync meanwhile adds the batch once."""
+        service = self.make_service(tmp_path)
+        append = service.journal.append
+
+        def append_and_sync(records):
+            assert service._write_lock.acquire(blocking=False)
+            service._write_lock.release()
+            size = append(records)
+            assert service.sync_journal() == 1
+            return size
+
+        service.journal.append = append_and_sync
+        assert service.add_articles([dict(SAMPLE_ARTICLES[0], id="5")]) == 1
+
+        assert [a.id for a in service.articles] == [1, 2, 3, 4, 5]
+        assert service.sync_journal() == 0
+
+    def test_line_cut_short_is_skipped(self, tmp_path, capsys):
+        """Test that a batch cut short by a crash neither breaks loading nor the next batch."""
+        journal = tmp_path / "articles.journal"
+        journal.write_text(json.dumps(dict(SAMPLE_ARTICLES[0], id="5")) + '\n{"id": "6", "tit')
+        service = self.make_service(tmp_path)
+        assert [a.id for a in service.articles] == [1, 2, 3, 4, 5]
+
+        service.add_articles([dict(SAMPLE_ARTICLES[1], id="7")])
+
+        restarted = self.make_service(tmp_path)
+        assert [a.id for a in restarted.articles] == [1, 2, 3, 4, 5, 7]
+        assert "malformed line" in capsys.readouterr().out
+
+    def test_invalid_batch_is_not_written(self, tmp_path):
+        """Test that a rejected batch leaves the journal unchanged."""
+        service = self.make_service(tmp_path)
+
+        with pytest.raises(ValueError):
+            service.add_articles([dict(SAMPLE_ARTICLES[0], id="x")])
+        assert not (tmp_path / "articles.journal").exists()
+
+    @pytest.mark.parametrize("record", [
+        dict(SAMPLE_ARTICLES[0], id=str(2**63)),
+        dict(SAMPLE_ARTICLES[0], id="5", title="\ud800"),
+    ])
+    def test_row_the_store_rejects_is_not_written(self, tmp_path, record):
+        """Test that a batch is checked against the store before it is journaled."""
+        service = self.make_service(tmp_path)
+
+        with pytest.raises(ValueError):
+            service.add_articles([dict(SAMPLE_ARTICLES[1], id="6"), record])
+        assert not (tmp_path / "articles.journal").exists()
+        assert len(service.articles) == len(SAMPLE_ARTICLES)
+
+    def test_row_the_store_rejects_is_skipped(self, tmp_path, capsys):
+        """Test that a journaled article the store rejects is skipped on load and sync."""
+        lines = [
+            json.dumps(dict(SAMPLE_ARTICLES[0], id="5")),
+            json.dumps(dict(SAMPLE_ARTICLES[0], id=str(2**63))),
+            json.dumps(dict(SAMPLE_ARTICLES[1], id="6")),
+        ]
+        (tmp_path / "articles.journal").write_text("\n".join(lines) + "\n")
+        service = self.make_service(tmp_path)
+        second = self.make_service(tmp_path)
+        assert [a.id for a in service.articles] == [1, 2, 3, 4, 5, 6]
+        assert "does not fit" in capsys.readouterr().out
+
+        with open(tmp_path / "articles.journal", 'a') as f:
+            f.write(json.dumps(dict(SAMPLE_ARTICLES[2], id=str(-2**63 - 1))) + "\n")
+            f.write(json.dumps(dict(SAMPLE_ARTICLES[2], id="7")) + "\n")
+        assert second.sync_journal() == 1
+        assert [a.id for a in second.articles] == [1, 2, 3, 4, 5, 6, 7]
+
+
+class TestDataServiceDuplicates:
+    """Test cases for near-duplicate detection."""
+
+    @pytest.fixture
+    def syndicated(self, service):
+        """Add wire copies of the first article from other sources."""
+        service.add_articles([
+            dict(SAMPLE_ARTICLES[0], id="5", source="Reuters", date="2024-01-16"),
+            dict(SAMPLE_ARTICLES[1], id="6", date="2024-02-02"),
+            dict(SAMPLE_ARTICLES[0], id="7", source="The Guardian", date="2024-02-03"),
+        ])
+        return service
+
+    def test_copies_are_grouped_under_the_first_article(self, syndicated):
+        """Test that copies join the group of the earliest added article."""
+        assert syndicated.corpus.dedup.group(6) == [0, 4, 6]
+        assert syndicated.corpus.dedup.group(5) == [1, 5]
+        assert syndicated.corpus.dedup.group(2) == [2]
+
+    def test_dedupe_returns_one_article_per_group(self, syndicated):
+        """Test that deduplicated pages skip copies and list their ids."""
+        page = syndicated.query_articles(dedupe=True)
+        assert list(page.positions) == [0, 1, 2, 3]
+        rows = json.loads(syndicated.render_articles(page, fields=["id"]))
+        assert rows[0] == {"id": 1, "duplicate_ids": [5, 7]}
+        assert rows[2] == {"id": 3, "duplicate_ids": []}
+
+        # The first matching copy stands in for its group
+        page = syndicated.query_articles(source="Reuters", dedupe=True)
+        assert [syndicated.articles[p].id for p in page.positions] == [4, 5]
+        assert syndicated.query_articles(date_from="2024-02-02", dedupe=True).total == 2
+
+    def test_dedupe_while_copies_are_added(self, syndicated):
+        """Test that deduplicated pages can be read while added articles form new groups."""
+        rng = random.Random(9)
+        words = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=6)) for _ in range(2000)]
+        done = threading.Event()
+        errors = []
+
+        def add_stories():
+            try:
+                for i in range(200):
+                    story = {"title": f"Story {i}", "body": " ".join(rng.sample(words, 40)), "date": "2024-03-01"}
+                    syndicated.add_articles([
+                        dict(story, id=str(100 + 2 * i), source="Reuters"),
+                        dict(story, id=str(101 + 2 * i), source="The Guardian")
+                    ])
+            except Exception as e:
+                errors.append(e)
+            finally:
+                done.set()
+
+        # Switch threads often, so reads overlap with the groups being changed
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        thread = threading.Thread(target=add_stories)
+        thread.start()
+        try:
+            while not done.is_set():
+                page = syndicated.query_articles(dedupe=True)
+                rows = json.loads(syndicated.render_articles(page, fields=["id"]))
+                assert [row["id"] for row in rows[:4]] == [1, 2, 3, 4]
+        finally:
+            thread.join()
+            sys.setswitchinterval(interval)
+        assert errors == []
+        assert syndicated.query_articles(dedupe=True).total == 4 + 200
+
+    def test_stats_count_duplicates(self, syndicated):
+        """Test that stats report duplicates and can leave them out."""
+        stats = syndicated.get_stats()
+        assert stats["total_articles"] == 7
+        assert stats["duplicates"] == 3
+
+        unique = syndicated.get_stats(dedupe=True)
+        assert unique["total_articles"] == 4
+        assert unique["sources"] == {"Daily Nation": 1, "daily nation": 1, "The Guardian": 1, "Reuters": 1}
+
+
+class TestDataServiceSearch:
+    """Test cases for full-text search in DataService."""
+
+    def test_search_combines_with_filters(self, service):
+        """Test that search results are restricted by the source, tag and date filters."""
+        assert service.search_articles("election").positions == [0, 2]
+        assert service.search_articles("election", source="Daily Nation", date_to="2024-01-31").positions == [0]
+        assert service.search_articles("election", tags=["corruption"]).total == 1
+
+    def test_phrase_search_checks_word_order(self, service):
+        """Test that a phrase only matches its words in order."""
+        assert service.search_articles('"new hospital"').total == 1
+        assert service.search_articles('"hospital new"').total == 0
+
+    def test_added_articles_are_searchable(self, service):
+        """Test that articles added in a batch are indexed for search."""
+        service.add_articles([dict(SAMPLE_ARTICLES[3], id="5", body="Flooding closes the hospital.")])
+
+        page = service.search_articles("hospital")
+        assert sorted(service.articles[p].id for p in page.positions) == [2, 5]
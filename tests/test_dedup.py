@@ -0,0 +1,159 @@
+import os
+import random
+import subprocess
+import sys
+import zlib
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.dedup import BANDS, BINS, BUCKET_BITS, MIN_SIMILARITY, DuplicateIndex, signature, similarity
+from src.search import tokenize
+
+
+def make_words(count, seed):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9)))
+        for _ in range(count)
+    ]
+
+
+def reference_minimums(tokens):
+    """Smallest shingle hash per bin, by scanning every shingle, None for empty bins."""
+    hashes = [zlib.crc32(token.encode()) for token in tokens]
+    minimums = [None] * BINS
+    for shingle in zip(hashes, hashes[1:], hashes[2:]):
+        value = hash(shingle)
+        i = (value + 2 ** 63) * BINS >> 64
+        if minimums[i] is None or value < minimums[i]:
+            minimums[i] = value
+    return minimums
+
+
+class TestSignature:
+    """Test cases for MinHash signatures."""
+
+    def test_bins_hold_the_smallest_shingle_hash(self):
+        """Test that sorting and bisecting finds the minimum of every bin."""
+        for length in (40, 100, 700):
+            words = make_words(length, seed=length)
+            minimums = reference_minimums(words)
+            expected = [value & 0xFF for value in minimums if value is not None]
+            assert [
+                value for value, minimum in zip(signature(words), minimums) if minimum is not None
+            ] == expected
+
+    def test_near_copies_are_similar_and_different_texts_not(self):
+        """Test that small edits and new headlines keep most bins and unrelated texts keep none."""
+        text = make_words(150, seed=2)
+        edited = text[:70] + ["breaking"] + text[70:140]
+        retitled = make_words(10, seed=3) + text[10:]
+        other = make_words(150, seed=4)
+
+        assert similarity(signature(text), signature(edited)) >= MIN_SIMILARITY
+        assert similarity(signature(text), signature(retitled)) >= MIN_SIMILARITY
+        assert similarity(signature(text), signature(other)) < 0.25
+
+    def test_short_and_empty_texts(self):
+        """Test that texts too short to fill every bin still get a full signature."""
+        assert len(signature(["word"])) == BINS
+        assert signature(["two", "words"]) == signature(["two", "words"])
+        assert signature(["two", "words"]) != signature(["other", "words"])
+        assert signature([]) is None
+
+    def test_stable_across_processes(self):
+        """Test that signatures do not depend on hash randomization, so snapshots can keep them."""
+        tokens = tokenize("Parliament debates the county budget for the new hospital")
+        code = (
+            "import sys; sys.path.insert(0, '.');"
+            "from src.dedup import signature; from src.search import tokenize;"
+            "print(signature(tokenize('Parliament debates the county budget for the new hospital')).hex())"
+        )
+        root = os.path.join(os.path.dirname(__file__), '..')
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONHASHSEED": "12345"}
+        ).stdout
+        assert bytes.fromhex(output) == signature(tokens)
+
+
+def changed(value, bins, rng):
+    """A copy of a signature with the given bins set to other values."""
+    result = bytearray(value)
+    for i in bins:
+        result[i] = (result[i] + rng.randrange(1, 256)) & 0xFF
+    return bytes(result)
+
+
+class TestDuplicateIndex:
+    """Test cases for grouping near-duplicates."""
+
+    def build(self, fingerprints):
+        index = DuplicateIndex()
+        for position, value in enumerate(fingerprints):
+            index.add(position, value)
+        return index
+
+    def test_groups_under_the_earliest_canonical_article(self):
+        """Test that similar signatures join the group of the first article they match."""
+        rng = random.Random(3)
+        base = bytes(range(BINS))
+        index = self.build([
+            base,
+            changed(base, range(8), rng),         # 24 of 32 bins equal: duplicate of 0
+            bytes(rng.randrange(256) for _ in range(BINS)),
+            changed(base, range(0, 18, 2), rng),  # 23 of 32: not a duplicate
+            None,
+            changed(base, [17], rng),             # duplicate of 0
+        ])
+
+        assert index.canonical == {1: 0, 5: 0}
+        assert index.group(5) == [0, 1, 5]
+        assert index.group(3) == [3]
+        assert index.duplicates == 2
+
+    def test_chain_heads_are_allocated_by_the_first_signature(self):
+        """Test that an index holds no chain heads until an article with words is added."""
+        index = DuplicateIndex()
+        assert len(index.heads) == 0
+        assert index.find(bytes(BINS)) is None
+
+        index.add(0, None)
+        assert len(index.heads) == 0
+        index.add(1, bytes(BINS))
+        assert len(index.heads) == BANDS << BUCKET_BITS
+
+    def test_finds_pairs_differing_in_fewer_bins_than_bands(self):
+        """Test that the band lookup misses no pair that leaves one band unchanged."""
+        rng = random.Random(4)
+        originals = [bytes(rng.randrange(256) for _ in range(BINS)) for _ in range(500)]
+        copies = [changed(value, rng.sample(range(BINS), 7), rng) for value in originals]
+        index = self.build(originals + copies)
+
+        assert index.canonical == {len(originals) + i: i for i in range(len(originals))}
+
+    def test_collapse_keeps_the_first_match_of_each_group(self):
+        """Test that both collapse strategies keep the first matching article per group."""
+        rng = random.Random(5)
+        values = []
+        for _ in range(300):
+            if values and rng.random() < 0.3:
+                values.append(changed(rng.choice(values), [rng.randrange(BINS)], rng))
+            else:
+                values.append(bytes(rng.randrange(256) for _ in range(BINS)))
+        index = self.build(values)
+
+        def expected(positions):
+            seen = set()
+            kept = []
+            for position in positions:
+                group = index.canonical.get(position, position)
+                if group not in seen:
+                    seen.add(group)
+                    kept.append(position)
+            return kept
+
+        # Few matches, many matches, and every article
+        for positions in (sorted(rng.sample(range(300), 20)), sorted(rng.sample(range(300), 250)), range(300)):
+            assert list(index.collapse(positions)) == expected(positions)
@@ -0,0 +1,70 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.executor import Overloaded, QueryExecutor
+
+
+class TestQueryExecutor:
+    """Test cases for the bounded query pool."""
+
+    def test_runs_work_in_a_pool_thread(self):
+        """Test that work runs off the event loop thread and returns its result."""
+        executor = QueryExecutor(workers=2)
+
+        async def main():
+            return await executor.run(lambda x: (x * 2, threading.current_thread()), 21)
+
+        result, thread = asyncio.run(main())
+        executor.shutdown()
+
+        assert result == 42
+        assert thread is not threading.main_thread()
+        assert executor.metrics()["completed"] == 1
+
+    def test_full_pool_rejects_new_work(self):
+        """Test that work beyond the workers and queue is rejected, not queued."""
+        executor = QueryExecutor(workers=1, max_queue=1)
+        release = threading.Event()
+
+        async def main():
+            running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            with pytest.raises(Overloaded):
+                await executor.run(lambda: None)
+            release.set()
+            await asyncio.gather(*running)
+            # Room frees up once the pending work finishes
+            return await executor.run(lambda: "ok")
+
+        assert asyncio.run(main()) == "ok"
+        executor.shutdown()
+        assert executor.metrics()["rejected"] == 1
+        assert executor.metrics()["pending"] == 0
+
+    def test_errors_are_raised_to_the_caller(self):
+        """Test that an exception from the work reaches the awaiting request."""
+        executor = QueryExecutor(workers=1)
+
+        async def main():
+            await executor.run(int, "not a number")
+
+        with pytest.raises(ValueError):
+            asyncio.run(main())
+        executor.shutdown()
+        assert executor.metrics()["pending"] == 0
+
+    def test_zero_workers_runs_inline(self):
+        """Test that workers=0 runs work on the event loop thread."""
+        executor = QueryExecutor(workers=0)
+
+        async def main():
+            return await executor.run(threading.current_thread)
+
+        assert asyncio.run(main()) is threading.main_thread()
@@ -0,0 +1,49 @@
+import os
+import sys
+from collections import Counter
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+@pytest.fixture
+def articles(articles):
+    """Sample articles with one malformed date among them."""
+    return articles + [dict(articles[1], id="5", date="not-a-date")]
+
+
+class TestFacets:
+    """Test cases for facet counts over filtered articles."""
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"source": "daily nation"},
+        {"tags": ["elections", "health"]},
+        {"date_from": "2024-01-16", "date_to": "2024-01-31"},
+    ])
+    def test_counts_match_filtered_articles(self, service, filters):
+        """Test that facets count exactly the articles /articles would return."""
+        articles = service.get_articles(**filters)
+
+        facets = service.get_facets(**filters)
+
+        assert facets["total"] == len(articles)
+        assert facets["tags"] == dict(Counter(t for a in articles for t in a.tags))
+        assert facets["sources"] == dict(Counter(a.source for a in articles))
+        assert facets["dates"] == dict(Counter(a.date for a in articles if a.date != "not-a-date"))
+
+    def test_counts_are_ordered(self, service):
+        """Test that tags and sources are ordered by count and dates by date."""
+        facets = service.get_facets()
+
+        assert list(facets["sources"].values()) == sorted(facets["sources"].values(), reverse=True)
+        assert list(facets["dates"]) == sorted(facets["dates"])
+
+    def test_monthly_histogram(self, service):
+        """Test that dates are bucketed by month, leaving out malformed dates."""
+        facets = service.get_facets(interval="month")
+
+        assert facets["dates"] == {"2024-01": 3, "2024-02": 1}
+        assert facets["total"] == 5
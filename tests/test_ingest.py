@@ -0,0 +1,63 @@
+import pytest
+import json
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.ingest import iter_records
+
+
+RECORDS = [
+    {"id": "1", "title": "Election Day", "body": "Voters [queue] early, \"again\".", "source": "A", "date": "2024-01-01"},
+    {"id": "2", "title": "Hospital", "body": "", "source": "B", "date": "2024-01-02", "score": 1.5e10},
+    {"id": "3", "title": "Budget", "body": "Numbers: 12345678901234567890", "source": "C", "date": "2024-01-03"}
+]
+
+
+class TestIterRecords:
+    """Test cases for streaming record ingestion."""
+
+    @pytest.mark.parametrize("read_size", [1, 7, 64 * 1024])
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_json_array(self, tmp_path, read_size, indent):
+        """Test that a JSON array is decoded element by element."""
+        path = tmp_path / "articles.json"
+        path.write_text(json.dumps(RECORDS, indent=indent), encoding="utf-8")
+
+        assert list(iter_records(str(path), read_size=read_size)) == RECORDS
+
+    @pytest.mark.parametrize("read_size", [1, 7, 64 * 1024])
+    def test_json_lines(self, tmp_path, read_size):
+        """Test that newline-delimited JSON is accepted, ignoring blank lines."""
+        path = tmp_path / "articles.jsonl"
+        path.write_text("\n\n".join(json.dumps(r) for r in RECORDS) + "\n", encoding="utf-8")
+
+        assert list(iter_records(str(path), read_size=read_size)) == RECORDS
+
+    @pytest.mark.parametrize("read_size", [7, 64 * 1024])
+    def test_json_lines_with_unicode_line_separators(self, tmp_path, read_size):
+        """Test that raw U+2028, U+2029 and U+0085 inside strings do not split a line."""
+        records = [dict(RECORDS[0], body="One\u2028two\u2029three\x85four"), RECORDS[1]]
+        path = tmp_path / "articles.jsonl"
+        path.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in records), encoding="utf-8")
+
+        assert list(iter_records(str(path), read_size=read_size)) == records
+
+    @pytest.mark.parametrize("content", ["", "[]", "  [ ]  "])
+    def test_empty_files(self, tmp_path, content):
+        """Test that empty files and arrays yield no records."""
+        path = tmp_path / "articles.json"
+        path.write_text(content, encoding="utf-8")
+
+        assert list(iter_records(str(path))) == []
+
+    @pytest.mark.parametrize("content", ['[{"id": "1"}', '[{"id": "1"} {"id": "2"}]', '[{"id": }]'])
+    def test_malformed_array(self, tmp_path, content):
+        """Test that malformed arrays raise a JSONDecodeError."""
+        path = tmp_path / "articles.json"
+        path.write_text(content, encoding="utf-8")
+
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_records(str(path), read_size=4))
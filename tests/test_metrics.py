@@ -0,0 +1,80 @@
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.metrics import Counter, Gauge, Histogram, Registry
+
+
+class TestMetrics:
+    """Test cases for metrics and their Prometheus text rendering."""
+
+    def test_counter_renders_labelled_series(self):
+        """Test that counters sum increments per label set."""
+        registry = Registry()
+        requests = Counter("requests_total", "Requests", ["route"], registry=registry)
+        requests.inc("/a")
+        requests.inc("/a", amount=2)
+        requests.inc("/b")
+
+        assert registry.render().splitlines() == [
+            "# HELP requests_total Requests",
+            "# TYPE requests_total counter",
+            'requests_total{route="/a"} 3',
+            'requests_total{route="/b"} 1',
+        ]
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram buckets count every observation at or below their bound."""
+        registry = Registry()
+        latency = Histogram("latency_seconds", "Latency", ["stage"], buckets=(0.1, 1.0), registry=registry)
+        for value in (0.05, 0.1, 0.5, 2.0):
+            latency.observe(value, "load")
+
+        lines = registry.render().splitlines()
+        assert lines[2:] == [
+            'latency_seconds_bucket{stage="load",le="0.1"} 2',
+            'latency_seconds_bucket{stage="load",le="1.0"} 3',
+            'latency_seconds_bucket{stage="load",le="+Inf"} 4',
+            'latency_seconds_sum{stage="load"} 2.65',
+            'latency_seconds_count{stage="load"} 4',
+        ]
+        assert latency.count("load") == 4
+
+    def test_timer_observes_block(self):
+        """Test that Histogram.time() records one observation per block."""
+        registry = Registry()
+        latency = Histogram("latency_seconds", "Latency", ["stage"], registry=registry)
+        with latency.time("tagging"):
+            pass
+
+        assert latency.count("tagging") == 1
+
+    def test_function_metrics_are_read_at_render_time(self):
+        """Test that metrics backed by a function report its current value."""
+        registry = Registry()
+        size = {"bytes": 10}
+        Gauge("cache_bytes", "Cache size", function=lambda: size["bytes"], registry=registry)
+        size["bytes"] = 42
+
+        assert "cache_bytes 42" in registry.render().splitlines()
+
+    def test_disabled_registry_skips_observations(self):
+        """Test that nothing is recorded while the registry is disabled."""
+        registry = Registry()
+        registry.enabled = False
+        requests = Counter("requests_total", "Requests", registry=registry)
+        latency = Histogram("latency_seconds", "Latency", registry=registry)
+        requests.inc()
+        latency.observe(1.0)
+
+        assert "requests_total 1" not in registry.render()
+        assert latency.count() == 0
+
+    def test_label_values_are_escaped(self):
+        """Test that quotes and backslashes in label values are escaped."""
+        registry = Registry()
+        Counter("odd_total", "Odd labels", ["name"], registry=registry).inc('a "b" \\c')
+
+        assert 'odd_total{name="a \\"b\\" \\\\c"} 1' in registry.render()
@@ -0,0 +1,114 @@
+import cProfile
+import os
+import sys
+import threading
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.profiler import Profiler
+
+
+def busy_loop(stop):
+    total = 0
+    while not stop.is_set():
+        total += sum(range(100))
+    return total
+
+
+def tag_many(count):
+    return [sum(range(1000)) for _ in range(count)]
+
+
+class TestProfiler:
+    """Test cases for the on-demand profiler."""
+
+    def test_sampling_records_busy_threads(self):
+        """Test that sample mode records the stacks of running threads, named by thread."""
+        profiler = Profiler()
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="busy-worker")
+        worker.start()
+        try:
+            session = profiler.start(mode="sample", seconds=0.2, interval=0.002)
+            while not session.done():
+                stop.wait(0.01)
+        finally:
+            profiler.stop()
+            stop.set()
+            worker.join()
+
+        assert session.samples > 0
+        collapsed = session.collapsed()
+        assert any(
+            line.startswith("busy-worker;") and "busy_loop (test_profiler.py" in line
+            for line in collapsed.splitlines()
+        )
+
+    def test_cprofile_profiles_wrapped_calls_up_to_the_limit(self):
+        """Test that cprofile mode profiles the next N wrapped calls and then stops counting."""
+        profiler = Profiler()
+        session = profiler.start(mode="cprofile", calls=2)
+
+        for _ in range(3):
+            assert profiler.wrap(tag_many)(10) == [499500] * 10
+        profiler.stop()
+
+        assert session.done()
+        assert session.completed == 2
+        assert len(session.profiles) == 2
+        assert "tag_many" in session.stats_text()
+        assert session.stats_dump()
+
+    def test_overlapping_calls_are_profiled_one_at_a_time(self):
+        """Test that a call made while another is profiled runs unprofiled and uncounted."""
+        profiler = Profiler()
+        session = profiler.start(mode="cprofile", calls=5)
+
+        def outer():
+            return profiler.wrap(tag_many)(10)
+
+        assert profiler.wrap(outer)() == [499500] * 10
+        profiler.stop()
+
+        assert session.completed == 1
+        assert len(session.profiles) == 1
+
+    def test_profiler_errors_do_not_fail_the_query(self, monkeypatch, capsys):
+        """Test that a call still runs when cProfile cannot be enabled."""
+        from src import profiler as profiler_module
+
+        class Busy(cProfile.Profile):
+            def enable(self):
+                raise ValueError("Another profiling tool is already active")
+
+        monkeypatch.setattr(profiler_module.cProfile, "Profile", Busy)
+        profiler = Profiler()
+        session = profiler.start(mode="cprofile", calls=2)
+
+        assert profiler.wrap(tag_many)(10) == [499500] * 10
+        assert profiler.wrap(tag_many)(10) == [499500] * 10
+        profiler.stop()
+
+        assert session.completed == 0
+        assert "could not start profiling" in capsys.readouterr().out
+
+    def test_wrap_is_a_no_op_without_a_session(self):
+        """Test that queries are not wrapped while no session is running."""
+        assert Profiler().wrap(tag_many) is tag_many
+
+    def test_one_session_at_a_time(self):
+        """Test that a second session cannot start while one is running."""
+        profiler = Profiler()
+        profiler.start(mode="cprofile", seconds=5)
+        try:
+            with pytest.raises(RuntimeError):
+                profiler.start(mode="sample")
+        finally:
+            profiler.stop()
+
+        with pytest.raises(ValueError):
+            profiler.start(mode="tracemalloc")
+        assert profiler.session is None
@@ -0,0 +1,59 @@
+import os
+import sys
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_service import DataService
+from src.reloader import FileReloader
+from tests.samples import SAMPLE_ARTICLES, write_articles
+
+
+class TestFileReloader:
+    """Test cases for watching the data file for changes."""
+
+    def test_unchanged_file_is_not_reloaded(self, service):
+        """Test that polling an unchanged file keeps the current corpus."""
+        reloader = FileReloader(service)
+        corpus = service.corpus
+
+        assert not reloader.check()
+        assert service.corpus is corpus
+
+    def test_replaced_file_is_reloaded(self, service, tmp_path):
+        """Test that a data file renamed into place is picked up."""
+        reloader = FileReloader(service)
+        new_file = write_articles(tmp_path / "new.json", SAMPLE_ARTICLES[:2])
+        os.replace(new_file, service.data_file)
+
+        assert reloader.check()
+        assert [a.id for a in service.get_articles()] == [1, 2]
+        assert not reloader.check()
+
+    def test_poll_picks_up_journal_batches(self, tmp_path):
+        """Test that polling an unchanged file adds batches other workers journaled."""
+        data_file = write_articles(tmp_path / "articles.json", SAMPLE_ARTICLES)
+        journal_file = str(tmp_path / "articles.journal")
+        service = DataService(data_file, journal_file=journal_file)
+        other = DataService(data_file, journal_file=journal_file)
+        reloader = FileReloader(service)
+        other.add_articles([dict(SAMPLE_ARTICLES[0], id="5")])
+
+        assert not reloader.check()
+        assert [a.id for a in service.get_articles()] == [1, 2, 3, 4, 5]
+
+    def test_background_thread_reloads(self, service, tmp_path):
+        """Test that the polling thread swaps in a changed file."""
+        reloader = FileReloader(service, interval=0.01)
+        reloader.start()
+        try:
+            os.replace(write_articles(tmp_path / "new.json", SAMPLE_ARTICLES[:1]), service.data_file)
+            for _ in range(500):
+                if service.corpus.version:
+                    break
+                reloader._stop.wait(0.01)
+        finally:
+            reloader.stop()
+
+        assert service.corpus.version == 1
+        assert service.get_stats()["total_articles"] == 1
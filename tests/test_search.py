@@ -0,0 +1,153 @@
+import os
+import random
+import sys
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.corpus import analyze
+from src.search import BLOCK_SIZE, SearchIndex, parse_query, tokenize
+
+
+WORDS = ["election", "health", "budget", "county", "hospital", "vote", "new", "report"]
+
+
+def make_docs(count, seed=7):
+    """Generate (title, body) pairs from a small vocabulary."""
+    rng = random.Random(seed)
+    return [
+        (" ".join(rng.choices(WORDS, k=3)), " ".join(rng.choices(WORDS, k=rng.randint(0, 20))))
+        for _ in range(count)
+    ]
+
+
+def build(docs):
+    """Index (title, body) pairs at consecutive positions."""
+    index = SearchIndex()
+    for position, (title, body) in enumerate(docs):
+        index.add(position, analyze(title, body)[0])
+    return index
+
+
+@pytest.fixture(scope="module")
+def docs():
+    # Enough documents for every term to fill several packed blocks
+    return make_docs(BLOCK_SIZE * 12)
+
+
+@pytest.fixture(scope="module")
+def index(docs):
+    return build(docs)
+
+
+def brute_force(docs, groups, candidates=None):
+    """Reference matcher that scans every document."""
+    def has_phrase(tokens, phrase):
+        return any(tuple(tokens[i:i + len(phrase)]) == phrase for i in range(len(tokens)))
+
+    result = []
+    for position, (title, body) in enumerate(docs):
+        if candidates is not None and position not in candidates:
+            continue
+        fields = [tokenize(title), tokenize(body)]
+        if any(all(any(has_phrase(f, clause) for f in fields) for clause in group) for group in groups):
+            result.append(position)
+    return result
+
+
+class TestQueryParsing:
+    """Test cases for parsing search queries."""
+
+    def test_words_are_anded(self):
+        """Test that words are AND-ed and lower-cased."""
+        assert parse_query("Election  Vote") == [[("election",), ("vote",)]]
+
+    def test_or_separates_groups(self):
+        """Test that OR splits the query into groups and AND is optional."""
+        assert parse_query("election OR health AND vote") == [[("election",)], [("health",), ("vote",)]]
+
+    def test_quotes_and_compound_words_are_phrases(self):
+        """Test that quoted text and words with punctuation become phrases."""
+        assert parse_query('"new hospital" covid-19') == [[("new", "hospital"), ("covid", "19")]]
+
+    def test_empty_query_is_rejected(self):
+        """Test that a query without words is rejected."""
+        with pytest.raises(ValueError):
+            parse_query(' "" OR ')
+
+
+class TestSearchIndex:
+    """Test cases for matching and ranking with the packed inverted index."""
+
+    @pytest.mark.parametrize("query", [
+        "election",
+        "election vote",
+        "election OR hospital",
+        "budget county report",
+        '"new hospital"',
+        '"new hospital" OR "vote election" budget',
+        "missing",
+        "election missing OR vote",
+    ])
+    def test_matches_linear_scan(self, docs, index, query):
+        """Test that the packed postings match the same documents as a scan."""
+        title_body = lambda p: docs[p]
+        ranked, total = index.search(query, texts=title_body)
+
+        expected = brute_force(docs, parse_query(query))
+        assert total == len(expected)
+        assert sorted(p for p, _ in ranked) == expected
+
+    def test_candidates_restrict_matches(self, docs, index):
+        """Test that only candidate positions are returned, skipping other blocks."""
+        candidates = list(range(5, len(docs), 97))
+        ranked, total = index.search("election OR vote", candidates=candidates)
+
+        expected = brute_force(docs, parse_query("election OR vote"), set(candidates))
+        assert sorted(p for p, _ in ranked) == expected
+        assert total == len(expected)
+
+    def test_bm25_prefers_frequent_terms_in_short_documents(self):
+        """Test that a higher term frequency and a shorter document rank first."""
+        index = build([
+            ("budget", "county report"),
+            ("budget budget", "county"),
+            ("report", "county"),
+            ("budget", "county report " * 10),
+        ])
+        ranked, total = index.search("budget")
+
+        assert total == 3
+        assert [p for p, _ in ranked] == [1, 0, 3]
+        assert ranked[0][1] > ranked[1][1] > ranked[2][1] > 0
+
+    def test_ties_keep_load_order_and_paging(self):
+        """Test that equal scores come back in load order and pages slice the ranking."""
+        index = build([("vote", "")] * 5)
+
+        ranked, total = index.search("vote", limit=2, offset=2)
+
+        assert total == 5
+        assert [p for p, _ in ranked] == [2, 3]
+
+    def test_postings_are_packed(self, index):
+        """Test that common terms take far less than a 64-bit position per posting."""
+        postings = index.postings["election"]
+        assert postings.count > BLOCK_SIZE * 4
+        assert len(postings.blocks) < postings.count * 3
+
+    def test_view_is_unchanged_by_later_additions(self):
+        """Test that a view ranks as the index did when it was taken, after blocks are sealed."""
+        docs = make_docs(BLOCK_SIZE * 3 + 50, seed=11)
+        index = build(docs)
+        expected = index.search("health election")
+        view = index.view("health election")
+
+        for position, (title, body) in enumerate(make_docs(BLOCK_SIZE * 3, seed=12), start=len(docs)):
+            index.add(position, analyze(title, body)[0])
+
+        assert view.search("health election") == expected
+        assert view.doc_count == len(docs)
+        assert index.search("health election") != expected
@@ -0,0 +1,31 @@
+import json
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src import serialization
+
+
+ROWS = [
+    {"id": 1, "title": "Élection générale", "body": "Line\nbreak \"quoted\"", "tags": ["elections"]},
+    {"id": 2, "title": "Health", "body": "", "url": "", "tags": []}
+]
+
+
+class TestDumps:
+    """Test cases for the JSON encoder used by the article routes."""
+
+    def test_matches_standard_library(self):
+        """Test that output matches compact, non-ASCII-escaped json.dumps."""
+        expected = json.dumps(ROWS, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        assert serialization.dumps(ROWS) == expected
+
+    def test_fallback_without_orjson(self, monkeypatch):
+        """Test that the standard library fallback produces the same bytes."""
+        with_default = serialization.dumps(ROWS)
+        monkeypatch.setattr(serialization, "orjson", None)
+
+        assert serialization.dumps(ROWS) == with_default
@@ -0,0 +1,189 @@
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.data_service import DataService
+from src.snapshot import read_snapshot, snapshot_key, write_snapshot
+from src.tagging import ArticleTagger
+from tests.samples import SAMPLE_ARTICLES, write_articles
+
+
+@pytest.fixture
+def paths(tmp_path):
+    """Data file and snapshot path in a temporary directory."""
+    data_file = write_articles(tmp_path / "articles.json", SAMPLE_ARTICLES)
+    return data_file, str(tmp_path / "articles.snapshot")
+
+
+def fail_parse(self):
+    raise AssertionError("data file should not be parsed")
+
+
+class TestSnapshot:
+    """Test cases for persistent corpus snapshots."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a written snapshot is read back only with the same key."""
+        path = str(tmp_path / "state.snapshot")
+        write_snapshot(path, "a" * 64, {"rows": [1, 2, 3]})
+
+        assert read_snapshot(path, "a" * 64) == {"rows": [1, 2, 3]}
+        assert read_snapshot(path, "b" * 64) is None
+
+    def test_missing_or_corrupt_snapshot(self, tmp_path):
+        """Test that missing and corrupt snapshots are ignored."""
+        path = tmp_path / "state.snapshot"
+        assert read_snapshot(str(path), "a" * 64) is None
+
+        write_snapshot(str(path), "a" * 64, {"rows": [1]})
+        path.write_bytes(path.read_bytes()[:-4])
+        assert read_snapshot(str(path), "a" * 64) is None
+
+    def test_restart_uses_snapshot(self, paths, monkeypatch):
+        """Test that a second start restores the corpus without parsing the data file."""
+        data_file, snapshot_file = paths
+        first = DataService(data_file, snapshot_file=snapshot_file)
+        assert os.path.exists(snapshot_file)
+
+        monkeypatch.setattr(DataService, "_parse_data", fail_parse)
+        second = DataService(data_file, snapshot_file=snapshot_file)
+
+        assert [a.model_dump() for a in second.articles] == [a.model_dump() for a in first.articles]
+        assert [a.id for a in second.get_articles(tags=["elections"])] == [1, 3]
+
+    def test_data_change_rebuilds_snapshot(self, paths):
+        """Test that editing the data file invalidates the snapshot."""
+        data_file, snapshot_file = paths
+        DataService(data_file, snapshot_file=snapshot_file)
+
+        write_articles(data_file, SAMPLE_ARTICLES[:2])
+        service = DataService(data_file, snapshot_file=snapshot_file)
+
+        assert len(service.articles) == 2
+        assert read_snapshot(snapshot_file, snapshot_key(data_file, service.tagger)) is not None
+
+    def test_keyword_change_changes_key(self, paths):
+        """Test that the snapshot key depends on the tagger keyword table."""
+        data_file, _ = paths
+        tagger = ArticleTagger()
+        before = snapshot_key(data_file, tagger)
+
+        tagger.tag_keywords["technology"] = ["satellite"]
+
+        assert snapshot_key(data_file, tagger) != before
+
+    def test_failed_load_is_not_snapshotted(self, tmp_path):
+        """Test that a data file with errors does not produce a snapshot."""
+        data_file = tmp_path / "articles.json"
+        data_file.write_text('[{"id": "1", "title": "x"', encoding='utf-8')
+        snapshot_file = str(tmp_path / "articles.snapshot")
+
+        DataService(str(data_file), snapshot_file=snapshot_file)
+
+        assert not os.path.exists(snapshot_file)
+
+    def test_missing_snapshot_directory_still_loads(self, paths, capsys):
+        """Test that a snapshot path that cannot be locked falls back to parsing the data file."""
+        data_file, snapshot_file = paths
+        missing = os.path.join(os.path.dirname(snapshot_file), "missing", "articles.snapshot")
+
+        service = DataService(data_file, snapshot_file=missing)
+
+        assert service.ready
+        assert len(service.articles) == len(SAMPLE_ARTICLES)
+        assert "could not lock snapshot" in capsys.readouterr().out
+
+
+class TestSharedSnapshot:
+    """Test cases for attaching the corpus from a shared snapshot."""
+
+    @pytest.fixture
+    def large_paths(self, tmp_path):
+        """A corpus large enough for its columns to be shared."""
+        articles = [dict(a, id=str(i)) for i, a in enumerate(SAMPLE_ARTICLES * 300)]
+        data_file = write_articles(tmp_path / "articles.json", articles)
+        return data_file, str(tmp_path / "articles.snapshot")
+
+    def test_columns_are_shared_views(self, large_paths):
+        """Test that large columns are read-only views of the snapshot mapping."""
+        data_file, snapshot_file = large_paths
+        DataService(data_file, snapshot_file=snapshot_file)
+        service = DataService(data_file, snapshot_file=snapshot_file)
+
+        assert isinstance(service.articles.text, memoryview)
+        assert service.articles.text.readonly
+        assert isinstance(service.articles.ids, memoryview)
+        assert isinstance(service.index.position_days, memoryview)
+
+    def test_builder_also_attaches(self, large_paths):
+        """Test that the process that builds the snapshot serves from it too."""
+        data_file, snapshot_file = large_paths
+        service = DataService(data_file, snapshot_file=snapshot_file)
+
+        assert isinstance(service.articles.text, memoryview)
+
+    def test_queries_on_attached_corpus(self, large_paths):
+        """Test that an attached corpus answers queries like a freshly loaded one."""
+        data_file, snapshot_file = large_paths
+        fresh = DataService(data_file)
+        attached = DataService(data_file, snapshot_file=snapshot_file)
+
+        for filters in [{}, {"source": "daily nation"}, {"tags": ["health", "corruption"]},
+                        {"date_from": "2024-01-16", "date_to": "2024-01-31"}]:
+            assert [a.model_dump() for a in attached.get_articles(**filters)] == \
+                [a.model_dump() for a in fresh.get_articles(**filters)]
+
+    def test_append_after_attach(self, large_paths):
+        """Test that appending to an attached store copies it instead of failing."""
+        data_file, snapshot_file = large_paths
+        service = DataService(data_file, snapshot_file=snapshot_file)
+        article = service.articles[0].model_copy(update={"id": 10000})
+
+        position = service.articles.append(article)
+        service.index.add(position, article)
+
+        assert not isinstance(service.articles.text, memoryview)
+        assert service.articles[position].id == 10000
+        assert service.articles[0].id == 0
+
+    def test_add_articles_to_partly_shared_corpus(self, tmp_path):
+        """Test that adding articles works when only some columns are shared."""
+        articles = [dict(a, id=str(i)) for i, a in enumerate(SAMPLE_ARTICLES * 50)]
+        data_file = write_articles(tmp_path / "articles.json", articles)
+        snapshot_file = str(tmp_path / "articles.snapshot")
+        DataService(data_file, snapshot_file=snapshot_file)
+        service = DataService(data_file, snapshot_file=snapshot_file)
+        assert isinstance(service.articles.offsets, memoryview)
+        assert not isinstance(service.articles.ids, memoryview)
+
+        service.add_articles([dict(SAMPLE_ARTICLES[0], id="10000", date="2024-01-16")])
+
+        assert [a.id for a in service.get_articles(date_from="2024-01-16", date_to="2024-01-16")] == [10000]
+
+    def test_duplicates_are_found_after_attach(self, large_paths):
+        """Test that duplicate groups are kept in the snapshot and new copies join them."""
+        data_file, snapshot_file = large_paths
+        DataService(data_file, snapshot_file=snapshot_file)
+        service = DataService(data_file, snapshot_file=snapshot_file)
+        assert isinstance(service.corpus.dedup.heads, memoryview)
+        assert service.get_stats()["duplicates"] == len(service.articles) - len(SAMPLE_ARTICLES)
+
+        service.add_articles([dict(SAMPLE_ARTICLES[2], id="10000")])
+
+        assert service.corpus.dedup.canonical[len(service.articles) - 1] == 2
+
+    def test_key_digest_is_cached(self, paths, monkeypatch):
+        """Test that an unchanged data file is not re-hashed on the next start."""
+        data_file, snapshot_file = paths
+        DataService(data_file, snapshot_file=snapshot_file)
+
+        def fail_hash(*args):
+            raise AssertionError("data file should not be hashed again")
+
+        monkeypatch.setattr("src.snapshot.snapshot_key", fail_hash)
+        service = DataService(data_file, snapshot_file=snapshot_file)
+
+        assert len(service.articles) == len(SAMPLE_ARTICLES)
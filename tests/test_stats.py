@@ -0,0 +1,62 @@
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.models import Article
+from src.stats import CorpusStats
+
+
+def make_article(article_id, source, date, tags):
+    return Article(id=article_id, title="", body="", source=source, date=date, tags=tags)
+
+
+class TestCorpusStats:
+    """Test cases for incrementally maintained statistics."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.stats = CorpusStats()
+        self.first = make_article(1, "Reuters", "2024-01-02", ["elections", "health"])
+        self.second = make_article(2, "BBC News", "2024-01-01", ["elections"])
+        self.stats.add(self.first)
+        self.stats.add(self.second)
+
+    def test_add(self):
+        """Test that adding articles updates every counter."""
+        stats = self.stats.to_dict(breakdowns=True)
+
+        assert stats["total_articles"] == 2
+        assert stats["tags"] == {"elections": 2, "health": 1}
+        assert stats["sources"] == {"Reuters": 1, "BBC News": 1}
+        assert stats["daily"] == {"2024-01-01": 1, "2024-01-02": 1}
+        assert stats["source_tags"] == {
+            "Reuters": {"elections": 1, "health": 1},
+            "BBC News": {"elections": 1}
+        }
+
+    def test_remove_drops_empty_keys(self):
+        """Test that removing an article drops counters that reach zero."""
+        self.stats.remove(self.first)
+        stats = self.stats.to_dict(breakdowns=True)
+
+        assert stats["total_articles"] == 1
+        assert stats["tags"] == {"elections": 1}
+        assert stats["sources"] == {"BBC News": 1}
+        assert stats["daily"] == {"2024-01-01": 1}
+        assert stats["source_tags"] == {"BBC News": {"elections": 1}}
+
+    def test_update(self):
+        """Test that updating an article moves its counts."""
+        changed = make_article(2, "Reuters", "2024-01-02", ["corruption"])
+        self.stats.update(self.second, changed)
+        stats = self.stats.to_dict()
+
+        assert stats["tags"] == {"elections": 1, "health": 1, "corruption": 1}
+        assert stats["sources"] == {"Reuters": 2}
+
+    def test_breakdowns_are_optional(self):
+        """Test that breakdowns are only returned on request."""
+        assert "daily" not in self.stats.to_dict()
+        assert "source_tags" not in self.stats.to_dict()
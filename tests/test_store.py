@@ -0,0 +1,80 @@
+import pytest
+import pickle
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.models import Article
+from src.store import ArticleStore, MAX_TAGS
+
+
+ARTICLES = [
+    Article(id=1, title="Élection", body="Vote ✓", source="Reuters", date="2024-01-01",
+            url="https://example.com/1", tags=["elections", "health"]),
+    Article(id=2, title="Weather", body="", source="BBC News", date="2024-1-2", tags=[]),
+    Article(id=3, title="Audit", body="Fraud", source="Reuters", date="2024-01-03", url=None,
+            tags=["corruption"])
+]
+
+
+class TestArticleStore:
+    """Test cases for the columnar article store."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.store = ArticleStore(tag_names=["elections", "health", "corruption"])
+        for article in ARTICLES:
+            self.store.append(article)
+
+    def test_rows_round_trip(self):
+        """Test that stored rows come back with the same field values."""
+        assert len(self.store) == 3
+        for position, article in enumerate(ARTICLES):
+            expected = article.model_dump()
+            expected["url"] = expected["url"] or ""
+            assert self.store[position].model_dump() == expected
+            assert self.store.row_dict(position) == expected
+
+    def test_sources_are_interned(self):
+        """Test that each source name is stored once."""
+        assert self.store.sources == ["Reuters", "BBC News"]
+        assert self.store.source(2) == "Reuters"
+
+    def test_tags_keep_registered_order(self):
+        """Test that tags decode in the order they were registered."""
+        store = ArticleStore(tag_names=["elections", "health"])
+        store.append(ARTICLES[0].model_copy(update={"tags": ["health", "elections"]}))
+
+        assert store.tags(0) == ["elections", "health"]
+
+    def test_negative_and_out_of_range_positions(self):
+        """Test sequence indexing semantics."""
+        assert self.store[-1].id == 3
+        assert [a.id for a in self.store[1:]] == [2, 3]
+        with pytest.raises(IndexError):
+            self.store[3]
+
+    def test_pickle_round_trip(self):
+        """Test that the store survives pickling, as used by snapshots."""
+        restored = pickle.loads(pickle.dumps(self.store))
+
+        assert [a.model_dump() for a in restored] == [a.model_dump() for a in self.store]
+
+    def test_tag_limit(self):
+        """Test that more distinct tags than the bitmask holds are rejected."""
+        store = ArticleStore(tag_names=[f"tag{i}" for i in range(MAX_TAGS)])
+
+        with pytest.raises(ValueError):
+            store.append(ARTICLES[0].model_copy(update={"tags": ["one-too-many"]}))
+
+    def test_rejected_row_leaves_no_partial_row(self):
+        """Test that an id too large for the id column is rejected before any column grows."""
+        with pytest.raises(ValueError):
+            self.store.append(ARTICLES[0].model_copy(update={"id": 2 ** 63, "title": "Rejected"}))
+        self.store.append(ARTICLES[1].model_copy(update={"id": 4}))
+
+        assert len(self.store) == 4
+        assert self.store.row_dict(3)["title"] == "Weather"
+        assert len(self.store.offsets) == 4 * 4 + 1
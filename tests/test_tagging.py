@@ -99,4 +99,50 @@ class TestArticleTagger:
         """Test that empty list is returned for nonexistent tag."""
         keywords = self.tagger.get_keywords_for_tag("nonexistent")
         
-        assert keywords == [] 
\ No newline at end of file
+        assert keywords == []
+    
+    def test_tag_article_multi_word_keyword(self):
+        """Test that multi-word keywords are matched as a phrase."""
+        tags = self.tagger.tag_article("Support Services Expand", "Funding for mental health was increased.")
+        
+        assert tags == ["health"]
+    
+    def test_tag_article_preserves_tag_order(self):
+        """Test that tags are returned in keyword table order."""
+        tags = self.tagger.tag_article("Fraud in Hospital Election", "")
+        
+        assert tags == ["elections", "health", "corruption"]
+    
+    def test_tag_article_after_recompile(self):
+        """Test that keyword table changes take effect after compile()."""
+        self.tagger.tag_keywords["technology"] = ["software", "satellite"]
+        self.tagger.compile()
+        
+        tags = self.tagger.tag_article("New Satellite Launched", "")
+        
+        assert tags == ["technology"]
+    
+    def test_tag_article_overlapping_keywords_across_tags(self):
+        """Test that a keyword hidden inside another tag's phrase is still found."""
+        self.tagger.tag_keywords = {
+            "policy": ["health policy"],
+            "health": ["health"]
+        }
+        self.tagger.compile()
+        
+        tags = self.tagger.tag_article("New Health Policy", "")
+        
+        assert tags == ["policy", "health"]
+    
+    def test_tag_many_preserves_order(self):
+        """Test that batch tagging returns one tag list per article, in order."""
+        articles = [
+            ("Weather Forecast", "Sunny skies."),
+            ("Election Day", "Voters queue early."),
+            ("Hospital Fraud", "")
+        ]
+        
+        tags = self.tagger.tag_many(articles)
+        
+        assert tags == [self.tagger.tag_article(t, b) for t, b in articles]
+        assert tags[0] == []
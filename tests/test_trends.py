@@ -0,0 +1,125 @@
+import os
+import random
+import sys
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from src.indexes import parse_day
+from src.trends import TrendRollups, bucket_label, bucket_start
+
+
+SOURCES = ["Reuters", "Daily Nation"]
+TAGS = ["elections", "health", "corruption"]
+
+
+def make_articles(count, seed=3):
+    """Generate (date, source, tags) triples over about a year."""
+    rng = random.Random(seed)
+    start = date(2023, 12, 1)
+    return [
+        (
+            (start + timedelta(days=rng.randrange(400))).isoformat(),
+            rng.choice(SOURCES),
+            rng.sample(TAGS, rng.randint(0, 2))
+        )
+        for _ in range(count)
+    ]
+
+
+def brute_force(articles, source, tag, interval, date_from, date_to):
+    """Count matching articles per bucket with a linear scan."""
+    counts = Counter()
+    for day_text, article_source, tags in articles:
+        day = parse_day(day_text)
+        if source and article_source.lower() != source.lower():
+            continue
+        if tag and tag not in tags:
+            continue
+        if date_from and day < parse_day(date_from) or date_to and day > parse_day(date_to):
+            continue
+        counts[bucket_label(bucket_start(day, interval), interval)] += 1
+    return counts
+
+
+@pytest.fixture(scope="module")
+def articles():
+    """Synthetic articles shared by the rollup tests."""
+    return make_articles(2000)
+
+
+@pytest.fixture(scope="module")
+def rollups(articles):
+    """Rollups built from the synthetic articles."""
+    rollups = TrendRollups()
+    for day_text, source, tags in articles:
+        rollups.add(parse_day(day_text), source, tags)
+    return rollups
+
+
+class TestBuckets:
+    """Test cases for date histogram buckets."""
+
+    @pytest.mark.parametrize("interval, expected", [
+        ("day", "2024-02-29"),
+        ("week", "2024-02-26"),
+        ("month", "2024-02"),
+    ])
+    def test_bucket_of_a_day(self, interval, expected):
+        """Test that days fall in the bucket starting on the right day."""
+        day = date(2024, 2, 29).toordinal()
+
+        assert bucket_label(bucket_start(day, interval), interval) == expected
+
+    def test_unknown_interval(self):
+        """Test that an unknown interval is rejected."""
+        with pytest.raises(ValueError):
+            bucket_start(date(2024, 1, 1).toordinal(), "year")
+
+
+class TestTrendRollups:
+    """Test cases for trend series read from rollups."""
+
+    @pytest.mark.parametrize("interval", ["day", "week", "month"])
+    @pytest.mark.parametrize("source, tag", [(None, None), ("reuters", None), (None, "health"), ("Daily Nation", "elections")])
+    @pytest.mark.parametrize("date_from, date_to", [
+        (None, None),
+        ("2024-01-17", "2024-06-03"),
+        ("2024-02-10", "2024-02-12"),
+    ])
+    def test_series_matches_linear_scan(self, articles, rollups, source, tag, interval, date_from, date_to):
+        """Test that bucket counts, including partial edge buckets, match a scan."""
+        counts = rollups.series(
+            source=source,
+            tag=tag,
+            interval=interval,
+            from_day=parse_day(date_from) if date_from else None,
+            to_day=parse_day(date_to) if date_to else None
+        )
+
+        expected = brute_force(articles, source, tag, interval, date_from, date_to)
+        assert {label: n for label, n in counts.items() if n} == dict(expected)
+        assert list(counts) == sorted(counts)
+
+    def test_empty_buckets_are_zero(self):
+        """Test that buckets without articles between the first and last are included."""
+        rollups = TrendRollups()
+        rollups.add(parse_day("2024-01-31"), "Reuters", ["health"])
+        rollups.add(parse_day("2024-04-02"), "Reuters", ["health"])
+
+        assert rollups.series(tag="health", interval="month") == {
+            "2024-01": 1, "2024-02": 0, "2024-03": 0, "2024-04": 1
+        }
+
+    def test_removed_articles_are_uncounted(self):
+        """Test that removing an article drops its now-empty buckets."""
+        rollups = TrendRollups()
+        day = parse_day("2024-01-31")
+        rollups.add(day, "Reuters", ["health"])
+        rollups.add(day, "Reuters", ["health"], delta=-1)
+
+        assert rollups.series(source="reuters") == {}